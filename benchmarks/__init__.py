@@ -0,0 +1 @@
+"""Micro-benchmarks for the transcript and pipeline hot paths."""
@@ -0,0 +1,306 @@
+"""End-to-end pipeline benchmark against offline fakes.
+
+Runs the full VideoProcessor pipeline, through BatchProcessor, with the
+client libraries replaced by the stand-ins in benchmarks.fakes. It covers
+every combination of transcript size and concurrency. Each case runs in a
+fresh interpreter, so one-time costs (client setup, model load) and peak RSS
+belong to that case alone. For each case it reports videos/sec, p50/p95
+latency per stage (from the metrics spans) and peak RSS::
+
+    python -m benchmarks.bench_pipeline --sizes 200 2000 --concurrency 1 8
+
+Results can be saved with ``--output`` (tagged with the git commit they were
+measured on) and compared against an earlier run with ``--compare``.
+"""
+
+import argparse
+import dataclasses
+import json
+import math
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from benchmarks import fakes
+
+DEFAULT_SIZES = (200, 2_000, 12_000)
+DEFAULT_CONCURRENCY = (1, 8)
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Stages shown in the table, in pipeline order; every stage is saved
+TABLE_STAGES = ("video", "transcript", "timestamps", "summary", "gemini_call")
+
+
+def percentile(values: list, q: float) -> float:
+    """Return the nearest-rank ``q``th percentile of ``values``."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def peak_rss_bytes() -> int:
+    """Return the peak resident set size of this process."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_case(args: argparse.Namespace) -> dict:
+    """Run one benchmark case in this process and return its measurements.
+
+    Must run in a fresh interpreter whose environment points OUTPUT_DIR at a
+    scratch directory (see ``case_environment``).
+    """
+    settings = fakes.FakeSettings(**json.loads(args.fake_settings))
+    fakes.install(settings)
+
+    # Imported after the fakes so every lazy import resolves to them
+    from processors.batch_processor import BatchProcessor  # noqa: PLC0415
+    from utils.metrics import get_metrics  # noqa: PLC0415
+
+    durations = defaultdict(list)
+    get_metrics().add_hook(lambda span: durations[span.name].append(span.duration))
+
+    urls = [
+        "https://www.youtube.com/watch?v="
+        + (
+            f"{fakes.NO_CAPTIONS_PREFIX}{i:06d}"
+            if args.whisper_every and i % args.whisper_every == 0
+            else f"vid{i:08d}"
+        )
+        for i in range(args.videos)
+    ]
+    batch = BatchProcessor(
+        io_workers=args.case_concurrency, whisper_workers=args.whisper_workers,
+    )
+    start = time.perf_counter()
+    results = batch.run(urls, combined=args.combined)
+    wall = time.perf_counter() - start
+
+    return {
+        "segments": settings.segments,
+        "concurrency": args.case_concurrency,
+        "videos": len(results),
+        "failed": sum(1 for result in results if not result.ok),
+        "wall_seconds": wall,
+        "videos_per_second": len(results) / wall,
+        "peak_rss_mb": peak_rss_bytes() / 1e6,
+        "stages": {
+            name: {
+                "count": len(values),
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+            }
+            for name, values in sorted(durations.items())
+        },
+    }
+
+
+def case_environment(scratch_dir: str) -> dict:
+    """Environment for a case: scratch output, no cache, no rate limits."""
+    env = dict(os.environ)
+    env.update(
+        {
+            "OUTPUT_DIR": scratch_dir,
+            "CACHE_DIR": str(Path(scratch_dir) / "cache"),
+            "CACHE_ENABLED": "false",
+            "YOUTUBE_QPS": "0",
+            "YOUTUBE_DAILY_QUOTA": "0",
+            "GEMINI_RPM": "0",
+            "GEMINI_TPM": "0",
+            "WHISPER_AUDIO_MODE": "native",
+            "WHISPER_PARALLEL_WORKERS": "0",
+            "WHISPER_VAD": "false",
+            "YOUTUBE_API_KEY": "benchmark",
+            "GEMINI_API_KEY": "benchmark",
+        },
+    )
+    return env
+
+
+def spawn_case(args: argparse.Namespace, segments: int, concurrency: int) -> dict:
+    """Run one case in a subprocess and return its measurements."""
+    fake_settings = {**json.loads(args.fake_settings), "segments": segments}
+    cmd = [
+        sys.executable,
+        "-m",
+        "benchmarks.bench_pipeline",
+        "--run-case",
+        "--case-concurrency",
+        str(concurrency),
+        "--fake-settings",
+        json.dumps(fake_settings),
+        "--videos",
+        str(args.videos),
+        "--whisper-every",
+        str(args.whisper_every),
+        "--whisper-workers",
+        str(args.whisper_workers),
+    ]
+    if args.combined:
+        cmd.append("--combined")
+    with tempfile.TemporaryDirectory() as scratch_dir:
+        result = subprocess.run(  # noqa: S603
+            cmd,
+            cwd=REPO_ROOT,
+            env=case_environment(scratch_dir),
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+    if result.returncode != 0:
+        msg = f"Benchmark case failed:\n{result.stderr}"
+        raise RuntimeError(msg)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def git_revision() -> dict:
+    """Return the commit being benchmarked and whether the tree is dirty."""
+    def git(*git_args: str) -> str:
+        return subprocess.run(  # noqa: S603
+            ["git", *git_args],  # noqa: S607
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=False,
+        ).stdout.strip()
+
+    return {
+        "commit": git("rev-parse", "HEAD"),
+        "dirty": bool(git("status", "--porcelain")),
+    }
+
+
+def print_case(case: dict, baseline: dict | None = None) -> None:
+    """Print one result row, with the change from ``baseline`` if given."""
+    stages = case["stages"]
+    cells = [
+        (
+            f"{case['segments']:>8} {case['concurrency']:>5} "
+            f"{case['videos_per_second']:>8.2f} {case['peak_rss_mb']:>7.0f}"
+        ),
+    ]
+    for name in TABLE_STAGES:
+        stage = stages.get(name, {"p50": 0.0, "p95": 0.0})
+        cells.append(f"{stage['p50']:>7.2f} {stage['p95']:>7.2f}")
+    line = " | ".join(cells)
+    if baseline:
+        change = case["videos_per_second"] / baseline["videos_per_second"] - 1
+        line += f" | {change:+.1%}"
+    if case["failed"]:
+        line += f"  ({case['failed']} failed)"
+    print(line)
+
+
+def print_header(*, compare: bool) -> None:
+    """Print the result table header."""
+    cells = [f"{'segments':>8} {'conc':>5} {'videos/s':>8} {'rss MB':>7}"]
+    cells += [f"{name[:15]:>15}" for name in TABLE_STAGES]
+    header = " | ".join(cells)
+    if compare:
+        header += " | vs base"
+    print(header)
+    print(" | ".join([" " * 31] + [f"{'p50':>7} {'p95':>7}"] * len(TABLE_STAGES)))
+    print("-" * len(header))
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SIZES,
+        help="Transcript sizes (caption cues per video) to benchmark",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        nargs="+",
+        default=DEFAULT_CONCURRENCY,
+        help="Batch I/O concurrency levels to benchmark",
+    )
+    parser.add_argument(
+        "--videos", type=int, default=16, help="Videos per case",
+    )
+    parser.add_argument(
+        "--whisper-every",
+        type=int,
+        default=0,
+        help="Give every Nth video no captions, so it goes through Whisper",
+    )
+    parser.add_argument(
+        "--whisper-workers", type=int, default=1, help="Batch Whisper concurrency",
+    )
+    parser.add_argument(
+        "--combined",
+        action="store_true",
+        help="Use the single combined Gemini call",
+    )
+    parser.add_argument(
+        "--fake-settings",
+        default="{}",
+        help="JSON overrides for benchmarks.fakes.FakeSettings, e.g. "
+        '\'{"gemini_latency": 1.0}\'',
+    )
+    parser.add_argument("--output", help="Save the results as JSON to this file")
+    parser.add_argument("--compare", help="Compare with results saved by --output")
+    # Internal: run a single case in this process
+    parser.add_argument("--run-case", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--case-concurrency", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        print(json.dumps(run_case(args)))
+        return
+
+    baseline = {}
+    if args.compare:
+        saved = json.loads(Path(args.compare).read_text())
+        baseline = {
+            (case["segments"], case["concurrency"]): case for case in saved["results"]
+        }
+        print(f"Comparing with {saved['revision']['commit'][:12]}")
+
+    print_header(compare=bool(baseline))
+    results = []
+    for segments in args.sizes:
+        for concurrency in args.concurrency:
+            case = spawn_case(args, segments, concurrency)
+            results.append(case)
+            print_case(case, baseline.get((segments, concurrency)))
+
+    if args.output:
+        report = {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "parameters": {
+                "sizes": args.sizes,
+                "concurrency": args.concurrency,
+                "videos": args.videos,
+                "whisper_every": args.whisper_every,
+                "whisper_workers": args.whisper_workers,
+                "combined": args.combined,
+                # "segments" is replaced by each case's size
+                "fake_settings": {
+                    **dataclasses.asdict(fakes.FakeSettings()),
+                    **json.loads(args.fake_settings),
+                },
+            },
+            "results": results,
+        }
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"Saved results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
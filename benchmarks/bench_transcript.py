@@ -0,0 +1,234 @@
+"""Micro-benchmark for transcript parsing, formatting and storage.
+
+Compares the single-pass implementations against the previous ones (string
+concatenation over the whole transcript, one regex over the whole SRT file)
+on synthetic transcripts from a few minutes up to 10+ hours. Time per segment
+should stay flat as the transcript grows. Also compares loading a transcript
+from JSON against the memory-mapped binary format, and measures how much
+compression removes from rolling auto-generated captions::
+
+    python -m benchmarks.bench_transcript
+"""
+
+import argparse
+import io
+import re
+import tempfile
+import time
+from collections.abc import Callable, Sequence
+from pathlib import Path
+
+from utils.file_utils import load_json, save_json
+from utils.subtitle_utils import iter_subtitle_segments
+from utils.time_helpers import time_to_seconds
+from utils.transcript_store import load_transcript, save_transcript
+from utils.transcript_utils import (
+    Transcript,
+    compress_transcript,
+    compression_ratio,
+    format_transcript,
+    format_transcript_text,
+)
+
+# One cue every 3 seconds: 12,000 segments is a 10 hour video
+DEFAULT_SIZES = (100, 1_000, 12_000, 48_000)
+SEGMENT_SECONDS = 3
+PROMPT_BUDGET = 15000
+# Every this many rolling cues, one is a "[Music]" tag
+MUSIC_EVERY = 25
+
+
+def make_srt(n_segments: int) -> str:
+    """Build a synthetic SRT file with ``n_segments`` two-line cues."""
+    cues = []
+    for i in range(n_segments):
+        start = i * SEGMENT_SECONDS
+        end = start + SEGMENT_SECONDS - 0.5
+        cues.append(
+            f"{i + 1}\n{_srt_time(start)} --> {_srt_time(end)}\n"
+            f"this is caption number {i} of the video\nand its second line\n",
+        )
+    return "\n".join(cues)
+
+
+def _srt_time(seconds: float) -> str:
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{int(hours):02d}:{int(minutes):02d}:{secs:06.3f}".replace(".", ",")
+
+
+def legacy_parse_srt(srt_string: str) -> list:
+    """Parse SRT with the previous whole-file regex parser."""
+    pattern = re.compile(r"(\d+)\n(\d{2}:\d{2}:\d{2},\d{3}) --> (\d{2}:\d{2}:\d{2},\d{3})\n([\s\S]*?)(?=\n\n|\Z)")  # noqa: E501
+    return [
+        {
+            "start": time_to_seconds(start),
+            "end": time_to_seconds(end),
+            "text": text.strip().replace("\n", " "),
+        }
+        for _, start, end, text in pattern.findall(srt_string)
+    ]
+
+
+def legacy_format(transcript: Sequence[dict]) -> str:
+    """Format like the previous formatter: concatenate everything, then truncate."""
+    full_text = ""
+    for segment in transcript:
+        minutes = int(segment["start_time"] // 60)
+        seconds = int(segment["start_time"] % 60)
+        full_text += f"[{minutes:02d}:{seconds:02d}] {segment['text']}\n"
+    return full_text[:PROMPT_BUDGET]
+
+
+def format_segment(segment: dict) -> str:
+    """Timestamped prompt line, as TimestampGenerator formats it."""
+    minutes = int(segment["start_time"] // 60)
+    seconds = int(segment["start_time"] % 60)
+    return f"[{minutes:02d}:{seconds:02d}] {segment['text']}\n"
+
+
+def timed(func: Callable[..., object], *args: object, repeat: int = 3) -> float:
+    """Return the best wall-clock time of ``repeat`` runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes: Sequence[int]) -> None:
+    """Print timings for every transcript size."""
+    header = (
+        f"{'segments':>9} {'hours':>6} | {'parse old':>10} {'parse new':>10} "
+        f"{'us/seg':>7} | {'fmt old':>9} {'fmt new':>9} {'fmt full':>9} {'us/seg':>7}"
+    )
+    print(header)
+    print("-" * len(header))
+    for n in sizes:
+        srt = make_srt(n)
+        transcript = format_transcript(iter_subtitle_segments(io.StringIO(srt)))
+
+        parse_old = timed(legacy_parse_srt, srt)
+        parse_new = timed(
+            lambda srt=srt: format_transcript(iter_subtitle_segments(io.StringIO(srt))),
+        )
+        fmt_old = timed(legacy_format, transcript)
+        fmt_new = timed(
+            format_transcript_text, transcript, format_segment, PROMPT_BUDGET,
+        )
+        # Unbudgeted formatting of the whole transcript shows the linear scaling
+        fmt_full = timed(format_transcript_text, transcript, format_segment)
+
+        print(
+            f"{n:>9} {n * SEGMENT_SECONDS / 3600:>6.1f} | "
+            f"{parse_old * 1e3:>8.1f}ms {parse_new * 1e3:>8.1f}ms "
+            f"{parse_new / n * 1e6:>7.2f} | "
+            f"{fmt_old * 1e3:>7.1f}ms {fmt_new * 1e3:>7.2f}ms "
+            f"{fmt_full * 1e3:>7.1f}ms {fmt_full / n * 1e6:>7.2f}",
+        )
+
+
+def run_storage(sizes: Sequence[int]) -> None:
+    """Print load times of JSON and binary transcript files."""
+    header = (
+        f"{'segments':>9} | {'json':>9} {'binary':>9} {'zlib':>9} | "
+        f"{'json KB':>8} {'bin KB':>8} {'zlib KB':>8}"
+    )
+    print(header)
+    print("-" * len(header))
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = Path(directory) / "t.json"
+        bin_path = Path(directory) / "t.bin"
+        zlib_path = Path(directory) / "t.zlib.bin"
+        for n in sizes:
+            srt = io.StringIO(make_srt(n))
+            transcript = format_transcript(iter_subtitle_segments(srt))
+            save_json(transcript, json_path)
+            save_transcript(transcript, bin_path, compress=False)
+            save_transcript(transcript, zlib_path, compress=True)
+
+            # Time until the transcript is usable; binary segments decode lazily
+            load_json_time = timed(lambda: len(load_json(json_path)))
+            load_bin_time = timed(lambda: len(load_transcript(bin_path)))
+            load_zlib_time = timed(lambda: len(load_transcript(zlib_path)))
+            print(
+                f"{n:>9} | {load_json_time * 1e3:>7.2f}ms "
+                f"{load_bin_time * 1e3:>7.2f}ms {load_zlib_time * 1e3:>7.2f}ms | "
+                f"{json_path.stat().st_size / 1024:>8.0f} "
+                f"{bin_path.stat().st_size / 1024:>8.0f} "
+                f"{zlib_path.stat().st_size / 1024:>8.0f}",
+            )
+
+
+def make_rolling_transcript(n_segments: int) -> Transcript:
+    """Build auto-caption-style cues: each repeats the previous cue's new line."""
+    segments = []
+    previous = ""
+    for i in range(n_segments):
+        start = i * SEGMENT_SECONDS
+        if i % MUSIC_EVERY == MUSIC_EVERY - 1:
+            text = "[Music]"
+        else:
+            line = f"now the speaker makes point number {i} about the topic"
+            text = f"{previous} {line}".strip()
+            previous = line
+        segments.append(
+            {"start_time": start, "end_time": start + SEGMENT_SECONDS, "text": text},
+        )
+    return Transcript.from_segments(segments)
+
+
+def covered_seconds(transcript: Sequence[dict]) -> float:
+    """Seconds of video that fit in a PROMPT_BUDGET-sized prompt."""
+    length = 0
+    covered = 0.0
+    for segment in transcript:
+        length += len(format_segment(segment)) + 1
+        if length > PROMPT_BUDGET:
+            break
+        covered = segment["end_time"]
+    return covered
+
+
+def run_compression(sizes: Sequence[int]) -> None:
+    """Print compression time and ratio for rolling auto-generated captions."""
+    header = (
+        f"{'segments':>9} | {'time':>9} {'us/seg':>7} | "
+        f"{'out segs':>8} {'ratio':>6} {'prompt covers':>13}"
+    )
+    print(header)
+    print("-" * len(header))
+    for n in sizes:
+        transcript = make_rolling_transcript(n)
+        compress_time = timed(compress_transcript, transcript)
+        compressed = compress_transcript(transcript)
+        # How much more of the video a PROMPT_BUDGET-sized prompt now covers
+        coverage = covered_seconds(compressed) / covered_seconds(transcript)
+        print(
+            f"{n:>9} | {compress_time * 1e3:>7.1f}ms "
+            f"{compress_time / n * 1e6:>7.2f} | {len(compressed):>8} "
+            f"{compression_ratio(transcript, compressed):>6.0%} {coverage:>12.1f}x",
+        )
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SIZES,
+        help="Transcript sizes (number of segments) to benchmark",
+    )
+    sizes = parser.parse_args().sizes
+    run(sizes)
+    print()
+    run_storage(sizes)
+    print()
+    run_compression(sizes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,423 @@
+"""Offline stand-ins for the YouTube Data API, Gemini, youtube-dl and Whisper.
+
+``install()`` registers fake ``googleapiclient``, ``google.generativeai``,
+``youtube_dl`` and ``whisper`` modules in ``sys.modules``. The pipeline imports
+these libraries lazily, so once the fakes are installed the real code paths
+(clients, rate limiters, retries, model pool, caching, metrics) run unchanged
+and only the network and model calls are simulated. Latencies are
+configurable through FakeSettings so runs are repeatable.
+
+Videos whose ID starts with ``NO_CAPTIONS_PREFIX`` have no caption tracks,
+which sends them down the youtube-dl + Whisper path. Every channel has
+``playlist_videos`` uploads, and every playlist lists the same videos.
+"""
+
+import asyncio
+import json
+import sys
+import time
+import types
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Self
+
+NO_CAPTIONS_PREFIX = "nocap"
+
+# Each fake caption cue covers this many seconds of video
+SEGMENT_SECONDS = 3
+
+
+@dataclass
+class FakeSettings:
+    """Sizes and latencies simulated by the fakes."""
+
+    # Caption cues per video (the transcript size)
+    segments: int = 1000
+    # Seconds per YouTube Data API request
+    youtube_latency: float = 0.05
+    # Seconds before Gemini starts answering
+    gemini_latency: float = 0.5
+    # Gemini output speed, and the length of every answer
+    gemini_tokens_per_second: float = 200.0
+    gemini_output_tokens: int = 300
+    # Seconds to download a video's audio
+    download_latency: float = 0.5
+    # Seconds to load a Whisper model
+    model_load_latency: float = 1.0
+    # Seconds of audio Whisper transcribes per second of wall time
+    whisper_speed: float = 100.0
+    # Videos in every playlist and channel
+    playlist_videos: int = 120
+
+
+_settings = FakeSettings()
+
+
+def install(settings: FakeSettings | None = None) -> None:
+    """Register the fake client libraries in ``sys.modules``."""
+    global _settings  # noqa: PLW0603
+    _settings = settings or FakeSettings()
+
+    googleapiclient = _module("googleapiclient")
+    googleapiclient.discovery = _module(
+        "googleapiclient.discovery",
+        build=_build_youtube,
+        build_from_document=lambda _doc, **_kwargs: FakeYouTubeService(),
+    )
+    googleapiclient.http = _module("googleapiclient.http", build_http=lambda: None)
+
+    google = _module("google")
+    google.generativeai = _module(
+        "google.generativeai",
+        configure=lambda **_kwargs: None,
+        GenerativeModel=FakeGenerativeModel,
+    )
+
+    _module("youtube_dl", YoutubeDL=FakeYoutubeDL)
+    _module("whisper", load_model=_load_whisper_model)
+
+
+def _module(name: str, **attributes: object) -> types.ModuleType:
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    sys.modules[name] = module
+    return module
+
+
+def video_duration() -> float:
+    """Length in seconds of every fake video."""
+    return _settings.segments * SEGMENT_SECONDS
+
+
+def segment_text(video_id: str, index: int) -> str:
+    """Deterministic caption text; topics change every 20 cues."""
+    return (
+        f"in part {index // 20} of {video_id} the speaker explains point {index} "
+        f"and why it matters for the overall topic"
+    )
+
+
+# YouTube Data API
+
+
+class _Request:
+    """An unexecuted googleapiclient request."""
+
+    def __init__(self, produce: Callable[[], object]) -> None:
+        self._produce = produce
+
+    def execute(self) -> object:
+        time.sleep(_settings.youtube_latency)
+        return self._produce()
+
+
+class _Captions:
+    def list(self, part: str, videoId: str) -> _Request:  # noqa: ARG002, N803
+        items = (
+            []
+            if videoId.startswith(NO_CAPTIONS_PREFIX)
+            else [
+                {
+                    "id": f"{videoId}.en",
+                    "snippet": {"language": "en", "trackKind": "asr"},
+                },
+            ]
+        )
+        return _Request(lambda: {"items": items})
+
+    def download(
+        self, id: str, tfmt: str = "srt", tlang: str | None = None,  # noqa: A002, ARG002
+    ) -> _Request:
+        return _Request(lambda: _make_srt(id.split(".", 1)[0]).encode())
+
+
+class _Videos:
+    def list(self, part: str, id: str) -> _Request:  # noqa: A002, ARG002
+        items = [
+            {
+                "id": video_id,
+                "snippet": {"title": f"Video {video_id}", "defaultAudioLanguage": "en"},
+                "contentDetails": {
+                    "duration": f"PT{int(video_duration())}S",
+                    "caption": str(
+                        not video_id.startswith(NO_CAPTIONS_PREFIX),
+                    ).lower(),
+                },
+            }
+            for video_id in id.split(",")
+        ]
+        return _Request(lambda: {"items": items})
+
+
+class _Channels:
+    def list(self, part: str, **filters: str) -> _Request:  # noqa: ARG002
+        channel = next(iter(filters.values())).lstrip("@")
+        items = [
+            {
+                "id": f"UC{channel}",
+                "contentDetails": {"relatedPlaylists": {"uploads": f"UU{channel}"}},
+            },
+        ]
+        return _Request(lambda: {"items": items})
+
+
+class _PlaylistItems:
+    def list(
+        self,
+        part: str,  # noqa: ARG002
+        playlistId: str,  # noqa: ARG002, N803
+        maxResults: int = 5,  # noqa: N803
+        pageToken: str | None = None,  # noqa: N803
+    ) -> _Request:
+        """Page through the playlist, newest video first."""
+        start = int(pageToken or 0)
+        end = min(start + maxResults, _settings.playlist_videos)
+        items = [
+            {
+                "contentDetails": {"videoId": playlist_video_id(index)},
+                "status": {"privacyStatus": "public"},
+            }
+            for index in range(
+                _settings.playlist_videos - 1 - start,
+                _settings.playlist_videos - 1 - end,
+                -1,
+            )
+        ]
+        response = {"items": items}
+        if end < _settings.playlist_videos:
+            response["nextPageToken"] = str(end)
+        return _Request(lambda: response)
+
+
+def playlist_video_id(index: int) -> str:
+    """ID of the ``index``th (oldest first) video of every fake playlist."""
+    return f"up{index:09d}"
+
+
+class FakeYouTubeService:
+    """Subset of the YouTube Data API v3 service used by the pipeline."""
+
+    def captions(self) -> _Captions:
+        """Return the captions resource."""
+        return _Captions()
+
+    def videos(self) -> _Videos:
+        """Return the videos resource."""
+        return _Videos()
+
+    def channels(self) -> _Channels:
+        """Return the channels resource."""
+        return _Channels()
+
+    def playlistItems(self) -> _PlaylistItems:  # noqa: N802
+        """Return the playlistItems resource."""
+        return _PlaylistItems()
+
+
+def _build_youtube(*_args: object, **_kwargs: object) -> FakeYouTubeService:
+    service = FakeYouTubeService()
+    service._rootDesc = {}  # noqa: SLF001
+    return service
+
+
+def _make_srt(video_id: str) -> str:
+    cues = []
+    for i in range(_settings.segments):
+        start = i * SEGMENT_SECONDS
+        cues.append(
+            f"{i + 1}\n{_srt_time(start)} --> {_srt_time(start + SEGMENT_SECONDS)}\n"
+            f"{segment_text(video_id, i)}\n",
+        )
+    return "\n".join(cues)
+
+
+def _srt_time(seconds: float) -> str:
+    hours, rest = divmod(int(seconds), 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d},000"
+
+
+# Gemini
+
+
+class _Usage:
+    def __init__(self, prompt_tokens: int, output_tokens: int) -> None:
+        self.prompt_token_count = prompt_tokens
+        self.candidates_token_count = output_tokens
+
+
+class _Chunk:
+    def __init__(self, text: str) -> None:
+        self.text = text
+        # Real chunks have no parts when generation stopped without text
+        self.parts = [text] if text else []
+
+
+class _Response:
+    def __init__(self, text: str, prompt: str) -> None:
+        self.text = text
+        self.usage_metadata = _Usage(len(prompt) // 4, len(text) // 4)
+
+
+class _StreamResponse(_Response):
+    """Streamed response: chunks arrive at the configured token rate."""
+
+    def __iter__(self) -> Iterator[_Chunk]:
+        lines = self.text.splitlines(keepends=True)
+        for line in lines:
+            time.sleep(len(line) / 4 / _settings.gemini_tokens_per_second)
+            yield _Chunk(line)
+
+
+class FakeGenerativeModel:
+    """Answers every prompt with canned key points, summary text or JSON."""
+
+    def __init__(self, model_name: str, **_kwargs: object) -> None:
+        """Name the model the way the real client does."""
+        self.model_name = f"models/{model_name}"
+
+    def generate_content(
+        self,
+        prompt: object,
+        *,
+        stream: bool = False,
+        generation_config: dict | None = None,
+        **_kwargs: object,
+    ) -> _Response:
+        """Answer after the configured latency, optionally as a stream."""
+        text = _answer(generation_config)
+        if stream:
+            time.sleep(_settings.gemini_latency)
+            return _StreamResponse(text, str(prompt))
+        time.sleep(_generation_seconds(text))
+        return _Response(text, str(prompt))
+
+    async def generate_content_async(
+        self,
+        prompt: object,
+        *,
+        generation_config: dict | None = None,
+        **_kwargs: object,
+    ) -> _Response:
+        """Answer after the configured latency without blocking the loop."""
+        text = _answer(generation_config)
+        await asyncio.sleep(_generation_seconds(text))
+        return _Response(text, str(prompt))
+
+
+def _generation_seconds(text: str) -> float:
+    return _settings.gemini_latency + len(text) / 4 / _settings.gemini_tokens_per_second
+
+
+def _answer(generation_config: dict | None) -> str:
+    """Build an answer of about gemini_output_tokens tokens.
+
+    Lines look like "MM:SS - Title: text", which parses as key points and
+    reads fine as summary text; JSON mode gets the combined-call schema.
+    """
+    n_points = max(1, _settings.gemini_output_tokens * 4 // 80)
+    points = [
+        {
+            "timestamp": f"{i:02d}:00",
+            "title": f"Topic {i}",
+            "summary": "what the speaker covers in this part",
+        }
+        for i in range(n_points)
+    ]
+    if generation_config and "json" in str(generation_config):
+        return json.dumps({"key_points": points, "summary": "A canned summary."})
+    return "\n".join(
+        f"{point['timestamp']} - {point['title']}: {point['summary']}"
+        for point in points
+    )
+
+
+# youtube-dl
+
+
+class FakeYoutubeDL:
+    """Resolves and "downloads" audio as a sparse file of a plausible size."""
+
+    # Roughly the bitrate of YouTube's opus audio
+    AUDIO_BYTES_PER_SECOND = 16_000
+
+    def __init__(self, params: dict | None = None) -> None:
+        """Keep the options; only "outtmpl" is used."""
+        self.params = params or {}
+
+    def __enter__(self) -> Self:
+        """Return the downloader itself."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> bool:
+        """Let exceptions propagate."""
+        return False
+
+    def extract_info(self, url: str, *, download: bool = True) -> dict:
+        """Resolve a video and, if asked, write its audio file."""
+        video_id = url.rsplit("=", 1)[-1].rsplit("/", 1)[-1]
+        info = {
+            "id": video_id,
+            "ext": "webm",
+            "duration": video_duration(),
+            "url": f"https://media.invalid/{video_id}.webm",
+            "http_headers": {},
+        }
+        if download:
+            time.sleep(_settings.download_latency)
+            path = Path(self.prepare_filename(info))
+            with path.open("wb") as f:
+                f.truncate(int(video_duration() * self.AUDIO_BYTES_PER_SECOND))
+        return info
+
+    def prepare_filename(self, info: dict) -> str:
+        """Return the output path the options give for a video."""
+        return self.params.get("outtmpl", "%(id)s.%(ext)s") % info
+
+
+# Whisper
+
+
+class _Parameter:
+    def __init__(self, count: int) -> None:
+        self.count = count
+
+    def numel(self) -> int:
+        return self.count
+
+    @staticmethod
+    def element_size() -> int:
+        return 4
+
+
+class FakeWhisperModel:
+    """Transcribes a downloaded fake video at the configured speed."""
+
+    def __init__(self, name: str) -> None:
+        """Remember the model name."""
+        self.name = name
+
+    def parameters(self) -> list[_Parameter]:
+        """Return a single parameter tensor of the model's total size."""
+        # About the size of the "tiny" model
+        return [_Parameter(39_000_000)]
+
+    def transcribe(self, audio: object, **_kwargs: object) -> dict:
+        """Return evenly spaced segments after the configured transcription time."""
+        video_id = Path(audio).stem if isinstance(audio, str) else "audio"
+        time.sleep(video_duration() / _settings.whisper_speed)
+        segments = [
+            {
+                "start": i * SEGMENT_SECONDS,
+                "end": (i + 1) * SEGMENT_SECONDS,
+                "text": " " + segment_text(video_id, i),
+            }
+            for i in range(_settings.segments)
+        ]
+        return {"segments": segments, "text": "".join(s["text"] for s in segments)}
+
+
+def _load_whisper_model(name: str) -> FakeWhisperModel:
+    time.sleep(_settings.model_load_latency)
+    return FakeWhisperModel(name)
@@ -1,5 +1,6 @@
 """Configuration settings for the YouTube Video Summarizer."""
 import os
+from pathlib import Path
 
 from dotenv import load_dotenv
 
@@ -20,8 +21,125 @@ os.makedirs(OUTPUT_DIR, exist_ok=True)
 YOUTUBE_API_SERVICE_NAME = "youtube"
 YOUTUBE_API_VERSION = "v3"
 
+# Caption track selection: languages in order of preference, and track kinds
+# in order of preference ("standard" = uploaded by the creator, "asr" =
+# auto-generated, "translated" = another track machine-translated by YouTube)
+CAPTION_LANGUAGES = [
+    lang.strip()
+    for lang in os.getenv("CAPTION_LANGUAGES", "en").split(",")
+    if lang.strip()
+]
+CAPTION_KINDS = [
+    kind.strip()
+    for kind in os.getenv("CAPTION_KINDS", "standard,asr,translated").split(",")
+    if kind.strip()
+]
+# How long a video's caption track list is trusted (seconds, 0 = forever).
+# This includes "no captions" results, which send the video straight to Whisper
+CAPTION_LIST_TTL_SECONDS = int(os.getenv("CAPTION_LIST_TTL_SECONDS", "86400"))
+
 # Whisper model options: "tiny", "base", "small", "medium", "large"
 WHISPER_MODEL = os.getenv("WHISPER_MODEL", "base")
 
 # Gemini model
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
+
+# Batch processing: concurrent pipelines limited per stage kind
+# (network-bound caption/Gemini stages vs. CPU-bound Whisper transcription)
+BATCH_IO_WORKERS = int(os.getenv("BATCH_IO_WORKERS", "8"))
+BATCH_WHISPER_WORKERS = int(os.getenv("BATCH_WHISPER_WORKERS", "1"))
+# Batch scheduling: metadata for this many upcoming videos is fetched in bulk
+# and they are started longest expected job first (0 = keep input order)
+BATCH_SCHEDULE_WINDOW = int(os.getenv("BATCH_SCHEDULE_WINDOW", "200"))
+
+# Playlist and channel sync: IDs of the videos already summarized per playlist
+SYNC_STATE_PATH = os.getenv(
+    "SYNC_STATE_PATH", str(Path(OUTPUT_DIR) / "sync_state.json"),
+)
+
+# Whisper model pool: loaded models are shared across calls and threads.
+# Idle models are evicted past the memory budget (MB, 0 = unlimited) or
+# after being unused for WHISPER_POOL_IDLE_SECONDS (0 = never)
+WHISPER_POOL_MEMORY_BUDGET_MB = int(os.getenv("WHISPER_POOL_MEMORY_BUDGET_MB", "0"))
+WHISPER_POOL_IDLE_SECONDS = int(os.getenv("WHISPER_POOL_IDLE_SECONDS", "0"))
+
+# Result cache for every pipeline stage (transcripts, key points, summaries).
+# Size limit in MB (0 = unlimited) and entry lifetime in seconds (0 = forever)
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+CACHE_DIR = os.getenv("CACHE_DIR", str(Path(OUTPUT_DIR) / "cache"))
+CACHE_MAX_MB = int(os.getenv("CACHE_MAX_MB", "0"))
+CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", "0"))
+
+# Parallel Whisper: split audio at silences into chunks of about
+# WHISPER_CHUNK_SECONDS and transcribe them in this many processes
+# (0 or 1 = single sequential pass)
+WHISPER_PARALLEL_WORKERS = int(os.getenv("WHISPER_PARALLEL_WORKERS", "0"))
+WHISPER_CHUNK_SECONDS = int(os.getenv("WHISPER_CHUNK_SECONDS", "300"))
+
+# Hierarchical (map-reduce) summarization of transcripts too long for a single
+# prompt: windows of about LLM_WINDOW_TOKENS are summarized concurrently
+# (up to LLM_MAP_WORKERS at once) and then combined
+HIERARCHICAL_SUMMARIES = os.getenv("HIERARCHICAL_SUMMARIES", "true").lower() == "true"
+LLM_WINDOW_TOKENS = int(os.getenv("LLM_WINDOW_TOKENS", "3000"))
+LLM_MAP_WORKERS = int(os.getenv("LLM_MAP_WORKERS", "8"))
+
+# Rate limits shared by every pipeline in the process (0 = unlimited).
+# Calls beyond these limits wait for capacity instead of failing
+YOUTUBE_QPS = float(os.getenv("YOUTUBE_QPS", "10"))
+YOUTUBE_DAILY_QUOTA = int(os.getenv("YOUTUBE_DAILY_QUOTA", "10000"))
+GEMINI_RPM = float(os.getenv("GEMINI_RPM", "60"))
+GEMINI_TPM = float(os.getenv("GEMINI_TPM", "1000000"))
+
+# Retries for throttled (429/403 rate limit) and transient 5xx API errors,
+# with full-jitter exponential backoff
+API_MAX_RETRIES = int(os.getenv("API_MAX_RETRIES", "6"))
+API_BACKOFF_BASE_SECONDS = float(os.getenv("API_BACKOFF_BASE_SECONDS", "1"))
+API_BACKOFF_MAX_SECONDS = float(os.getenv("API_BACKOFF_MAX_SECONDS", "60"))
+
+# Maximum time importing the CLI may take, checked by `python -m utils.import_budget`
+IMPORT_TIME_BUDGET_MS = int(os.getenv("IMPORT_TIME_BUDGET_MS", "500"))
+
+# How Whisper gets its audio: "native" keeps the downloaded audio in its
+# original container (no lossy re-encode), "stream" decodes straight from
+# YouTube into memory without writing a file, "pipelined" also transcribes
+# while downloading, "mp3" re-encodes to MP3 (legacy)
+WHISPER_AUDIO_MODE = os.getenv("WHISPER_AUDIO_MODE", "native")
+
+# Window length for WHISPER_AUDIO_MODE="pipelined", which transcribes each
+# window of audio while the rest is still downloading
+WHISPER_STREAM_WINDOW_SECONDS = int(os.getenv("WHISPER_STREAM_WINDOW_SECONDS", "60"))
+
+# Voice-activity detection before Whisper: only audio at least
+# WHISPER_VAD_THRESHOLD_DB above the recording's noise floor is transcribed
+WHISPER_VAD = os.getenv("WHISPER_VAD", "false").lower() == "true"
+WHISPER_VAD_THRESHOLD_DB = float(os.getenv("WHISPER_VAD_THRESHOLD_DB", "12"))
+
+# On-disk transcript format: "json" or "binary" (columnar, memory-mapped on
+# load). Both formats are always readable; TRANSCRIPT_COMPRESS zlib-compresses
+# binary files
+TRANSCRIPT_FORMAT = os.getenv("TRANSCRIPT_FORMAT", "json")
+TRANSCRIPT_COMPRESS = os.getenv("TRANSCRIPT_COMPRESS", "false").lower() == "true"
+
+# Gemini prices in US dollars per million tokens, used to estimate LLM spend
+# in the metrics (0 leaves costs at zero)
+GEMINI_INPUT_COST_PER_MTOK = float(os.getenv("GEMINI_INPUT_COST_PER_MTOK", "0"))
+GEMINI_OUTPUT_COST_PER_MTOK = float(os.getenv("GEMINI_OUTPUT_COST_PER_MTOK", "0"))
+
+# Split long transcripts at content-defined window boundaries and cache each
+# window's intermediate result, so a partially changed transcript (refreshed
+# captions, a re-run transcription) only re-processes the changed windows
+INCREMENTAL_SUMMARIES = os.getenv("INCREMENTAL_SUMMARIES", "true").lower() == "true"
+
+# Strip rolling caption duplicates, non-speech tags like [Music] and repeated
+# phrases, and merge cues into sentences before prompting, so more of the
+# video's content fits in each prompt
+TRANSCRIPT_COMPRESSION = os.getenv("TRANSCRIPT_COMPRESSION", "true").lower() == "true"
+
+# HTTP service (server.py): listen address, concurrent pipelines, max distinct
+# jobs running or queued (0 for no limit) and how long a request waits for
+# its result before getting a "pending" reply
+SERVER_HOST = os.getenv("SERVER_HOST", "127.0.0.1")
+SERVER_PORT = int(os.getenv("SERVER_PORT", "8000"))
+SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", "8"))
+SERVER_MAX_PENDING = int(os.getenv("SERVER_MAX_PENDING", "100"))
+SERVER_REQUEST_TIMEOUT = float(os.getenv("SERVER_REQUEST_TIMEOUT", "600"))
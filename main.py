@@ -2,9 +2,15 @@
 import argparse
 import logging
 import sys
+from collections.abc import Iterator
+from pathlib import Path
 
 import config
+from processors.batch_processor import BatchProcessor, BatchResult
+from processors.playlist_processor import PlaylistProcessor
 from processors.video_processor import VideoProcessor
+from utils.metrics import JsonLinesWriter, get_metrics
+from utils.youtube_utils import parse_youtube_url
 
 # Set up logging
 logging.basicConfig(
@@ -17,33 +23,167 @@ logger = logging.getLogger(__name__)
 def parse_arguments():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(description="YouTube Video Summarizer")
-    parser.add_argument("video_url", help="URL of the YouTube video to summarize")
     parser.add_argument(
-        "--method", 
-        choices=["api", "download"], 
+        "video_url",
+        nargs="?",
+        help="URL of the YouTube video, playlist or channel to summarize",
+    )
+    parser.add_argument(
+        "--method",
+        choices=["api", "download"],
         default="api",
-        help="Method to obtain transcription: 'api' (YouTube API) or 'download' (youtube-dl + Whisper)"
+        help=(
+            "Method to obtain transcription: 'api' (YouTube API) or "
+            "'download' (youtube-dl + Whisper)"
+        ),
     )
     parser.add_argument(
-        "--force-download", 
+        "--force-download",
         action="store_true",
         help="Force download and transcription even if API transcription is available"
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--combined",
+        action="store_true",
+        help="Generate key points and summary in a single Gemini call",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print key points and summary text as soon as they are generated",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore cached transcripts, key points and summaries from earlier runs",
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="Summarize every URL in FILE (one per line, '-' for stdin) concurrently",
+    )
+    parser.add_argument(
+        "--full-sync",
+        action="store_true",
+        help="Channel mode: page through every upload, not just the new ones",
+    )
+    parser.add_argument(
+        "--io-workers",
+        type=int,
+        default=config.BATCH_IO_WORKERS,
+        help="Batch mode: max videos in caption-fetch/Gemini stages at once",
+    )
+    parser.add_argument(
+        "--whisper-workers",
+        type=int,
+        default=config.BATCH_WHISPER_WORKERS,
+        help="Batch mode: max videos transcribing with Whisper at once",
+    )
+    parser.add_argument(
+        "--metrics-out",
+        metavar="FILE",
+        help="Write per-stage timing, token and cost metrics to FILE",
+    )
+    parser.add_argument(
+        "--metrics-format",
+        choices=["jsonl", "prometheus"],
+        default="jsonl",
+        help="Metrics format: one JSON line per span, or Prometheus totals at exit",
+    )
+    args = parser.parse_args()
+    if not args.video_url and not args.batch:
+        parser.error("either video_url or --batch is required")
+    args.collection = False
+    if args.video_url:
+        try:
+            args.collection = parse_youtube_url(args.video_url).is_collection
+        except ValueError as e:
+            parser.error(str(e))
+    if args.stream and (args.batch or args.combined or args.collection):
+        parser.error(
+            "--stream cannot be combined with --batch, --combined or a playlist",
+        )
+    return args
 
-def main():
-    """Main execution function."""
-    args = parse_arguments()
+def read_batch_urls(path: str) -> Iterator[str]:
+    """Yield non-empty, non-comment URLs from a file or stdin."""
+    stream = sys.stdin if path == "-" else Path(path).open(encoding="utf-8")  # noqa: SIM115
+    try:
+        for line in stream:
+            url = line.strip()
+            if url and not url.startswith("#"):
+                yield url
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+def print_batch_result(result: BatchResult) -> None:
+    """Print the outcome of one batch video."""
+    if result.ok:
+        print(f"\n=== VIDEO SUMMARY: {result.video_url} ===\n")
+        print(result.summary)
+    else:
+        print(f"\n=== FAILED: {result.video_url} ===\n{result.error}")
+
+def run_batch(args: argparse.Namespace) -> int:
+    """Summarize every URL listed in the batch input."""
+    batch = BatchProcessor(
+        io_workers=args.io_workers,
+        whisper_workers=args.whisper_workers,
+    )
+    results = batch.run(
+        read_batch_urls(args.batch),
+        method=args.method,
+        force_download=args.force_download,
+        combined=args.combined,
+        on_result=print_batch_result,
+    )
+    failed = [result for result in results if not result.ok]
+    logger.info("Processed %d videos, %d failed", len(results), len(failed))
+    return 1 if failed else 0
+
+def run_playlist(args: argparse.Namespace) -> int:
+    """Summarize the videos of a playlist or channel not summarized before."""
+    playlist = PlaylistProcessor(
+        args.video_url,
+        batch=BatchProcessor(
+            io_workers=args.io_workers,
+            whisper_workers=args.whisper_workers,
+        ),
+    )
+    results = playlist.run(
+        full=args.full_sync,
+        method=args.method,
+        force_download=args.force_download,
+        combined=args.combined,
+        on_result=print_batch_result,
+    )
+    failed = [result for result in results if not result.ok]
+    logger.info("Processed %d new videos, %d failed", len(results), len(failed))
+    return 1 if failed else 0
 
-    logger.info(f"Processing video: {args.video_url}")
+def run_single(args: argparse.Namespace) -> int:
+    """Summarize the single video given on the command line."""
+    logger.info("Processing video: %s", args.video_url)
 
     # Initialize the video processor
     processor = VideoProcessor(args.video_url)
 
+    if args.stream:
+        print("\n=== VIDEO SUMMARY ===\n")
+        for piece in processor.process_stream(
+            method=args.method,
+            force_download=args.force_download,
+        ):
+            print(piece, end="", flush=True)
+        logger.info("Summary generation complete!")
+        return 0
+
     # Process the video and get the summary
     summary = processor.process(
         method=args.method,
-        force_download=args.force_download
+        force_download=args.force_download,
+        combined=args.combined,
     )
 
     # Print results
@@ -51,6 +191,53 @@ def main():
     print(summary)
 
     logger.info("Summary generation complete!")
+    return 0
+
+def start_metrics_export(args: argparse.Namespace) -> JsonLinesWriter | None:
+    """Register the JSON-lines metrics writer, if requested."""
+    if not args.metrics_out or args.metrics_format != "jsonl":
+        return None
+    writer = JsonLinesWriter(args.metrics_out)
+    get_metrics().add_hook(writer)
+    return writer
+
+def finish_metrics_export(
+    args: argparse.Namespace, writer: JsonLinesWriter | None,
+) -> None:
+    """Log LLM usage and write the Prometheus metrics, if requested."""
+    gemini = get_metrics().stage_totals().get("gemini_call")
+    if gemini:
+        logger.info(
+            "Gemini usage: %.0f calls, %.0f input / %.0f output tokens, $%.4f",
+            gemini["count"],
+            gemini.get("input_tokens", 0),
+            gemini.get("output_tokens", 0),
+            gemini.get("cost_usd", 0),
+        )
+    if writer:
+        get_metrics().remove_hook(writer)
+        writer.close()
+    elif args.metrics_out:
+        Path(args.metrics_out).write_text(get_metrics().to_prometheus())
+
+def main() -> None:
+    """Run the command line interface."""
+    args = parse_arguments()
+
+    if args.no_cache:
+        config.CACHE_ENABLED = False
+
+    writer = start_metrics_export(args)
+    try:
+        if args.batch:
+            status = run_batch(args)
+        elif args.collection:
+            status = run_playlist(args)
+        else:
+            status = run_single(args)
+    finally:
+        finish_metrics_export(args, writer)
+    sys.exit(status)
 
 if __name__ == "__main__":
     main()
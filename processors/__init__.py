@@ -0,0 +1 @@
+"""Pipeline stages: transcript, key point and summary generation."""
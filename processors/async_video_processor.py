@@ -0,0 +1,292 @@
+"""Asyncio-native variant of the video processing pipeline."""
+
+import asyncio
+import contextvars
+import logging
+from collections.abc import Iterable
+from concurrent.futures import Executor
+
+import config
+from processors.batch_processor import BatchResult
+from processors.combined_generator import CombinedGenerator
+from processors.summary_generator import SummaryGenerator
+from processors.video_processor import VideoProcessor
+from transcribers.youtube_api_transcriber import NoCaptionsError
+from utils.cache import ResultCache
+from utils.metrics import span, video_scope
+from utils.rate_limit import ApiLimitError
+from utils.transcript_utils import Transcript, transcript_hash
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncVideoProcessor(VideoProcessor):
+    """Runs the video pipeline as coroutines on an asyncio event loop.
+
+    Network stages run as coroutines (Gemini) or on worker threads (the
+    blocking googleapiclient calls), and Whisper is offloaded to an executor,
+    so many pipelines can be interleaved on a single event loop. Cache file
+    I/O and transcript compression also run on worker threads, so no pipeline
+    blocks the loop while it reads, writes or compacts a large transcript.
+    """
+
+    def __init__(
+        self,
+        video_url: str,
+        stage_limits: dict | None = None,
+        cache: ResultCache | None = None,
+        whisper_executor: Executor | None = None,
+    ) -> None:
+        """Initialize a new AsyncVideoProcessor.
+
+        Args:
+            video_url (str): URL of the YouTube video to process
+            stage_limits (dict): Optional mapping of stage kind ("io" or
+                "whisper") to an asyncio.Semaphore bounding how many pipelines
+                may run that kind of stage at once
+            cache (ResultCache): Stage result cache; defaults to the shared
+                cache when config.CACHE_ENABLED is set
+            whisper_executor (concurrent.futures.Executor): Executor running
+                Whisper transcription; defaults to the loop's default executor
+
+        """
+        super().__init__(video_url, stage_limits=stage_limits, cache=cache)
+        self.whisper_executor = whisper_executor
+
+    async def process(
+        self,
+        method: str = "api",
+        *,
+        force_download: bool = False,
+        combined: bool = False,
+    ) -> str:
+        """Process the video to generate a summary.
+
+        Args:
+            method (str): Method to obtain transcription: 'api' or 'download'
+            force_download (bool): Force download even if API transcription is available
+            combined (bool): Generate key points and summary in a single Gemini call
+
+        Returns:
+            str: Generated summary
+
+        """
+        with video_scope(self.video_id), span("video"):
+            with span("transcript"):
+                await self._get_transcript(method, force_download)
+            await asyncio.to_thread(self._compress_transcript)
+            combined = combined and self._fits_combined_prompt()
+            if combined:
+                try:
+                    with span("combined"):
+                        await self._generate_combined()
+                except ValueError as e:
+                    logger.warning("%s; using separate calls instead", e)
+                    combined = False
+            if not combined:
+                with span("timestamps"):
+                    await self._generate_timestamps()
+                with span("summary"):
+                    await self._generate_summary()
+        return self.summary
+
+    async def _cache_get_async(self, stage: str, **inputs: object) -> object:
+        """Look up a stage result on a worker thread, keeping the loop free."""
+        return await asyncio.to_thread(self._cache_get, stage, **inputs)
+
+    async def _cache_set_async(
+        self, stage: str, value: object, **inputs: object,
+    ) -> None:
+        """Store a stage result on a worker thread, keeping the loop free."""
+        await asyncio.to_thread(self._cache_set, stage, value, **inputs)
+
+    async def _get_transcript(self, method: str, force_download: bool) -> None:  # noqa: FBT001
+        """Get the transcript using the specified method."""
+        use_api = method == "api" and not force_download
+
+        # Reuse a transcript from an earlier run before making any network calls
+        transcript = (
+            await self._cache_get_async(
+                "api_transcript", **self._api_transcript_inputs(),
+            )
+            if use_api
+            else None
+        )
+        if transcript is None:
+            transcript = await self._cache_get_async(
+                "whisper_transcript", model=config.WHISPER_MODEL,
+            )
+        if transcript:
+            self.transcript = Transcript.from_segments(transcript)
+            return
+
+        # Try YouTube API first if specified and not forcing download
+        if use_api:
+            try:
+                logger.info("Attempting to fetch transcript via YouTube API...")
+                async with self._stage("io"):
+                    transcript = await self._fetch_api_transcript()
+                if transcript:
+                    logger.info("Successfully retrieved transcript from YouTube API")
+                    await self._cache_set_async(
+                        "api_transcript", transcript, **self._api_transcript_inputs(),
+                    )
+                    self.transcript = transcript
+                    return
+            except ApiLimitError:
+                # Still throttled after retrying, or out of quota: both pass,
+                # so surface them rather than paying for a Whisper transcription
+                raise
+            except NoCaptionsError as e:
+                logger.info("%s; transcribing with Whisper instead", e)
+            except Exception as e:  # noqa: BLE001
+                logger.warning("Failed to get transcript via API: %s", e)
+                logger.info("Falling back to download method")
+
+        # Use Whisper transcription if API failed or download was specified
+        logger.info("Using youtube-dl and Whisper for transcription...")
+        loop = asyncio.get_running_loop()
+        async with self._stage("whisper"):
+            # Executors do not inherit the task's context; pass it along so
+            # the Whisper spans are attributed to this video
+            transcript = await loop.run_in_executor(
+                self.whisper_executor,
+                contextvars.copy_context().run,
+                self.whisper_transcriber.get_transcript,
+                self.video_url,
+            )
+
+        if transcript:
+            logger.info("Whisper transcription complete")
+            await self._cache_set_async(
+                "whisper_transcript", transcript, model=config.WHISPER_MODEL,
+            )
+            self.transcript = transcript
+        else:
+            logger.error("Failed to obtain transcript")
+            msg = "Could not obtain transcript through any method"
+            raise RuntimeError(msg)
+
+    async def _fetch_api_transcript(self) -> list:
+        """Fetch captions via the YouTube API on worker threads."""
+        captions = await asyncio.to_thread(
+            self.api_transcriber.list_captions, self.video_id,
+        )
+        track = self.api_transcriber.select_caption(captions, self.video_id)
+        return await asyncio.to_thread(
+            self.api_transcriber.download_caption,
+            track["id"],
+            translate_to=track["translate_to"],
+            video_id=self.video_id,
+        )
+
+    async def _generate_combined(self) -> None:
+        """Generate timestamps and summary from the transcript in one call."""
+        if not self.transcript:
+            msg = "No transcript available for summary generation"
+            raise ValueError(msg)
+
+        inputs = {
+            "model": config.GEMINI_MODEL,
+            "prompt_version": CombinedGenerator.PROMPT_VERSION,
+            "transcript": transcript_hash(self.transcript),
+        }
+        result = await self._cache_get_async("combined", **inputs)
+        if result is None:
+            logger.info("Generating timestamps and summary in one call...")
+            async with self._stage("io"):
+                timestamps, summary = await self.combined_generator.generate_async(
+                    self.transcript,
+                )
+            result = {"timestamps": timestamps, "summary": summary}
+            await self._cache_set_async("combined", result, **inputs)
+
+        self.timestamps = result["timestamps"]
+        self.summary = result["summary"]
+        logger.info("Generated %d key timestamps and summary", len(self.timestamps))
+
+    async def _generate_timestamps(self) -> None:
+        """Generate timestamps from the transcript."""
+        if not self.transcript:
+            msg = "No transcript available for timestamp generation"
+            raise ValueError(msg)
+
+        inputs = self._timestamps_inputs()
+        self.timestamps = await self._cache_get_async("timestamps", **inputs)
+        if self.timestamps is None:
+            logger.info("Generating timestamps...")
+            async with self._stage("io"):
+                self.timestamps = await self.timestamp_generator.generate_async(
+                    self.transcript,
+                )
+            await self._cache_set_async("timestamps", self.timestamps, **inputs)
+        logger.info("Generated %d key timestamps", len(self.timestamps))
+
+    async def _generate_summary(self) -> None:
+        """Generate summary from the transcript and timestamps."""
+        if not self.transcript or not self.timestamps:
+            msg = "Transcript and timestamps required for summary generation"
+            raise ValueError(msg)
+
+        inputs = self._summary_inputs()
+        summary_text = await self._cache_get_async("summary_text", **inputs)
+        if summary_text is None:
+            logger.info("Generating summary...")
+            async with self._stage("io"):
+                summary_text = await self.summary_generator.generate_text_async(
+                    self.transcript, self.timestamps,
+                )
+            await self._cache_set_async("summary_text", summary_text, **inputs)
+        self.summary = SummaryGenerator.format_output(
+            summary_text, "\n".join(self.timestamps),
+        )
+        logger.info("Summary generation complete")
+
+
+async def process_many(  # noqa: PLR0913
+    video_urls: Iterable[str],
+    method: str = "api",
+    *,
+    force_download: bool = False,
+    combined: bool = False,
+    io_workers: int | None = None,
+    whisper_workers: int | None = None,
+    whisper_executor: Executor | None = None,
+) -> list[BatchResult]:
+    """Summarize many videos by interleaving their pipelines on one event loop.
+
+    Args:
+        video_urls (iterable): URLs of the YouTube videos to summarize
+        method (str): Method to obtain transcription: 'api' or 'download'
+        force_download (bool): Force download even if API transcription is available
+        combined (bool): Generate key points and summary in a single Gemini call
+        io_workers (int): Max pipelines in a network-bound stage at once
+        whisper_workers (int): Max pipelines transcribing with Whisper at once
+        whisper_executor (concurrent.futures.Executor): Executor running Whisper
+
+    Returns:
+        list: BatchResult for every video, in input order
+
+    """
+    stage_limits = {
+        "io": asyncio.Semaphore(io_workers or config.BATCH_IO_WORKERS),
+        "whisper": asyncio.Semaphore(whisper_workers or config.BATCH_WHISPER_WORKERS),
+    }
+
+    async def process_one(video_url: str) -> BatchResult:
+        try:
+            processor = AsyncVideoProcessor(
+                video_url,
+                stage_limits=stage_limits,
+                whisper_executor=whisper_executor,
+            )
+            summary = await processor.process(
+                method=method, force_download=force_download, combined=combined,
+            )
+            return BatchResult(video_url=video_url, summary=summary)
+        except Exception as e:
+            # One failing video must not stop the batch
+            logger.exception("Failed to process %s", video_url)
+            return BatchResult(video_url=video_url, error=str(e))
+
+    return await asyncio.gather(*(process_one(url) for url in video_urls))
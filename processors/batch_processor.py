@@ -0,0 +1,237 @@
+"""Class for summarizing many YouTube videos concurrently."""
+
+import contextlib
+import functools
+import itertools
+import logging
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+
+import config
+from processors.video_processor import VideoProcessor
+from transcribers.youtube_api_transcriber import YouTubeAPITranscriber
+from utils.cache import get_result_cache
+from utils.time_helpers import iso_duration_to_seconds
+from utils.youtube_utils import extract_video_id
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BatchResult:
+    """Outcome of processing a single video in a batch."""
+
+    video_url: str
+    summary: str | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the video was summarized successfully."""
+        return self.error is None
+
+
+class BatchProcessor:
+    """Runs many VideoProcessor pipelines with bounded concurrency.
+
+    Network-bound stages (caption fetch, Gemini calls) and the CPU-bound
+    Whisper stage are limited separately, so a few long transcriptions cannot
+    starve the cheap API-only videos and vice versa.
+
+    Videos are scheduled a window at a time: metadata for the whole window is
+    fetched in bulk, and the longest videos start first so the batch is not
+    left waiting on one long job at the end. Videos expected to need Whisper
+    are interleaved with the API-only ones in proportion to the worker
+    limits, which starts long transcriptions early without letting them
+    occupy every pipeline slot.
+    """
+
+    def __init__(
+        self,
+        io_workers: int | None = None,
+        whisper_workers: int | None = None,
+        schedule_window: int | None = None,
+    ) -> None:
+        """Initialize the BatchProcessor.
+
+        Args:
+            io_workers (int): Max pipelines in a network-bound stage at once
+            whisper_workers (int): Max pipelines transcribing with Whisper at once
+            schedule_window (int): Videos whose metadata is fetched and ordered
+                together; 0 keeps the input order
+
+        """
+        self.io_workers = io_workers or config.BATCH_IO_WORKERS
+        self.whisper_workers = whisper_workers or config.BATCH_WHISPER_WORKERS
+        self.schedule_window = (
+            config.BATCH_SCHEDULE_WINDOW if schedule_window is None else schedule_window
+        )
+        self.stage_limits = {
+            "io": threading.BoundedSemaphore(self.io_workers),
+            "whisper": threading.BoundedSemaphore(self.whisper_workers),
+        }
+
+    def run(
+        self,
+        video_urls: Iterable[str],
+        method: str = "api",
+        *,
+        force_download: bool = False,
+        combined: bool = False,
+        on_result: Callable[[BatchResult], None] | None = None,
+    ) -> list[BatchResult]:
+        """Process a batch of videos, continuing past individual failures.
+
+        URLs are consumed lazily, one schedule window at a time, so
+        ``video_urls`` may be a generator; only a bounded number of pipelines
+        are in flight at any time.
+
+        Args:
+            video_urls (iterable): URLs of the YouTube videos to summarize
+            method (str): Method to obtain transcription: 'api' or 'download'
+            force_download (bool): Force download even if API transcription is available
+            combined (bool): Generate key points and summary in a single Gemini call
+            on_result (callable): Optional callback invoked with each BatchResult
+                as soon as it completes
+
+        Returns:
+            list: BatchResult for every video, in completion order
+
+        """
+        max_in_flight = self.io_workers + self.whisper_workers
+        results = []
+        options = {
+            "method": method,
+            "force_download": force_download,
+            "combined": combined,
+        }
+        urls = (
+            self._schedule(video_urls, options)
+            if self.schedule_window
+            else iter(video_urls)
+        )
+
+        with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            pending = {
+                executor.submit(self._process_one, url, options)
+                for url in itertools.islice(urls, max_in_flight)
+            }
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    results.append(result)
+                    if on_result:
+                        on_result(result)
+                for url in itertools.islice(urls, len(done)):
+                    pending.add(executor.submit(self._process_one, url, options))
+
+        failed = sum(1 for result in results if not result.ok)
+        logger.info(
+            "Batch complete: %d succeeded, %d failed",
+            len(results) - failed,
+            failed,
+        )
+        return results
+
+    @functools.cached_property
+    def api_transcriber(self) -> YouTubeAPITranscriber:
+        """YouTube Data API client used for the metadata prefetch."""
+        return YouTubeAPITranscriber(
+            cache=get_result_cache() if config.CACHE_ENABLED else None,
+        )
+
+    def _schedule(self, video_urls: Iterable[str], options: dict) -> Iterator[str]:
+        """Yield URLs a window at a time, each window in scheduling order."""
+        urls = iter(video_urls)
+        while window := list(itertools.islice(urls, self.schedule_window)):
+            yield from self._order_window(window, options)
+
+    def _order_window(self, urls: list[str], options: dict) -> list[str]:
+        """Order a window of URLs, longest expected job first.
+
+        Args:
+            urls (list): URLs in input order
+            options (dict): Options the videos will be processed with
+
+        Returns:
+            list: The same URLs in the order they should start
+
+        """
+        video_ids = {}
+        for url in urls:
+            # A bad URL is reported when the video itself fails
+            with contextlib.suppress(ValueError):
+                video_ids[url] = extract_video_id(url)
+
+        try:
+            metadata = self.api_transcriber.get_videos_metadata(
+                list(video_ids.values()),
+            )
+        except Exception as e:  # noqa: BLE001 - scheduling is only an optimization
+            logger.warning("Metadata prefetch failed, keeping input order: %s", e)
+            return urls
+
+        all_whisper = options["method"] == "download" or options["force_download"]
+        whisper_jobs = []
+        api_jobs = []
+        for url in urls:
+            video = metadata.get(video_ids.get(url), {})
+            duration = iso_duration_to_seconds(
+                video.get("contentDetails", {}).get("duration", ""),
+            )
+            if all_whisper or needs_whisper(video):
+                whisper_jobs.append((duration, url))
+            else:
+                api_jobs.append((duration, url))
+
+        # Stable sorts keep the input order among equally long videos
+        whisper_jobs.sort(key=lambda job: job[0], reverse=True)
+        api_jobs.sort(key=lambda job: job[0], reverse=True)
+        logger.info(
+            "Scheduled %d videos (%d expected to need Whisper), longest first",
+            len(urls),
+            len(whisper_jobs),
+        )
+        return self._interleave(whisper_jobs, api_jobs)
+
+    def _interleave(self, whisper_jobs: list, api_jobs: list) -> list[str]:
+        """Merge the two job lists in proportion to the worker limits."""
+        ordered = []
+        whisper_index = api_index = 0
+        while whisper_index < len(whisper_jobs) or api_index < len(api_jobs):
+            whisper_behind = (
+                whisper_index * self.io_workers <= api_index * self.whisper_workers
+            )
+            if whisper_index < len(whisper_jobs) and (
+                whisper_behind or api_index == len(api_jobs)
+            ):
+                ordered.append(whisper_jobs[whisper_index][1])
+                whisper_index += 1
+            else:
+                ordered.append(api_jobs[api_index][1])
+                api_index += 1
+        return ordered
+
+    def _process_one(self, video_url: str, options: dict) -> BatchResult:
+        """Run the full pipeline for one video, capturing any failure."""
+        try:
+            processor = VideoProcessor(video_url, stage_limits=self.stage_limits)
+            summary = processor.process(**options)
+            return BatchResult(video_url=video_url, summary=summary)
+        except Exception as e:
+            # One failing video must not stop the batch
+            logger.exception("Failed to process %s", video_url)
+            return BatchResult(video_url=video_url, error=str(e))
+
+
+def needs_whisper(metadata: dict) -> bool:
+    """Whether a video is expected to need Whisper rather than its captions.
+
+    A video whose metadata says it has no captions usually has none the API
+    can download. It may still have auto-generated captions, so this only
+    guides scheduling; the pipeline still tries the API first.
+    """
+    return metadata.get("contentDetails", {}).get("caption") == "false"
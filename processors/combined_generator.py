@@ -0,0 +1,149 @@
+"""Class for generating key points and a summary in a single Gemini call."""
+
+import json
+import logging
+import re
+from collections.abc import Sequence
+
+import config
+from processors.summary_generator import SummaryGenerator
+from processors.timestamp_generator import TimestampGenerator
+from utils.clients import get_gemini_model
+from utils.transcript_utils import format_transcript_text
+
+logger = logging.getLogger(__name__)
+
+# A response wrapped in a Markdown code fence, e.g. ```json ... ```
+_CODE_FENCE = re.compile(r"^```[a-z]*\s*(.*?)\s*```$", re.IGNORECASE | re.DOTALL)
+
+
+class CombinedGenerator:
+    """Generates timestamps with key points and a summary in one structured call.
+
+    This sends the transcript to Gemini once instead of twice, roughly halving
+    LLM latency and input-token cost compared to running TimestampGenerator
+    followed by SummaryGenerator.
+    """
+
+    # Bump whenever the prompt changes so cached results are not reused
+    PROMPT_VERSION = 1
+
+    # Transcripts longer than this are truncated in the prompt
+    MAX_TRANSCRIPT_CHARS = 15000
+
+    def __init__(self) -> None:
+        """Initialize the CombinedGenerator."""
+        # Shared Gemini client, configured once per process
+        self.model = get_gemini_model(config.GEMINI_MODEL)
+
+    def generate(self, transcript: list) -> tuple[list, str]:
+        """Generate key points and a summary of a transcript in one request.
+
+        Args:
+            transcript (list): List of transcript segments
+
+        Returns:
+            tuple: (list of timestamps with key points, formatted summary str)
+
+        """
+        full_text = self._format_transcript_for_prompt(
+            transcript, max_chars=self.MAX_TRANSCRIPT_CHARS,
+        )
+        prompt = self._create_prompt(full_text)
+
+        response = self.model.generate_content(
+            prompt,
+            generation_config={"response_mime_type": "application/json"},
+        )
+
+        return self._build_result(response.text)
+
+    async def generate_async(self, transcript: list) -> tuple[list, str]:
+        """Generate key points and a summary without blocking the event loop.
+
+        Args:
+            transcript (list): List of transcript segments
+
+        Returns:
+            tuple: (list of timestamps with key points, formatted summary str)
+
+        """
+        full_text = self._format_transcript_for_prompt(
+            transcript, max_chars=self.MAX_TRANSCRIPT_CHARS,
+        )
+        prompt = self._create_prompt(full_text)
+
+        response = await self.model.generate_content_async(
+            prompt,
+            generation_config={"response_mime_type": "application/json"},
+        )
+
+        return self._build_result(response.text)
+
+    def _build_result(self, response_text: str) -> tuple[list, str]:
+        """Turn the raw JSON response into key points and the formatted summary."""
+        key_points, summary_text = self._parse_response(response_text)
+        key_points_text = "\n".join(key_points)
+        return key_points, SummaryGenerator.format_output(summary_text, key_points_text)
+
+    def _format_transcript_for_prompt(
+        self, transcript: Sequence[dict], max_chars: int | None = None,
+    ) -> str:
+        """Format transcript for the prompt."""
+        return format_transcript_text(
+            transcript, TimestampGenerator.format_segment, max_chars,
+        )
+
+    def _create_prompt(self, transcript_text: str) -> str:
+        """Create the prompt for Gemini API."""
+        return f"""
+        Below is a transcript of a YouTube video with timestamps.
+        Please do two things:
+
+        A. Identify 5-10 key points or topics discussed in the video. For each
+        key point, provide the timestamp where the topic begins (MM:SS), a brief
+        title (3-7 words) and a one-sentence summary of the point.
+
+        B. Write a comprehensive summary of the video that:
+        1. Starts with a brief overview of the video's main topic (1-2 sentences)
+        2. Includes the main ideas and key insights
+        3. Maintains the original meaning and context
+        4. Is well-structured and readable
+        5. Is around 3-5 paragraphs in length
+
+        Respond with a single JSON object of this form:
+        {{
+          "key_points": [
+            {{"timestamp": "MM:SS", "title": "...", "summary": "..."}}
+          ],
+          "summary": "..."
+        }}
+
+        Transcript:
+        {transcript_text[:self.MAX_TRANSCRIPT_CHARS]}
+        """
+
+    def _parse_response(self, response_text: str) -> tuple[list, str]:
+        """Parse the JSON response into key point lines and summary text."""
+        text = response_text.strip()
+        # Tolerate the model wrapping its JSON in a Markdown code fence
+        fenced = _CODE_FENCE.match(text)
+        if fenced:
+            text = fenced.group(1)
+
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError as e:
+            msg = f"Gemini returned invalid JSON for combined generation: {e}"
+            raise ValueError(msg) from e
+
+        try:
+            key_points = [
+                f"{point['timestamp']} - {point['title']}: {point['summary']}"
+                for point in data.get("key_points", [])
+            ]
+            summary = data.get("summary", "").strip()
+        except (AttributeError, KeyError, TypeError) as e:
+            msg = f"Gemini returned unexpected JSON for combined generation: {e!r}"
+            raise ValueError(msg) from e
+        return key_points, summary
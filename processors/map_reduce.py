@@ -0,0 +1,104 @@
+"""Helpers for map-reduce processing of long transcripts."""
+
+import contextvars
+import logging
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+import config
+
+if TYPE_CHECKING:
+    from utils.cache import ResultCache
+
+logger = logging.getLogger(__name__)
+
+# Video ID under which content-addressed window results are cached
+SHARED_VIDEO_ID = ""
+
+
+def map_windows(
+    func: Callable[[int, list], object],
+    windows: list,
+    max_workers: int | None = None,
+) -> list:
+    """Apply ``func`` to every window concurrently, preserving window order.
+
+    The calls are network-bound LLM requests, so running them on threads makes
+    the total latency close to that of the slowest single window.
+
+    Args:
+        func (callable): Called as ``func(index, window)`` for each window
+        windows (list): Windows to process
+        max_workers (int): Max concurrent calls; defaults to config.LLM_MAP_WORKERS
+
+    Returns:
+        list: Results of ``func`` in window order
+
+    """
+    if len(windows) == 1:
+        return [func(0, windows[0])]
+
+    max_workers = min(max_workers or config.LLM_MAP_WORKERS, len(windows))
+    logger.info("Processing %d transcript windows concurrently...", len(windows))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Run each call in a copy of the caller's context so metrics spans are
+        # still attributed to the video and stage being processed
+        futures = [
+            executor.submit(contextvars.copy_context().run, func, index, window)
+            for index, window in enumerate(windows)
+        ]
+        return [future.result() for future in futures]
+
+
+def map_windows_cached(
+    func: Callable[[int, list], object],
+    windows: list,
+    cache: "ResultCache | None",
+    stage: str,
+    fingerprint: Callable[[list], str],
+    **inputs: object,
+) -> list:
+    """Like ``map_windows``, but reuse the results cached for identical windows.
+
+    Only windows without a cached result are processed, so re-running a
+    transcript that changed in a few places costs a few window calls.
+
+    Args:
+        func (callable): Called as ``func(index, window)`` for each window
+            without a cached result
+        windows (list): Windows to process
+        cache (ResultCache): Cache of per-window results; None disables reuse
+        stage (str): Cache stage name, e.g. "summary_window"
+        fingerprint (callable): Returns a content fingerprint of a window
+        **inputs: Every other input that affects a window's result
+
+    Returns:
+        list: Results of ``func`` in window order
+
+    """
+    if cache is None:
+        return map_windows(func, windows)
+
+    missing = object()
+    keys = [fingerprint(window) for window in windows]
+    # Window results depend only on content, so they are shared between videos
+    results = [
+        cache.get(stage, SHARED_VIDEO_ID, default=missing, window=key, **inputs)
+        for key in keys
+    ]
+    todo = [index for index, result in enumerate(results) if result is missing]
+    logger.info(
+        "Reusing cached results for %d of %d transcript windows",
+        len(windows) - len(todo),
+        len(windows),
+    )
+    if todo:
+        computed = map_windows(
+            lambda position, window: func(todo[position], window),
+            [windows[index] for index in todo],
+        )
+        for index, result in zip(todo, computed, strict=True):
+            cache.set(stage, SHARED_VIDEO_ID, result, window=keys[index], **inputs)
+            results[index] = result
+    return results
@@ -0,0 +1,155 @@
+"""Class for summarizing every video of a playlist or channel incrementally."""
+
+import logging
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+import config
+from processors.batch_processor import BatchProcessor, BatchResult
+from utils.file_utils import load_json, save_json
+from utils.playlist_utils import iter_playlist_pages, resolve_playlist_id
+from utils.youtube_utils import extract_video_id, parse_youtube_url
+
+logger = logging.getLogger(__name__)
+
+# Write the sync state after this many newly summarized videos
+_SAVE_EVERY_RESULTS = 25
+
+
+class PlaylistProcessor:
+    """Summarizes the videos of a playlist or channel, skipping synced ones.
+
+    The IDs of successfully summarized videos are remembered per playlist in
+    a JSON state file, so each run only processes what is new (or failed
+    before). Video IDs are paged from the Data API and fed into a
+    BatchProcessor as a stream: the list is never materialized, and pages are
+    only fetched as the batch consumes them.
+
+    Channel uploads are listed newest first, so paging stops at the first page
+    whose videos have all been synced already; keeping a large channel
+    summarized then costs a page or two of API calls plus the new videos.
+    Other playlists have no useful order and are always paged in full.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        state_path: str | None = None,
+        batch: BatchProcessor | None = None,
+    ) -> None:
+        """Initialize the PlaylistProcessor.
+
+        Args:
+            url (str): Playlist or channel URL
+            state_path (str): Sync state file; defaults to config.SYNC_STATE_PATH
+            batch (BatchProcessor): Runs the pipelines; a default one if None
+
+        Raises:
+            ValueError: If the URL is not a playlist or channel URL
+
+        """
+        self.link = parse_youtube_url(url)
+        if not self.link.is_collection:
+            msg = f"Not a playlist or channel URL: {url}"
+            raise ValueError(msg)
+        self.url = url
+        self.state_path = Path(state_path or config.SYNC_STATE_PATH)
+        self.batch = batch or BatchProcessor()
+        self.playlist_id = None
+        self.synced = set()
+        self._unsaved = 0
+
+    def run(
+        self,
+        *,
+        full: bool = False,
+        on_result: Callable[[BatchResult], None] | None = None,
+        **options: object,
+    ) -> list[BatchResult]:
+        """Summarize the playlist's videos that have not been synced yet.
+
+        Args:
+            full (bool): Page through the whole channel instead of stopping at
+                the already-synced uploads (picks up older videos that failed)
+            on_result (callable): Optional callback invoked with each BatchResult
+            **options: Passed to BatchProcessor.run (method, force_download,
+                combined)
+
+        Returns:
+            list: BatchResult for every video processed in this run
+
+        """
+        self.playlist_id = resolve_playlist_id(self.link)
+        self.synced = set(self._load_state().get("synced", []))
+        logger.info(
+            "Syncing playlist %s: %d videos already summarized",
+            self.playlist_id,
+            len(self.synced),
+        )
+
+        def record(result: BatchResult) -> None:
+            if result.ok:
+                self.synced.add(extract_video_id(result.video_url))
+                self._unsaved += 1
+                if self._unsaved >= _SAVE_EVERY_RESULTS:
+                    self._save_state()
+            if on_result:
+                on_result(result)
+
+        try:
+            results = self.batch.run(
+                self.video_urls(full=full), on_result=record, **options,
+            )
+        finally:
+            self._save_state()
+        logger.info(
+            "Playlist %s: %d new videos processed", self.playlist_id, len(results),
+        )
+        return results
+
+    def video_urls(self, *, full: bool = False) -> Iterator[str]:
+        """Yield watch URLs for the playlist's videos that are not yet synced.
+
+        Args:
+            full (bool): Do not stop paging at already-synced uploads
+
+        Yields:
+            str: Video URL
+
+        """
+        newest_first = self.link.kind != "playlist"
+        seen = set()
+        for page in iter_playlist_pages(self.playlist_id):
+            new = [video_id for video_id in page if video_id not in self.synced]
+            if newest_first and not full and page and not new:
+                logger.info("Reached uploads that are already summarized")
+                return
+            for video_id in new:
+                # A playlist may list the same video more than once
+                if video_id not in seen:
+                    seen.add(video_id)
+                    yield f"https://www.youtube.com/watch?v={video_id}"
+
+    def _load_state(self) -> dict:
+        """Return this playlist's entry in the state file (empty if none)."""
+        try:
+            return load_json(self.state_path).get(self.playlist_id, {})
+        except FileNotFoundError:
+            return {}
+
+    def _save_state(self) -> None:
+        """Write this playlist's synced IDs, keeping the other playlists."""
+        try:
+            state = load_json(self.state_path)
+        except FileNotFoundError:
+            state = {}
+        previous = state.get(self.playlist_id, {}).get("synced", [])
+        # Merge with what is on disk, in case another run synced videos too
+        state[self.playlist_id] = {
+            "source": self.url,
+            "synced": sorted(self.synced.union(previous)),
+            "last_sync": time.time(),
+        }
+        save_json(state, self.state_path)
+        self._unsaved = 0
@@ -0,0 +1,149 @@
+"""Long-lived summarization service that coalesces duplicate requests."""
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import config
+from processors.video_processor import VideoProcessor
+from utils.youtube_utils import extract_video_id
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceBusyError(RuntimeError):
+    """Raised when the job queue is full."""
+
+
+class SummarizerService:
+    """Runs summarization jobs on a shared worker pool.
+
+    Meant to live for the whole process, so Whisper models, API clients and
+    the result cache stay warm between requests. Concurrent requests for the
+    same video (and options) share one in-flight pipeline: the first request
+    starts it and every later one waits on the same future, so a popular video
+    requested by many users at once costs a single run.
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        io_workers: int | None = None,
+        whisper_workers: int | None = None,
+        max_pending: int | None = None,
+    ) -> None:
+        """Initialize the SummarizerService.
+
+        Args:
+            workers (int): Max pipelines running at once; further jobs queue
+            io_workers (int): Max pipelines in a network-bound stage at once
+            whisper_workers (int): Max pipelines transcribing with Whisper at once
+            max_pending (int): Max distinct jobs running or queued; 0 for no limit
+
+        """
+        self.workers = workers or config.SERVER_WORKERS
+        self.max_pending = (
+            config.SERVER_MAX_PENDING if max_pending is None else max_pending
+        )
+        self.stage_limits = {
+            "io": threading.BoundedSemaphore(io_workers or config.BATCH_IO_WORKERS),
+            "whisper": threading.BoundedSemaphore(
+                whisper_workers or config.BATCH_WHISPER_WORKERS,
+            ),
+        }
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="summarizer",
+        )
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._stats = {"started": 0, "coalesced": 0, "succeeded": 0, "failed": 0}
+
+    def submit(
+        self,
+        video_url: str,
+        method: str = "api",
+        *,
+        force_download: bool = False,
+        combined: bool = False,
+    ) -> Future:
+        """Start summarizing a video, or join the run already in flight for it.
+
+        Args:
+            video_url (str): URL of the YouTube video
+            method (str): Method to obtain transcription: 'api' or 'download'
+            force_download (bool): Force download even if API transcription is available
+            combined (bool): Generate key points and summary in a single Gemini call
+
+        Returns:
+            concurrent.futures.Future: Resolves to a dict with ``video_id``,
+                ``summary`` and ``key_points``
+
+        Raises:
+            ValueError: If the URL has no recognizable video ID
+            ServiceBusyError: If max_pending jobs are already running or queued
+
+        """
+        video_id = extract_video_id(video_url)
+        options = {
+            "method": method,
+            "force_download": force_download,
+            "combined": combined,
+        }
+        key = (video_id, method, force_download, combined)
+
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                self._stats["coalesced"] += 1
+                logger.info("Joining in-flight job for %s", video_id)
+                return future
+            if self.max_pending and len(self._in_flight) >= self.max_pending:
+                msg = f"Too many pending jobs ({len(self._in_flight)})"
+                raise ServiceBusyError(msg)
+            future = self._executor.submit(self._run, video_url, options)
+            self._in_flight[key] = future
+            self._stats["started"] += 1
+
+        # Registered outside the lock: it runs immediately if the job is done
+        future.add_done_callback(lambda done: self._finish(key, done))
+        return future
+
+    def summarize(
+        self, video_url: str, timeout: float | None = None, **options: object,
+    ) -> dict:
+        """Summarize a video, waiting for the (possibly shared) result.
+
+        Raises:
+            concurrent.futures.TimeoutError: If the job outlasts ``timeout``
+
+        """
+        return self.submit(video_url, **options).result(timeout=timeout)
+
+    def stats(self) -> dict:
+        """Return job counters and the number of jobs currently in flight."""
+        with self._lock:
+            return {**self._stats, "in_flight": len(self._in_flight)}
+
+    def shutdown(self, *, wait: bool = True) -> None:
+        """Stop accepting jobs, optionally waiting for running ones to finish."""
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def _run(self, video_url: str, options: dict) -> dict:
+        """Run the full pipeline for one video."""
+        processor = VideoProcessor(video_url, stage_limits=self.stage_limits)
+        summary = processor.process(**options)
+        return {
+            "video_id": processor.video_id,
+            "summary": summary,
+            "key_points": processor.timestamps,
+        }
+
+    def _finish(self, key: tuple, future: Future) -> None:
+        """Forget a finished job so the next request starts a fresh run."""
+        failed = future.cancelled() or future.exception() is not None
+        with self._lock:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+            self._stats["failed" if failed else "succeeded"] += 1
+        if failed and not future.cancelled():
+            logger.error("Job for %s failed: %s", key[0], future.exception())
@@ -1,19 +1,44 @@
 """Class for generating summaries using Gemini API."""
+import asyncio
 import logging
+from collections.abc import Iterator, Sequence
+from typing import TYPE_CHECKING
 
 import config
-import google.generativeai as genai
+from processors.map_reduce import map_windows_cached
+from utils.clients import get_gemini_model
+from utils.transcript_utils import (
+    format_transcript_text,
+    split_content_defined_windows,
+    split_transcript_windows,
+    transcript_hash,
+)
+
+if TYPE_CHECKING:
+    from utils.cache import ResultCache
 
 logger = logging.getLogger(__name__)
 
 class SummaryGenerator:
     """Generates video summaries using the Gemini API."""
 
-    def __init__(self):
-        """Initialize the SummaryGenerator."""
-        # Configure Gemini API
-        genai.configure(api_key=config.GEMINI_API_KEY)
-        self.model = genai.GenerativeModel(config.GEMINI_MODEL)
+    # Bump whenever the prompt changes so cached results are not reused
+    PROMPT_VERSION = 3
+
+    # Transcripts longer than this are summarized hierarchically when enabled
+    MAX_TRANSCRIPT_CHARS = 15000
+
+    def __init__(self, cache: "ResultCache | None" = None) -> None:
+        """Initialize the SummaryGenerator.
+
+        Args:
+            cache (ResultCache): Cache of per-window summaries of long
+                transcripts; None always summarizes every window
+
+        """
+        # Shared Gemini client, configured once per process
+        self.model = get_gemini_model(config.GEMINI_MODEL)
+        self.cache = cache
 
     def generate(self, transcript, timestamps):
         """Generate a summary of a video transcript using Gemini.
@@ -26,28 +51,122 @@ class SummaryGenerator:
             str: Generated summary
 
         """
-        # Combine transcript segments into full text
-        full_text = self._format_transcript(transcript)
+        summary_text = self.generate_text(transcript, timestamps)
+
+        # Create formatted output with timestamps and summary
+        return self.format_output(summary_text, "\n".join(timestamps))
+
+    def generate_text(self, transcript: list, timestamps: list) -> str:
+        """Generate only the summary text, without the key points section.
+
+        Args:
+            transcript (list): List of transcript segments
+            timestamps (list): List of key points with timestamps
+
+        Returns:
+            str: Summary text as returned by Gemini
 
+        """
         # Format key points
         key_points_text = "\n".join(timestamps)
 
         # Create prompt for summary generation
-        prompt = self._create_prompt(full_text, key_points_text)
+        prompt = self._build_prompt(transcript, key_points_text)
 
         # Generate summary
         response = self.model.generate_content(prompt)
+        return response.text
 
-        # Create formatted output with timestamps and summary
-        return self._format_output(response.text, key_points_text)
+    async def generate_text_async(self, transcript: list, timestamps: list) -> str:
+        """Generate only the summary text without blocking the event loop.
+
+        Args:
+            transcript (list): List of transcript segments
+            timestamps (list): List of key points with timestamps
+
+        Returns:
+            str: Summary text as returned by Gemini
+
+        """
+        key_points_text = "\n".join(timestamps)
+        # The hierarchical map step makes blocking calls, so keep it off the loop
+        prompt = await asyncio.to_thread(
+            self._build_prompt, transcript, key_points_text,
+        )
+        response = await self.model.generate_content_async(prompt)
+        return response.text
+
+    def generate_stream(self, transcript: list, timestamps: list) -> Iterator[str]:
+        """Generate a summary, yielding the text as Gemini produces it.
+
+        Args:
+            transcript (list): List of transcript segments
+            timestamps (list): List of key points with timestamps
 
+        Yields:
+            str: Successive pieces of the summary text
 
-    def _format_transcript(self, transcript):
+        """
+        key_points_text = "\n".join(timestamps)
+        prompt = self._build_prompt(transcript, key_points_text)
+
+        for chunk in self.model.generate_content(prompt, stream=True):
+            if chunk.parts:
+                yield chunk.text
+
+    def _build_prompt(self, transcript: list, key_points_text: str) -> str:
+        """Build the final summary prompt, summarizing windows first if needed."""
+        # Combine transcript segments into full text
+        # Format just past the budget: enough to tell whether it fits
+        full_text = self._format_transcript(
+            transcript, max_chars=self.MAX_TRANSCRIPT_CHARS + 1,
+        )
+
+        if config.HIERARCHICAL_SUMMARIES and len(full_text) > self.MAX_TRANSCRIPT_CHARS:
+            partial_summaries = self._summarize_windows(transcript)
+            return self._create_reduce_prompt(partial_summaries, key_points_text)
+
+        return self._create_prompt(full_text, key_points_text)
+
+    def _summarize_windows(self, transcript: list) -> list:
+        """Summarize transcript windows concurrently (the map step).
+
+        Args:
+            transcript (list): List of transcript segments
+
+        Returns:
+            list: Summary of each window, in order
+
+        """
+        incremental = config.INCREMENTAL_SUMMARIES
+        split = (
+            split_content_defined_windows if incremental else split_transcript_windows
+        )
+        windows = split(transcript, config.LLM_WINDOW_TOKENS, self._format_segment)
+
+        def summarize_window(_index: int, window: list) -> object:
+            prompt = self._create_window_prompt(self._format_transcript(window))
+            return self.model.generate_content(prompt).text
+
+        return map_windows_cached(
+            summarize_window,
+            windows,
+            self.cache if incremental else None,
+            "summary_window",
+            transcript_hash,
+            model=config.GEMINI_MODEL,
+            prompt_version=self.PROMPT_VERSION,
+        )
+
+    def _format_transcript(
+        self, transcript: Sequence[dict], max_chars: int | None = None,
+    ) -> str:
         """Format transcript for the prompt."""
-        full_text = ""
-        for segment in transcript:
-            full_text += segment["text"] + " "
-        return full_text
+        return format_transcript_text(transcript, self._format_segment, max_chars)
+
+    def _format_segment(self, segment: dict) -> str:
+        """Format a single transcript segment for the prompt."""
+        return segment["text"] + " "
 
     def _create_prompt(self, transcript_text, key_points_text):
         """Create the prompt for Gemini API."""
@@ -68,7 +187,49 @@ class SummaryGenerator:
         """
         return prompt
 
-    def _format_output(self, summary_text, key_points_text):
+    def _create_window_prompt(self, transcript_text: str) -> str:
+        """Create the prompt summarizing one section of a long transcript.
+
+        The prompt does not depend on the section's position, so its result
+        can be reused when edits elsewhere shift the sections around.
+        """
+        return f"""
+        The following is one part of a longer video transcript.
+        Summarize this part in one or two paragraphs, keeping every main idea,
+        key insight and concrete detail it contains.
+        Do not add an introduction or refer to other parts.
+
+        Transcript part:
+        {transcript_text}
+        """
+
+    def _create_reduce_prompt(
+        self, partial_summaries: list, key_points_text: str,
+    ) -> str:
+        """Create the prompt combining section summaries into the final summary."""
+        sections = "\n\n".join(
+            f"Part {index + 1}:\n{summary}"
+            for index, summary in enumerate(partial_summaries)
+        )
+        return f"""
+        Below are summaries of consecutive parts of one video transcript.
+        Please combine them into a comprehensive summary of the whole video.
+        The summary should:
+        1. Start with a brief overview of the video's main topic (1-2 sentences)
+        2. Include the main ideas and key insights
+        3. Maintain the original meaning and context
+        4. Be well-structured and readable
+        5. Be around 3-5 paragraphs in length
+
+        Here are the key points identified in the video:
+        {key_points_text}
+
+        Here are the summaries of each part, in order:
+        {sections}
+        """
+
+    @staticmethod
+    def format_output(summary_text: str, key_points_text: str) -> str:
         """Format the final output."""
         formatted_summary = f"""
 SUMMARY:
@@ -1,9 +1,22 @@
 """Class for generating timestamps with key points from transcripts."""
 
+import asyncio
 import logging
+from collections.abc import Iterator, Sequence
+from typing import TYPE_CHECKING
 
 import config
-import google.generativeai as genai
+from processors.map_reduce import map_windows_cached
+from utils.clients import get_gemini_model
+from utils.transcript_utils import (
+    format_transcript_text,
+    split_content_defined_windows,
+    split_transcript_windows,
+    transcript_hash,
+)
+
+if TYPE_CHECKING:
+    from utils.cache import ResultCache
 
 logger = logging.getLogger(__name__)
 
@@ -11,11 +24,23 @@ logger = logging.getLogger(__name__)
 class TimestampGenerator:
     """Generates timestamps with key points from transcripts using Gemini API."""
 
-    def __init__(self):
-        """Initialize the TimestampGenerator."""
-        # Configure Gemini API
-        genai.configure(api_key=config.GEMINI_API_KEY)
-        self.model = genai.GenerativeModel(config.GEMINI_MODEL)
+    # Bump whenever the prompt changes so cached results are not reused
+    PROMPT_VERSION = 3
+
+    # Transcripts longer than this are processed hierarchically when enabled
+    MAX_TRANSCRIPT_CHARS = 10000
+
+    def __init__(self, cache: "ResultCache | None" = None) -> None:
+        """Initialize the TimestampGenerator.
+
+        Args:
+            cache (ResultCache): Cache of per-window key points of long
+                transcripts; None always processes every window
+
+        """
+        # Shared Gemini client, configured once per process
+        self.model = get_gemini_model(config.GEMINI_MODEL)
+        self.cache = cache
 
     def generate(self, transcript):
         """Generate timestamps with key points from a transcript.
@@ -27,11 +52,8 @@ class TimestampGenerator:
             list: List of timestamps with key points
 
         """
-        # Combine transcript segments into a single text with timestamps
-        full_text = self._format_transcript_for_prompt(transcript)
-
         # Create prompt for Gemini to identify key points
-        prompt = self._create_prompt(full_text)
+        prompt = self._build_prompt(transcript)
 
         # Generate key points using Gemini
         response = self.model.generate_content(prompt)
@@ -41,22 +63,108 @@ class TimestampGenerator:
 
         return key_points
 
-    def _format_transcript_for_prompt(self, transcript):
-        """Format transcript for the prompt."""
-        full_text = ""
-        for segment in transcript:
-            minutes = int(segment["start_time"] // 60)
-            seconds = int(segment["start_time"] % 60)
-            timestamp = f"{minutes:02d}:{seconds:02d}"
-            full_text += f"[{timestamp}] {segment['text']}\n"
+    async def generate_async(self, transcript: list) -> list:
+        """Generate timestamps with key points without blocking the event loop.
+
+        Args:
+            transcript (list): List of transcript segments
+
+        Returns:
+            list: List of timestamps with key points
+
+        """
+        # The hierarchical map step makes blocking calls, so keep it off the loop
+        prompt = await asyncio.to_thread(self._build_prompt, transcript)
+        response = await self.model.generate_content_async(prompt)
+        return self._parse_response(response.text)
+
+    def generate_stream(self, transcript: list) -> Iterator[str]:
+        """Generate key points, yielding each one as soon as Gemini completes it.
+
+        Args:
+            transcript (list): List of transcript segments
+
+        Yields:
+            str: Each timestamp with its key point
+
+        """
+        prompt = self._build_prompt(transcript)
+
+        pending = ""
+        for chunk in self.model.generate_content(prompt, stream=True):
+            if not chunk.parts:
+                continue
+            pending += chunk.text
+            *lines, pending = pending.split("\n")
+            yield from self._parse_response("\n".join(lines))
+        yield from self._parse_response(pending)
+
+    def _build_prompt(self, transcript: list) -> str:
+        """Build the final key point prompt, processing windows first if needed."""
+        # Combine transcript segments into a single text with timestamps
+        # Format just past the budget: enough to tell whether it fits
+        full_text = self._format_transcript_for_prompt(
+            transcript, max_chars=self.MAX_TRANSCRIPT_CHARS + 1,
+        )
+
+        if config.HIERARCHICAL_SUMMARIES and len(full_text) > self.MAX_TRANSCRIPT_CHARS:
+            return self._create_reduce_prompt(self._key_points_for_windows(transcript))
+
+        return self._create_prompt(full_text)
 
-        return full_text
+    def _key_points_for_windows(self, transcript: list) -> list:
+        """Find candidate key points in each transcript window concurrently.
 
-    def _create_prompt(self, transcript_text):
+        Args:
+            transcript (list): List of transcript segments
+
+        Returns:
+            list: Candidate key points from all windows, in order
+
+        """
+        incremental = config.INCREMENTAL_SUMMARIES
+        split = (
+            split_content_defined_windows if incremental else split_transcript_windows
+        )
+        windows = split(transcript, config.LLM_WINDOW_TOKENS, self.format_segment)
+
+        def key_points_for_window(_index: int, window: list) -> object:
+            prompt = self._create_window_prompt(
+                self._format_transcript_for_prompt(window),
+            )
+            return self._parse_response(self.model.generate_content(prompt).text)
+
+        window_points = map_windows_cached(
+            key_points_for_window,
+            windows,
+            self.cache if incremental else None,
+            "key_points_window",
+            transcript_hash,
+            model=config.GEMINI_MODEL,
+            prompt_version=self.PROMPT_VERSION,
+        )
+        return [key_point for points in window_points for key_point in points]
+
+    @staticmethod
+    def format_segment(segment: dict) -> str:
+        """Format a single transcript segment as a timestamped prompt line."""
+        minutes = int(segment["start_time"] // 60)
+        seconds = int(segment["start_time"] % 60)
+        timestamp = f"{minutes:02d}:{seconds:02d}"
+        return f"[{timestamp}] {segment['text']}\n"
+
+    def _format_transcript_for_prompt(
+        self, transcript: Sequence[dict], max_chars: int | None = None,
+    ) -> str:
+        """Format transcript for the prompt."""
+        return format_transcript_text(transcript, self.format_segment, max_chars)
+
+    def _create_prompt(self, transcript_text: str) -> str:
         """Create the prompt for Gemini API."""
-        prompt = f"""
-        Below is a transcript of a YouTube video with timestamps. 
-        Please identify 5-10 key points or topics discussed in the video. 
+        # Limit to the first 10k characters to stay within Gemini's context window
+        return f"""
+        Below is a transcript of a YouTube video with timestamps.
+        Please identify 5-10 key points or topics discussed in the video.
         For each key point, provide:
         1. The timestamp where the topic begins
         2. A brief title (3-7 words)
@@ -65,15 +173,53 @@ class TimestampGenerator:
         Format your answer as a list of timestamps with key points.
 
         Transcript:
-        {transcript_text[:10000]}  # Limit to first 10k characters to stay within Gemini's context window
+        {transcript_text[:10000]}
+        """
+
+    def _create_window_prompt(self, transcript_text: str) -> str:
+        """Create the prompt finding key points in one section of a long transcript.
+
+        The prompt does not depend on the section's position, so its result
+        can be reused when edits elsewhere shift the sections around.
+        """
+        return f"""
+        Below is one part of a YouTube video transcript with timestamps.
+        Please identify 2-4 key points or topics discussed in this part.
+        For each key point, provide:
+        1. The timestamp where the topic begins
+        2. A brief title (3-7 words)
+        3. A one-sentence summary of the point
+
+        Format your answer as a list of timestamps with key points.
+
+        Transcript part:
+        {transcript_text}
+        """
+
+    def _create_reduce_prompt(self, candidate_key_points: list) -> str:
+        """Create the prompt selecting the final key points from all sections."""
+        candidates_text = "\n".join(candidate_key_points)
+        return f"""
+        Below are candidate key points found in consecutive parts of a YouTube
+        video, each starting with its timestamp.
+        Please select and, where needed, merge them into the 5-10 most important
+        key points of the whole video, in chronological order.
+        Keep the original timestamps. For each key point, provide:
+        1. The timestamp where the topic begins
+        2. A brief title (3-7 words)
+        3. A one-sentence summary of the point
+
+        Format your answer as a list of timestamps with key points.
+
+        Candidate key points:
+        {candidates_text}
         """
-        return prompt
 
-    def _parse_response(self, response_text):
+    def _parse_response(self, response_text: str) -> list:
         """Parse the Gemini API response to extract key points."""
         key_points = []
-        for line in response_text.split("\n"):
-            line = line.strip()
+        for raw_line in response_text.split("\n"):
+            line = raw_line.strip()
             if line and (":" in line[:5]):  # Simple check for timestamp format
                 key_points.append(line)
 
@@ -1,69 +1,225 @@
 """Main processor class for handling YouTube video summarization."""
 
+import contextlib
+import functools
 import logging
+from collections.abc import Iterator
+from typing import TYPE_CHECKING
 
+import config
+from processors.combined_generator import CombinedGenerator
 from processors.summary_generator import SummaryGenerator
 from processors.timestamp_generator import TimestampGenerator
-from transcribers.whisper_transcriber import WhisperTranscriber
-from transcribers.youtube_api_transcriber import YouTubeAPITranscriber
-from utils.time_helpers import seconds_to_timestamp, time_to_seconds
-from utils.transcript_utils import format_transcript
+from transcribers.youtube_api_transcriber import NoCaptionsError, YouTubeAPITranscriber
+from utils.cache import ResultCache, get_result_cache
+from utils.metrics import span, video_scope
+from utils.rate_limit import ApiLimitError
+from utils.transcript_utils import (
+    Transcript,
+    compress_transcript,
+    compression_ratio,
+    format_transcript_text,
+    transcript_hash,
+)
 from utils.youtube_utils import extract_video_id
 
+if TYPE_CHECKING:
+    from transcribers.whisper_transcriber import WhisperTranscriber
+
 logger = logging.getLogger(__name__)
 
 
 class VideoProcessor:
     """Main class that orchestrates the video processing pipeline."""
 
-    def __init__(self, video_url: str) -> None:
+    def __init__(
+        self,
+        video_url: str,
+        stage_limits: dict | None = None,
+        cache: ResultCache | None = None,
+    ) -> None:
         """Initialize a new VideoProcessor.
 
         Args:
             video_url (str): URL of the YouTube video to process
+            stage_limits (dict): Optional mapping of stage kind ("io" or
+                "whisper") to a semaphore bounding how many pipelines may run
+                that kind of stage at once
+            cache (ResultCache): Stage result cache; defaults to the shared
+                cache when config.CACHE_ENABLED is set
 
         """
         self.video_url = video_url
         self.video_id = extract_video_id(video_url)  # Use the utility function
+        self.stage_limits = stage_limits or {}
+        if cache is None and config.CACHE_ENABLED:
+            cache = get_result_cache()
+        self.cache = cache
         self.transcript = None
         self.timestamps = None
         self.summary = None
 
-        # Initialize components
-        self.api_transcriber = YouTubeAPITranscriber()
-        self.whisper_transcriber = WhisperTranscriber()
-        self.timestamp_generator = TimestampGenerator()
-        self.summary_generator = SummaryGenerator()
+    # Components are created on first use, so a cached or API-only run never
+    # constructs (or imports the dependencies of) the stages it does not need
+
+    @functools.cached_property
+    def api_transcriber(self) -> YouTubeAPITranscriber:
+        """YouTube Data API transcriber."""
+        return YouTubeAPITranscriber(cache=self.cache)
+
+    @functools.cached_property
+    def whisper_transcriber(self) -> "WhisperTranscriber":
+        """youtube-dl + Whisper transcriber."""
+        from transcribers.whisper_transcriber import (  # noqa: PLC0415
+            WhisperTranscriber,
+        )
+
+        return WhisperTranscriber()
+
+    @functools.cached_property
+    def timestamp_generator(self) -> TimestampGenerator:
+        """Gemini key point generator."""
+        return TimestampGenerator(cache=self.cache)
+
+    @functools.cached_property
+    def summary_generator(self) -> SummaryGenerator:
+        """Gemini summary generator."""
+        return SummaryGenerator(cache=self.cache)
+
+    @functools.cached_property
+    def combined_generator(self) -> CombinedGenerator:
+        """Gemini single-call key point and summary generator."""
+        return CombinedGenerator()
 
-    def process(self, method="api", force_download=False):
+    def process(
+        self,
+        method: str = "api",
+        *,
+        force_download: bool = False,
+        combined: bool = False,
+    ) -> str:
         """Process the video to generate a summary.
 
         Args:
             method (str): Method to obtain transcription: 'api' or 'download'
             force_download (bool): Force download even if API transcription is available
+            combined (bool): Generate key points and summary in a single Gemini call
 
         Returns:
             str: Generated summary
 
         """
-        self._get_transcript(method, force_download)
-        self._generate_timestamps()
-        self._generate_summary()
+        with video_scope(self.video_id), span("video"):
+            with span("transcript"):
+                self._get_transcript(method, force_download)
+            self._compress_transcript()
+            combined = combined and self._fits_combined_prompt()
+            if combined:
+                try:
+                    with span("combined"):
+                        self._generate_combined()
+                except ValueError as e:
+                    logger.warning("%s; using separate calls instead", e)
+                    combined = False
+            if not combined:
+                with span("timestamps"):
+                    self._generate_timestamps()
+                with span("summary"):
+                    self._generate_summary()
         return self.summary
 
+    def process_stream(
+        self, method: str = "api", *, force_download: bool = False,
+    ) -> Iterator[str]:
+        """Process the video, yielding output as soon as it is generated.
+
+        Key points are emitted one at a time as Gemini produces them, followed
+        by the summary text in pieces. Once exhausted, ``self.summary`` holds
+        the same formatted summary that ``process`` would have returned.
+
+        Args:
+            method (str): Method to obtain transcription: 'api' or 'download'
+            force_download (bool): Force download even if API transcription is available
+
+        Yields:
+            str: Successive pieces of the output text
+
+        """
+        with video_scope(self.video_id), span("video"):
+            with span("transcript"):
+                self._get_transcript(method, force_download)
+            self._compress_transcript()
+
+            yield "KEY POINTS:\n"
+            with span("timestamps"):
+                for key_point in self._stream_timestamps():
+                    yield key_point + "\n"
+            logger.info("Generated %d key timestamps", len(self.timestamps))
+
+            yield "\nSUMMARY:\n"
+            with span("summary"):
+                yield from self._stream_summary()
+            yield "\n"
+
+    def _stage(self, kind: str) -> contextlib.AbstractContextManager:
+        """Return the concurrency limit for a stage kind, if any."""
+        return self.stage_limits.get(kind) or contextlib.nullcontext()
+
+    def _cache_get(self, stage: str, **inputs: object) -> object:
+        """Look up a stage result for this video, or None without a cache."""
+        if not self.cache:
+            return None
+        return self.cache.get(stage, self.video_id, **inputs)
+
+    def _cache_set(self, stage: str, value: object, **inputs: object) -> None:
+        """Store a stage result for this video, if caching is enabled."""
+        if self.cache:
+            self.cache.set(stage, self.video_id, value, **inputs)
+
+    def _api_transcript_inputs(self) -> dict:
+        """Return the cache inputs identifying which caption track is wanted."""
+        return {
+            "languages": self.api_transcriber.languages,
+            "kinds": self.api_transcriber.kinds,
+        }
+
     def _get_transcript(self, method, force_download):
         """Get the transcript using the specified method."""
-        transcript = None
+        use_api = method == "api" and not force_download
+
+        # Reuse a transcript from an earlier run before making any network calls
+        transcript = (
+            self._cache_get("api_transcript", **self._api_transcript_inputs())
+            if use_api
+            else None
+        )
+        if transcript is None:
+            transcript = self._cache_get(
+                "whisper_transcript", model=config.WHISPER_MODEL,
+            )
+        if transcript:
+            self.transcript = Transcript.from_segments(transcript)
+            return
 
         # Try YouTube API first if specified and not forcing download
-        if method == "api" and not force_download:
+        if use_api:
             try:
                 logger.info("Attempting to fetch transcript via YouTube API...")
-                transcript = self.api_transcriber.get_transcript(self.video_url)
+                with self._stage("io"):
+                    transcript = self.api_transcriber.get_transcript(self.video_url)
                 if transcript:
                     logger.info("Successfully retrieved transcript from YouTube API")
+                    self._cache_set(
+                        "api_transcript", transcript, **self._api_transcript_inputs(),
+                    )
                     self.transcript = transcript
                     return
+            except ApiLimitError:
+                # Still throttled after retrying, or out of quota: both pass,
+                # so surface them rather than paying for a Whisper transcription
+                raise
+            except NoCaptionsError as e:
+                logger.info("%s; transcribing with Whisper instead", e)
             except Exception as e:
                 logger.warning(f"Failed to get transcript via API: {e}")
                 if method == "api":
@@ -71,31 +227,191 @@ class VideoProcessor:
 
         # Use Whisper transcription if API failed or download was specified
         logger.info("Using youtube-dl and Whisper for transcription...")
-        transcript = self.whisper_transcriber.get_transcript(self.video_url)
+        with self._stage("whisper"):
+            transcript = self.whisper_transcriber.get_transcript(self.video_url)
 
         if transcript:
             logger.info("Whisper transcription complete")
+            self._cache_set(
+                "whisper_transcript", transcript, model=config.WHISPER_MODEL,
+            )
             self.transcript = transcript
         else:
             logger.error("Failed to obtain transcript")
             raise RuntimeError("Could not obtain transcript through any method")
 
+    def _compress_transcript(self) -> None:
+        """Replace the transcript with its compressed form for prompting.
+
+        The raw transcript is what gets cached, so changing the compression
+        never requires fetching it again; the prompt caches are keyed by the
+        hash of the compressed transcript.
+        """
+        if not config.TRANSCRIPT_COMPRESSION or not self.transcript:
+            return
+        with span("transcript_compression") as compression:
+            compressed = compress_transcript(self.transcript)
+            if not compressed:
+                # Nothing but non-speech tags; keep them rather than fail
+                return
+            ratio = compression_ratio(self.transcript, compressed)
+            compression.set(
+                segments_in=len(self.transcript),
+                segments_out=len(compressed),
+                ratio=round(ratio, 4),
+            )
+        logger.info(
+            "Compressed transcript from %d to %d segments "
+            "(%.0f%% of the original text)",
+            len(self.transcript),
+            len(compressed),
+            ratio * 100,
+        )
+        self.transcript = compressed
+
+    def _fits_combined_prompt(self) -> bool:
+        """Whether the transcript can be handled by one combined Gemini call.
+
+        Longer transcripts need the hierarchical two-call path to avoid being
+        truncated, unless hierarchical summaries are disabled. The transcript
+        is measured as the combined prompt formats it.
+        """
+        if not config.HIERARCHICAL_SUMMARIES:
+            return True
+        limit = CombinedGenerator.MAX_TRANSCRIPT_CHARS
+        text = format_transcript_text(
+            self.transcript, TimestampGenerator.format_segment, limit + 1,
+        )
+        if len(text) <= limit:
+            return True
+        logger.info("Transcript too long for combined mode, using separate calls")
+        return False
+
+    def _generate_combined(self) -> None:
+        """Generate timestamps and summary from the transcript in one call."""
+        if not self.transcript:
+            msg = "No transcript available for summary generation"
+            raise ValueError(msg)
+
+        inputs = {
+            "model": config.GEMINI_MODEL,
+            "prompt_version": CombinedGenerator.PROMPT_VERSION,
+            "transcript": transcript_hash(self.transcript),
+        }
+        result = self._cache_get("combined", **inputs)
+        if result is None:
+            logger.info("Generating timestamps and summary in one call...")
+            with self._stage("io"):
+                timestamps, summary = self.combined_generator.generate(
+                    self.transcript,
+                )
+            result = {"timestamps": timestamps, "summary": summary}
+            self._cache_set("combined", result, **inputs)
+
+        self.timestamps = result["timestamps"]
+        self.summary = result["summary"]
+        logger.info("Generated %d key timestamps and summary", len(self.timestamps))
+
+    def _timestamps_inputs(self) -> dict:
+        """Return the cache inputs identifying the key points of this transcript."""
+        return {
+            "model": config.GEMINI_MODEL,
+            "prompt_version": TimestampGenerator.PROMPT_VERSION,
+            "hierarchical": config.HIERARCHICAL_SUMMARIES
+            and config.LLM_WINDOW_TOKENS,
+            "content_windows": config.INCREMENTAL_SUMMARIES,
+            "transcript": transcript_hash(self.transcript),
+        }
+
+    def _summary_inputs(self) -> dict:
+        """Return the cache inputs identifying the summary text of this transcript."""
+        return {
+            "model": config.GEMINI_MODEL,
+            "prompt_version": SummaryGenerator.PROMPT_VERSION,
+            "hierarchical": config.HIERARCHICAL_SUMMARIES
+            and config.LLM_WINDOW_TOKENS,
+            "content_windows": config.INCREMENTAL_SUMMARIES,
+            "transcript": transcript_hash(self.transcript),
+            "key_points": self.timestamps,
+        }
+
     def _generate_timestamps(self) -> None:
         """Generate timestamps from the transcript."""
         if not self.transcript:
-            raise ValueError("No transcript available for timestamp generation")
+            msg = "No transcript available for timestamp generation"
+            raise ValueError(msg)
 
-        logger.info("Generating timestamps...")
-        self.timestamps = self.timestamp_generator.generate(self.transcript)
+        inputs = self._timestamps_inputs()
+        self.timestamps = self._cache_get("timestamps", **inputs)
+        if self.timestamps is None:
+            logger.info("Generating timestamps...")
+            with self._stage("io"):
+                self.timestamps = self.timestamp_generator.generate(self.transcript)
+            self._cache_set("timestamps", self.timestamps, **inputs)
         logger.info(f"Generated {len(self.timestamps)} key timestamps")
 
-    def _generate_summary(self):
+    def _generate_summary(self) -> None:
         """Generate summary from the transcript and timestamps."""
         if not self.transcript or not self.timestamps:
-            raise ValueError(
-                "Transcript and timestamps required for summary generation"
-            )
+            msg = "Transcript and timestamps required for summary generation"
+            raise ValueError(msg)
 
-        logger.info("Generating summary...")
-        self.summary = self.summary_generator.generate(self.transcript, self.timestamps)
+        inputs = self._summary_inputs()
+        summary_text = self._cache_get("summary_text", **inputs)
+        if summary_text is None:
+            logger.info("Generating summary...")
+            with self._stage("io"):
+                summary_text = self.summary_generator.generate_text(
+                    self.transcript, self.timestamps,
+                )
+            self._cache_set("summary_text", summary_text, **inputs)
+        self.summary = SummaryGenerator.format_output(
+            summary_text, "\n".join(self.timestamps),
+        )
         logger.info("Summary generation complete")
+
+    def _stream_timestamps(self) -> Iterator[str]:
+        """Generate timestamps, yielding each key point as soon as it is ready."""
+        if not self.transcript:
+            msg = "No transcript available for timestamp generation"
+            raise ValueError(msg)
+
+        inputs = self._timestamps_inputs()
+        self.timestamps = self._cache_get("timestamps", **inputs)
+        if self.timestamps is not None:
+            yield from self.timestamps
+            return
+
+        logger.info("Generating timestamps...")
+        self.timestamps = []
+        with self._stage("io"):
+            for key_point in self.timestamp_generator.generate_stream(self.transcript):
+                self.timestamps.append(key_point)
+                yield key_point
+        self._cache_set("timestamps", self.timestamps, **inputs)
+
+    def _stream_summary(self) -> Iterator[str]:
+        """Generate summary text, yielding it piece by piece as it is generated."""
+        if not self.transcript or not self.timestamps:
+            msg = "Transcript and timestamps required for summary generation"
+            raise ValueError(msg)
+
+        inputs = self._summary_inputs()
+        summary_text = self._cache_get("summary_text", **inputs)
+        if summary_text is None:
+            logger.info("Generating summary...")
+            pieces = []
+            with self._stage("io"):
+                for piece in self.summary_generator.generate_stream(
+                    self.transcript, self.timestamps,
+                ):
+                    pieces.append(piece)
+                    yield piece
+            summary_text = "".join(pieces)
+            self._cache_set("summary_text", summary_text, **inputs)
+        else:
+            yield summary_text
+
+        self.summary = SummaryGenerator.format_output(
+            summary_text, "\n".join(self.timestamps),
+        )
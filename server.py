@@ -0,0 +1,220 @@
+"""HTTP service entry point for the YouTube Video Summarizer.
+
+Keeps one SummarizerService (and with it the Whisper models, API clients and
+result cache) alive across requests::
+
+    python server.py [--host HOST] [--port PORT] [--local]
+
+Endpoints:
+    POST /summarize   JSON body {"url": ..., "method": "api", "combined": false,
+                      "force_download": false, "wait": true}
+    GET  /summarize?url=...&method=...&combined=true
+    GET  /healthz     Job counters
+    GET  /metrics     Per-stage metrics in the Prometheus text format
+
+A request waits up to SERVER_REQUEST_TIMEOUT seconds (or returns at once with
+"wait": false) and gets 202 with {"status": "pending"} if the summary is not
+ready yet; asking again later joins the same run or hits the cache.
+"""
+import argparse
+import json
+import logging
+import sys
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import config
+from processors.summarizer_service import ServiceBusyError, SummarizerService
+from utils.metrics import get_metrics
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler(sys.stdout)],
+)
+logger = logging.getLogger(__name__)
+
+TRUE_VALUES = ("1", "true", "yes")
+
+# Largest POST body accepted; a summarize request is a few short fields
+MAX_BODY_BYTES = 8 * 1024
+
+
+class SummarizerRequestHandler(BaseHTTPRequestHandler):
+    """Translates HTTP requests into SummarizerService jobs."""
+
+    server_version = "YouTubeSummarizer/1.0"
+
+    def do_GET(self) -> None:
+        """Serve health, metrics and query-string summarize requests."""
+        url = urlparse(self.path)
+        if url.path == "/healthz":
+            stats = self.server.service.stats()
+            self._send_json(HTTPStatus.OK, {"status": "ok", **stats})
+        elif url.path == "/metrics":
+            self._send(
+                HTTPStatus.OK,
+                get_metrics().to_prometheus().encode(),
+                "text/plain; version=0.0.4",
+            )
+        elif url.path == "/summarize":
+            params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            self._summarize(params)
+        else:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": "Not found"})
+
+    def do_POST(self) -> None:
+        """Serve JSON summarize requests."""
+        if urlparse(self.path).path != "/summarize":
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": "Not found"})
+            return
+        if "Content-Length" not in self.headers:
+            self._send_json(
+                HTTPStatus.LENGTH_REQUIRED, {"error": "Missing Content-Length"},
+            )
+            return
+        try:
+            length = int(self.headers["Content-Length"])
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._send_json(
+                HTTPStatus.BAD_REQUEST, {"error": "Invalid Content-Length"},
+            )
+            return
+        if length > MAX_BODY_BYTES:
+            # The body is left unread, so the connection cannot be reused
+            self.close_connection = True
+            self._send_json(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                {"error": f"Request body over {MAX_BODY_BYTES} bytes"},
+            )
+            return
+        try:
+            params = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError as e:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": f"Invalid JSON: {e}"})
+            return
+        if not isinstance(params, dict):
+            self._send_json(
+                HTTPStatus.BAD_REQUEST, {"error": "Expected a JSON object"},
+            )
+            return
+        self._summarize(params)
+
+    def _summarize(self, params: dict) -> None:
+        """Submit (or join) a job and reply with its result or status."""
+        video_url = params.get("url")
+        method = params.get("method", "api")
+        if not video_url:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": "Missing 'url'"})
+            return
+        if method not in ("api", "download"):
+            self._send_json(
+                HTTPStatus.BAD_REQUEST, {"error": f"Unknown method: {method}"},
+            )
+            return
+
+        try:
+            future = self.server.service.submit(
+                video_url,
+                method=method,
+                force_download=_flag(params.get("force_download")),
+                combined=_flag(params.get("combined")),
+            )
+        except ValueError as e:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+            return
+        except ServiceBusyError as e:
+            self._send_json(HTTPStatus.SERVICE_UNAVAILABLE, {"error": str(e)})
+            return
+
+        wait = _flag(params.get("wait", True))
+        timeout = config.SERVER_REQUEST_TIMEOUT if wait else 0
+        try:
+            result = future.result(timeout=timeout)
+        except FutureTimeoutError:
+            self._send_json(
+                HTTPStatus.ACCEPTED, {"status": "pending", "url": video_url},
+            )
+            return
+        except Exception as e:  # noqa: BLE001 - any pipeline failure is a 502
+            self._send_json(HTTPStatus.BAD_GATEWAY, {"error": str(e)})
+            return
+        self._send_json(HTTPStatus.OK, {"status": "done", **result})
+
+    def _send_json(self, status: HTTPStatus, payload: dict) -> None:
+        """Reply with ``payload`` as JSON."""
+        self._send(status, json.dumps(payload).encode(), "application/json")
+
+    def _send(self, status: HTTPStatus, body: bytes, content_type: str) -> None:
+        """Reply with a complete body of the given type."""
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        """Route access logs through the logging module."""
+        logger.info("%s - %s", self.address_string(), format % args)
+
+
+def _flag(value: object) -> bool:
+    """Interpret a JSON boolean or query-string flag."""
+    if isinstance(value, str):
+        return value.lower() in TRUE_VALUES
+    return bool(value)
+
+
+def create_server(
+    host: str, port: int, service: SummarizerService | None = None,
+) -> ThreadingHTTPServer:
+    """Create the HTTP server around a (new or given) SummarizerService."""
+    server = ThreadingHTTPServer((host, port), SummarizerRequestHandler)
+    server.daemon_threads = True
+    server.service = service or SummarizerService()
+    return server
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="YouTube Video Summarizer service")
+    parser.add_argument(
+        "--host",
+        default=config.SERVER_HOST,
+        help="Address to listen on",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=config.SERVER_PORT,
+        help="Port to listen on",
+    )
+    parser.add_argument(
+        "--local",
+        action="store_true",
+        help="Only accept connections from this machine (binds to 127.0.0.1)",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Run the HTTP service until interrupted."""
+    args = parse_arguments()
+    host = "127.0.0.1" if args.local else args.host
+    server = create_server(host, args.port)
+    logger.info("Serving on http://%s:%d", host, server.server_address[1])
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down")
+    finally:
+        server.server_close()
+        server.service.shutdown(wait=False)
+
+
+if __name__ == "__main__":
+    main()
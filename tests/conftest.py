@@ -0,0 +1,22 @@
+"""Shared test setup.
+
+config reads the environment once, at import time, so the scratch output
+directory, dummy API keys and disabled rate limits are set here, before any
+test module imports it.
+"""
+
+import os
+import tempfile
+
+os.environ.update(
+    {
+        "OUTPUT_DIR": tempfile.mkdtemp(prefix="yt-summarizer-tests-"),
+        "CACHE_ENABLED": "false",
+        "YOUTUBE_API_KEY": "test",
+        "GEMINI_API_KEY": "test",
+        "YOUTUBE_QPS": "0",
+        "YOUTUBE_DAILY_QUOTA": "0",
+        "GEMINI_RPM": "0",
+        "GEMINI_TPM": "0",
+    },
+)
@@ -0,0 +1,66 @@
+"""Tests for processors.async_video_processor."""
+
+import asyncio
+import threading
+
+import pytest
+
+from processors.async_video_processor import AsyncVideoProcessor
+from processors.video_processor import VideoProcessor
+
+
+class RecordingCache:
+    """Serves canned stage results and records the thread of every call."""
+
+    def __init__(self, results: dict) -> None:
+        """Remember the result of each stage."""
+        self.results = results
+        self.threads = []
+
+    def get(
+        self, stage: str, _video_id: str, default: object = None, **_inputs: object,
+    ) -> object:
+        """Return the canned result of a stage."""
+        self.threads.append(threading.current_thread())
+        return self.results.get(stage, default)
+
+    def set(self, stage: str, _video_id: str, value: object, **_inputs: object) -> None:
+        """Record a stored result."""
+        self.threads.append(threading.current_thread())
+        self.results[stage] = value
+
+
+def test_cache_io_and_compression_run_off_the_event_loop(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A fully cached run never touches the cache on the event loop thread."""
+    cache = RecordingCache(
+        {
+            "api_transcript": [
+                {"text": "hello there", "start_time": 0.0, "end_time": 2.0},
+            ],
+            "timestamps": ["00:00 - Intro: Says hello."],
+            "summary_text": "A short video.",
+        },
+    )
+    compressed_on = []
+    compress = VideoProcessor.__dict__["_compress_transcript"]
+
+    def record_compress(processor: VideoProcessor) -> None:
+        compressed_on.append(threading.current_thread())
+        compress(processor)
+
+    monkeypatch.setattr(VideoProcessor, "_compress_transcript", record_compress)
+    processor = AsyncVideoProcessor("https://youtu.be/abc", cache=cache)
+
+    async def run() -> tuple[str, threading.Thread]:
+        return await processor.process(), threading.current_thread()
+
+    summary, loop_thread = asyncio.run(run())
+
+    assert "A short video." in summary
+    assert "00:00 - Intro: Says hello." in summary
+    assert cache.threads
+    assert loop_thread not in cache.threads
+    assert compressed_on
+    assert loop_thread not in compressed_on
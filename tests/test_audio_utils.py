@@ -0,0 +1,144 @@
+"""Tests for utils.audio_utils."""
+
+import itertools
+import sys
+
+import numpy as np
+import pytest
+
+from utils import audio_utils
+from utils.audio_utils import (
+    SAMPLE_RATE,
+    compact_speech,
+    ffmpeg_decode_command,
+    find_silence_splits,
+    iter_audio_windows,
+    pcm16_to_float,
+    to_original_time,
+)
+
+
+def tone(seconds: float) -> np.ndarray:
+    """Return a loud sine wave lasting ``seconds``."""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (0.5 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+
+
+def silence(seconds: float) -> np.ndarray:
+    """Return ``seconds`` of digital silence."""
+    return np.zeros(int(seconds * SAMPLE_RATE), dtype=np.float32)
+
+
+def test_splits_cover_the_audio_in_order() -> None:
+    """Splits start at 0, end at the last sample and strictly increase."""
+    audio = tone(125)
+
+    splits = find_silence_splits(audio, chunk_seconds=30)
+
+    assert splits[0] == 0
+    assert splits[-1] == len(audio)
+    assert all(start < end for start, end in itertools.pairwise(splits))
+
+
+def test_splits_land_in_nearby_silence() -> None:
+    """Each boundary moves to the gap closest to the ideal chunk length."""
+    audio = np.concatenate([tone(27), silence(1), tone(30), silence(1), tone(30)])
+
+    splits = find_silence_splits(audio, chunk_seconds=30, search_seconds=5)
+
+    assert len(splits) == 4
+    for split, gap_start in zip(splits[1:3], (27, 58), strict=True):
+        assert gap_start * SAMPLE_RATE <= split <= (gap_start + 1) * SAMPLE_RATE
+
+
+def test_short_audio_is_a_single_chunk() -> None:
+    """Audio shorter than a chunk is not split."""
+    audio = tone(10)
+
+    assert find_silence_splits(audio, chunk_seconds=30) == [0, len(audio)]
+
+
+def test_decode_command_sends_headers_and_writes_pcm_to_stdout() -> None:
+    """The command asks ffmpeg for mono 16-bit PCM on stdout, with headers."""
+    cmd = ffmpeg_decode_command(
+        "https://example.com/audio", headers={"User-Agent": "test"},
+    )
+
+    assert cmd[0] == "ffmpeg"
+    assert cmd[cmd.index("-headers") + 1] == "User-Agent: test\r\n"
+    assert cmd[cmd.index("-i") + 1] == "https://example.com/audio"
+    assert cmd[cmd.index("-ac") + 1] == "1"
+    assert cmd[cmd.index("-ar") + 1] == str(SAMPLE_RATE)
+    assert cmd[-1] == "-"
+
+
+def test_pcm16_is_scaled_to_unit_range() -> None:
+    """16-bit samples map onto float32 values in [-1, 1)."""
+    data = np.array([-32768, 0, 16384, 32767], dtype="<i2").tobytes()
+
+    samples = pcm16_to_float(data)
+
+    assert samples.dtype == np.float32
+    assert samples.tolist() == [-1.0, 0.0, 0.5, 32767 / 32768]
+
+
+def fake_ffmpeg(script: str) -> object:
+    """Return a decode command builder that runs ``script`` instead of ffmpeg."""
+
+    def command(*_args: object, **_options: object) -> list:
+        return [sys.executable, "-c", script]
+
+    return command
+
+
+def test_windows_stream_despite_a_chatty_stderr(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Lots of log output does not stall decoding, and no audio is lost."""
+    seconds = 5
+    script = (
+        "import sys\n"
+        "sys.stderr.write('x' * 1_000_000)\n"
+        f"sys.stdout.buffer.write(b'\\x00\\x10' * {seconds * SAMPLE_RATE})\n"
+    )
+    monkeypatch.setattr(audio_utils, "ffmpeg_decode_command", fake_ffmpeg(script))
+
+    windows = list(
+        iter_audio_windows("audio", window_seconds=2, search_seconds=0.5),
+    )
+
+    assert len(windows) >= seconds // 2
+    assert windows[0][0] == 0
+    assert sum(len(samples) for _, samples in windows) == seconds * SAMPLE_RATE
+
+
+def test_decoder_failure_reports_its_log(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A failing decoder raises with its stderr output in the message."""
+    script = "import sys\nsys.stderr.write('no such file')\nsys.exit(1)\n"
+    monkeypatch.setattr(audio_utils, "ffmpeg_decode_command", fake_ffmpeg(script))
+
+    with pytest.raises(RuntimeError, match="no such file"):
+        list(iter_audio_windows("audio"))
+
+
+def test_compacted_times_map_back_into_their_region() -> None:
+    """Times inside a kept region shift by the silence cut before it."""
+    audio = np.concatenate([tone(2), silence(3), tone(1)])
+    regions = [(0, 2 * SAMPLE_RATE), (5 * SAMPLE_RATE, 6 * SAMPLE_RATE)]
+
+    speech, timeline = compact_speech(audio, regions)
+
+    assert len(speech) == 3 * SAMPLE_RATE
+    assert to_original_time(1.0, timeline) == 1.0
+    assert to_original_time(2.5, timeline) == 5.5
+    assert to_original_time(2.5, timeline, end=True) == 5.5
+
+
+def test_region_boundary_maps_by_segment_side() -> None:
+    """A boundary time starts the next region but ends the previous one."""
+    timeline = [(0.0, 0.0), (2.0, 5.0)]
+
+    assert to_original_time(2.0, timeline) == 5.0
+    assert to_original_time(2.0, timeline, end=True) == 2.0
+    # A segment ending at the boundary must not span the cut-out silence
+    assert to_original_time(0.0, timeline, end=True) == 0.0
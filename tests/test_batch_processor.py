@@ -0,0 +1,211 @@
+"""Tests for processors.batch_processor."""
+
+import threading
+import time
+import types
+from collections.abc import Iterator
+
+import pytest
+
+from processors import batch_processor
+from processors.batch_processor import BatchProcessor
+
+
+class FakeVideoProcessor:
+    """Stands in for VideoProcessor and records how many pipelines overlap."""
+
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+
+    def __init__(self, video_url: str, stage_limits: dict | None = None) -> None:
+        """Remember the URL; the stage limits are not needed."""
+        self.video_url = video_url
+        self.stage_limits = stage_limits
+
+    def process(self, **_options: object) -> str:
+        """Pretend to summarize the video, failing for URLs containing "fail"."""
+        cls = type(self)
+        with cls.lock:
+            cls.running += 1
+            cls.peak = max(cls.peak, cls.running)
+        try:
+            time.sleep(0.01)
+            if "fail" in self.video_url:
+                msg = "boom"
+                raise RuntimeError(msg)
+            return f"summary of {self.video_url}"
+        finally:
+            with cls.lock:
+                cls.running -= 1
+
+
+@pytest.fixture(autouse=True)
+def fake_pipeline(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Run every batch against FakeVideoProcessor."""
+    FakeVideoProcessor.running = FakeVideoProcessor.peak = 0
+    monkeypatch.setattr(batch_processor, "VideoProcessor", FakeVideoProcessor)
+
+
+def test_failures_do_not_stop_the_batch() -> None:
+    """A failing video is reported and the remaining videos still run."""
+    urls = ["https://youtu.be/ok1", "https://youtu.be/fail", "https://youtu.be/ok2"]
+    seen = []
+
+    results = BatchProcessor(io_workers=2, whisper_workers=1, schedule_window=0).run(
+        urls, on_result=seen.append,
+    )
+
+    assert sorted(result.video_url for result in results) == sorted(urls)
+    assert seen == results
+    failed = [result for result in results if not result.ok]
+    assert [result.video_url for result in failed] == ["https://youtu.be/fail"]
+    assert failed[0].error == "boom"
+    assert all(result.summary for result in results if result.ok)
+
+
+def test_in_flight_pipelines_are_bounded() -> None:
+    """No more than io_workers + whisper_workers pipelines run at once."""
+    urls = [f"https://youtu.be/video{i}" for i in range(20)]
+
+    BatchProcessor(io_workers=2, whisper_workers=1, schedule_window=0).run(urls)
+
+    assert 1 <= FakeVideoProcessor.peak <= 3
+
+
+def test_urls_are_consumed_lazily() -> None:
+    """Only a bounded number of URLs is read ahead of the finished videos."""
+    consumed = []
+
+    def urls() -> Iterator[str]:
+        for i in range(50):
+            consumed.append(i)
+            yield f"https://youtu.be/video{i}"
+
+    read_at_first_result = []
+    BatchProcessor(io_workers=2, whisper_workers=1, schedule_window=0).run(
+        urls(),
+        on_result=lambda _result: read_at_first_result.append(len(consumed)),
+    )
+
+    assert read_at_first_result[0] <= 3
+    assert len(consumed) == 50
+
+
+def scheduled(
+    videos: dict, *, method: str = "api", io_workers: int = 2, whisper_workers: int = 1,
+) -> list:
+    """Schedule ``videos`` (ID to minutes); IDs starting with "w" lack captions."""
+    metadata = {
+        video_id: {
+            "contentDetails": {
+                "duration": f"PT{minutes}M",
+                "caption": "false" if video_id.startswith("w") else "true",
+            },
+        }
+        for video_id, minutes in videos.items()
+    }
+    processor = BatchProcessor(io_workers=io_workers, whisper_workers=whisper_workers)
+    processor.api_transcriber = types.SimpleNamespace(
+        get_videos_metadata=lambda ids: {i: metadata[i] for i in ids if i in metadata},
+    )
+    urls = [f"https://youtu.be/{video_id}" for video_id in videos]
+    options = {"method": method, "force_download": False, "combined": False}
+    ordered = processor._order_window(urls, options)  # noqa: SLF001
+    return [url.rsplit("/", 1)[1] for url in ordered]
+
+
+def test_longest_videos_start_first() -> None:
+    """API-only videos are ordered by duration, ties in input order."""
+    assert scheduled({"short": 2, "long": 30, "mid": 10, "mid2": 10}) == [
+        "long",
+        "mid",
+        "mid2",
+        "short",
+    ]
+
+
+def test_whisper_jobs_are_interleaved_by_worker_limits() -> None:
+    """With 2 io and 1 Whisper workers, one Whisper job starts per two API jobs."""
+    videos = {"a1": 9, "a2": 8, "a3": 7, "a4": 6, "w1": 20, "w2": 10}
+
+    assert scheduled(videos) == ["w1", "a1", "a2", "w2", "a3", "a4"]
+
+
+def test_download_method_schedules_every_video_as_whisper() -> None:
+    """In download mode every video needs Whisper, longest first."""
+    assert scheduled({"a": 1, "b": 5, "c": 3}, method="download") == ["b", "c", "a"]
+
+
+def test_unknown_videos_and_bad_urls_keep_their_place() -> None:
+    """Videos without metadata count as zero length and are not dropped."""
+    processor = BatchProcessor(io_workers=2, whisper_workers=1)
+    processor.api_transcriber = types.SimpleNamespace(
+        get_videos_metadata=lambda _ids: {
+            "known": {"contentDetails": {"duration": "PT5M"}},
+        },
+    )
+    urls = [
+        "https://example.com/x",
+        "https://youtu.be/unknown",
+        "https://youtu.be/known",
+    ]
+    options = {"method": "api", "force_download": False}
+
+    assert processor._order_window(urls, options) == [  # noqa: SLF001
+        "https://youtu.be/known",
+        "https://example.com/x",
+        "https://youtu.be/unknown",
+    ]
+
+
+def test_failed_prefetch_keeps_input_order() -> None:
+    """Scheduling is best effort: an API error leaves the window as it was."""
+
+    def fail(_ids: list) -> dict:
+        msg = "quota"
+        raise RuntimeError(msg)
+
+    processor = BatchProcessor(io_workers=2, whisper_workers=1)
+    processor.api_transcriber = types.SimpleNamespace(get_videos_metadata=fail)
+    urls = ["https://youtu.be/b", "https://youtu.be/a"]
+
+    assert processor._order_window(urls, {"method": "api"}) == urls  # noqa: SLF001
+
+
+def test_urls_are_scheduled_one_window_at_a_time() -> None:
+    """Each window is prefetched in one call and ordered on its own."""
+    prefetched = []
+
+    def metadata(ids: list) -> dict:
+        prefetched.append(ids)
+        return {i: {"contentDetails": {"duration": f"PT{i[-1]}M"}} for i in ids}
+
+    processor = BatchProcessor(io_workers=1, whisper_workers=1, schedule_window=2)
+    processor.api_transcriber = types.SimpleNamespace(get_videos_metadata=metadata)
+    urls = (f"https://youtu.be/v{i}" for i in (1, 2, 3, 4, 5))
+    options = {"method": "api", "force_download": False}
+
+    ordered = processor._schedule(urls, options)  # noqa: SLF001
+
+    assert [url[-2:] for url in ordered] == ["v2", "v1", "v4", "v3", "v5"]
+    assert prefetched == [["v1", "v2"], ["v3", "v4"], ["v5"]]
+
+
+def test_unrecognized_urls_fail_alone() -> None:
+    """A URL without a video ID fails on its own without aborting the batch."""
+    processor = BatchProcessor(io_workers=2, whisper_workers=1)
+    processor.api_transcriber = types.SimpleNamespace(
+        get_videos_metadata=lambda ids: {
+            i: {"contentDetails": {"duration": "PT1M"}} for i in ids
+        },
+    )
+    urls = [
+        "https://youtu.be/ok1",
+        "https://www.youtube.com/watch?list=PLabc",
+        "https://youtu.be/ok2",
+    ]
+
+    results = processor.run(urls)
+
+    assert sorted(result.video_url for result in results) == sorted(urls)
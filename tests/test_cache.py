@@ -0,0 +1,90 @@
+"""Tests for utils.cache."""
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from utils import cache as cache_module
+from utils.cache import ResultCache
+
+
+def entry_path(root: Path, video_id: str) -> Path:
+    """Return the single cache entry file stored for a video."""
+    key = ResultCache.make_key("summary", video_id)
+    (path,) = root.glob(f"summary/*/{key}.json")
+    return path
+
+
+def test_key_depends_on_every_input_but_not_their_order() -> None:
+    """Changing any input changes the key; keyword order does not."""
+    key = ResultCache.make_key("summary", "abc", model="m1", prompt=2)
+
+    assert key == ResultCache.make_key("summary", "abc", prompt=2, model="m1")
+    assert key != ResultCache.make_key("summary", "abc", model="m2", prompt=2)
+    assert key != ResultCache.make_key("summary", "xyz", model="m1", prompt=2)
+    assert key != ResultCache.make_key("key_points", "abc", model="m1", prompt=2)
+
+
+def test_set_then_get_round_trips(tmp_path: Path) -> None:
+    """A stored value is served back only for the same inputs."""
+    cache = ResultCache(root=tmp_path, max_bytes=0, ttl_seconds=0)
+    cache.set("summary", "abc", {"text": "hi"}, model="m1")
+
+    assert cache.get("summary", "abc", model="m1") == {"text": "hi"}
+    assert cache.get("summary", "abc", default="miss", model="m2") == "miss"
+
+
+def test_expired_entries_are_misses(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Entries older than the TTL are dropped on read."""
+    cache = ResultCache(root=tmp_path, max_bytes=0, ttl_seconds=60)
+    cache.set("summary", "abc", "old")
+    path = entry_path(tmp_path, "abc")
+    later = time.time() + 120
+    monkeypatch.setattr(cache_module.time, "time", lambda: later)
+
+    assert cache.get("summary", "abc") is None
+    assert not path.exists()
+
+
+def test_corrupt_entries_are_discarded(tmp_path: Path) -> None:
+    """An unreadable entry is treated as a miss and removed."""
+    cache = ResultCache(root=tmp_path, max_bytes=0, ttl_seconds=0)
+    cache.set("summary", "abc", "value")
+    path = entry_path(tmp_path, "abc")
+    path.write_text("{not json", encoding="utf-8")
+
+    assert cache.get("summary", "abc", default="miss") == "miss"
+    assert not path.exists()
+
+
+def test_get_or_compute_computes_once(tmp_path: Path) -> None:
+    """The compute function only runs on a miss."""
+    cache = ResultCache(root=tmp_path, max_bytes=0, ttl_seconds=0)
+    calls = []
+
+    def compute() -> str:
+        calls.append(1)
+        return "value"
+
+    assert cache.get_or_compute("summary", "abc", compute) == "value"
+    assert cache.get_or_compute("summary", "abc", compute) == "value"
+    assert len(calls) == 1
+
+
+def test_eviction_drops_least_recently_used(tmp_path: Path) -> None:
+    """Above the size limit, the entries used longest ago go first."""
+    cache = ResultCache(root=tmp_path, max_bytes=10**9, ttl_seconds=0)
+    for video_id in ("old", "new"):
+        cache.set("summary", video_id, "x" * 1000)
+    old = entry_path(tmp_path, "old")
+    os.utime(old, (time.time() - 100, time.time() - 100))
+    cache.max_bytes = old.stat().st_size + 100
+
+    cache.evict()
+
+    assert cache.get("summary", "old") is None
+    assert cache.get("summary", "new") == "x" * 1000
@@ -0,0 +1,83 @@
+"""Tests for utils.clients."""
+
+import sys
+import threading
+import types
+
+import pytest
+
+from utils import clients
+
+
+@pytest.fixture
+def fake_genai(monkeypatch: pytest.MonkeyPatch) -> types.SimpleNamespace:
+    """Install a fake google.generativeai that counts configure calls."""
+    genai = types.SimpleNamespace(configured=0)
+
+    def configure(**_options: object) -> None:
+        genai.configured += 1
+
+    genai.configure = configure
+    genai.GenerativeModel = lambda name: types.SimpleNamespace(model_name=name)
+    google = types.ModuleType("google")
+    google.generativeai = genai
+    monkeypatch.setitem(sys.modules, "google", google)
+    monkeypatch.setitem(sys.modules, "google.generativeai", genai)
+    monkeypatch.setattr(clients, "_gemini_models", {})
+    monkeypatch.setattr(clients, "_gemini_configured", False)
+    return genai
+
+
+@pytest.fixture
+def fake_googleapiclient(monkeypatch: pytest.MonkeyPatch) -> list:
+    """Install a fake googleapiclient; returns the discovery builds made."""
+    builds = []
+
+    def build(*_args: object, **_options: object) -> types.SimpleNamespace:
+        builds.append(1)
+        return types.SimpleNamespace(_rootDesc={"name": "youtube"})
+
+    discovery = types.SimpleNamespace(
+        build=build,
+        build_from_document=lambda doc, **_options: types.SimpleNamespace(doc=doc),
+    )
+    http = types.SimpleNamespace(build_http=object)
+    package = types.ModuleType("googleapiclient")
+    package.discovery = discovery
+    package.http = http
+    monkeypatch.setitem(sys.modules, "googleapiclient", package)
+    monkeypatch.setitem(sys.modules, "googleapiclient.discovery", discovery)
+    monkeypatch.setitem(sys.modules, "googleapiclient.http", http)
+    monkeypatch.setattr(clients, "_youtube_discovery_doc", None)
+    monkeypatch.setattr(clients, "_thread_local", threading.local())
+    return builds
+
+
+def test_gemini_model_is_shared(fake_genai: types.SimpleNamespace) -> None:
+    """The API is configured once and each model name maps to one client."""
+    first = clients.get_gemini_model("gemini-a")
+
+    assert clients.get_gemini_model("gemini-a") is first
+    assert clients.get_gemini_model("gemini-b") is not first
+    assert fake_genai.configured == 1
+
+
+def test_youtube_service_is_per_thread(fake_googleapiclient: list) -> None:
+    """Each thread gets its own service; the discovery doc is fetched once."""
+    services = [[], []]
+
+    def build_twice(mine: list) -> None:
+        mine.append(clients.get_youtube_service())
+        mine.append(clients.get_youtube_service())
+
+    threads = [threading.Thread(target=build_twice, args=(m,)) for m in services]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    (first, again), (other, _) = services
+    assert first is again
+    assert first is not other
+    assert first.doc == {"name": "youtube"}
+    assert fake_googleapiclient == [1]
@@ -0,0 +1,91 @@
+"""Tests for processors.combined_generator."""
+
+import json
+import types
+
+import pytest
+
+from processors import combined_generator
+from processors.combined_generator import CombinedGenerator
+
+RESPONSE = {
+    "key_points": [
+        {"timestamp": "00:05", "title": "Intro", "summary": "Says hello."},
+        {"timestamp": "01:10", "title": "Main idea", "summary": "Explains it."},
+    ],
+    "summary": "  A short video.  ",
+}
+
+
+class FakeModel:
+    """Returns a canned response and records the prompts it was sent."""
+
+    def __init__(self, text: str) -> None:
+        """Remember the response text."""
+        self.text = text
+        self.prompts = []
+
+    def generate_content(
+        self, prompt: str, **_options: object,
+    ) -> types.SimpleNamespace:
+        """Record the prompt and return the canned response."""
+        self.prompts.append(prompt)
+        return types.SimpleNamespace(text=self.text)
+
+
+def generate(monkeypatch: pytest.MonkeyPatch, text: str) -> tuple[list, str]:
+    """Run CombinedGenerator.generate against a model returning ``text``."""
+    model = FakeModel(text)
+    monkeypatch.setattr(combined_generator, "get_gemini_model", lambda _name: model)
+    transcript = [{"text": "hello there", "start_time": 65.0, "end_time": 67.0}]
+    result = CombinedGenerator().generate(transcript)
+    assert "[01:05] hello there" in model.prompts[0]
+    return result
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        json.dumps(RESPONSE),
+        f"```json\n{json.dumps(RESPONSE)}\n```",
+        f"```JSON\n{json.dumps(RESPONSE)}\n```",
+        f"  \n```\n{json.dumps(RESPONSE, indent=2)}\n```  \n",
+    ],
+    ids=["bare", "fenced", "fenced-uppercase", "fenced-untagged-whitespace"],
+)
+def test_key_points_and_summary_are_parsed(
+    monkeypatch: pytest.MonkeyPatch, text: str,
+) -> None:
+    """Bare and fenced JSON responses give the same key points and summary."""
+    key_points, summary = generate(monkeypatch, text)
+
+    assert key_points == [
+        "00:05 - Intro: Says hello.",
+        "01:10 - Main idea: Explains it.",
+    ]
+    assert "SUMMARY:\nA short video.\n" in summary
+    assert summary.endswith("KEY POINTS:\n" + "\n".join(key_points) + "\n")
+
+
+def test_invalid_json_raises_value_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A response that is not JSON is reported as a ValueError."""
+    with pytest.raises(ValueError, match="invalid JSON"):
+        generate(monkeypatch, "```json\nnot json\n```")
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        ["not", "an", "object"],
+        {"key_points": [{"timestamp": "00:05", "title": "Intro"}], "summary": "x"},
+        {"key_points": ["00:05 Intro"], "summary": "x"},
+        {"key_points": [], "summary": ["x"]},
+    ],
+    ids=["not-object", "missing-field", "point-not-object", "summary-not-text"],
+)
+def test_unexpected_json_raises_value_error(
+    monkeypatch: pytest.MonkeyPatch, data: object,
+) -> None:
+    """Valid JSON of the wrong shape is reported as a ValueError too."""
+    with pytest.raises(ValueError, match="unexpected JSON"):
+        generate(monkeypatch, json.dumps(data))
@@ -0,0 +1,78 @@
+"""Tests for benchmarks.fakes, the offline stand-ins used by the benchmarks."""
+
+import sys
+
+import pytest
+
+from benchmarks import fakes
+from processors import combined_generator, summary_generator
+from processors.combined_generator import CombinedGenerator
+from processors.summary_generator import SummaryGenerator
+
+FAKE_MODULES = (
+    "googleapiclient",
+    "googleapiclient.discovery",
+    "googleapiclient.http",
+    "google",
+    "google.generativeai",
+    "youtube_dl",
+    "whisper",
+)
+
+TRANSCRIPT = [{"text": "hello there", "start_time": 5.0, "end_time": 7.0}]
+
+
+@pytest.fixture(autouse=True)
+def instant_fakes(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Install latency-free fakes, restoring the real modules afterwards."""
+    for name in FAKE_MODULES:
+        monkeypatch.setitem(sys.modules, name, None)
+    monkeypatch.setattr(fakes, "_settings", fakes.FakeSettings())
+    fakes.install(
+        fakes.FakeSettings(
+            segments=10,
+            youtube_latency=0,
+            gemini_latency=0,
+            gemini_tokens_per_second=1e9,
+            download_latency=0,
+            model_load_latency=0,
+            whisper_speed=1e9,
+        ),
+    )
+
+
+def test_streamed_chunks_reach_the_summary(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Streamed fake chunks carry parts, so none are skipped as empty."""
+    model = fakes.FakeGenerativeModel("gemini")
+    monkeypatch.setattr(summary_generator, "get_gemini_model", lambda _name: model)
+
+    pieces = list(SummaryGenerator().generate_stream(TRANSCRIPT, ["00:05 - Intro"]))
+
+    assert pieces
+    assert "".join(pieces) == model.generate_content("prompt").text
+
+
+def test_json_mode_answers_parse_as_combined_results(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """The combined generator parses the fake's JSON answer into key points."""
+    model = fakes.FakeGenerativeModel("gemini")
+    monkeypatch.setattr(combined_generator, "get_gemini_model", lambda _name: model)
+
+    key_points, summary = CombinedGenerator().generate(TRANSCRIPT)
+
+    assert key_points[0] == "00:00 - Topic 0: what the speaker covers in this part"
+    assert "A canned summary." in summary
+
+
+def test_videos_without_captions_have_no_tracks() -> None:
+    """The no-captions prefix sends a video down the Whisper path."""
+    service = sys.modules["googleapiclient.discovery"].build("youtube", "v3")
+
+    with_captions = service.captions().list(part="snippet", videoId="abc").execute()
+    without = service.captions().list(
+        part="snippet", videoId=f"{fakes.NO_CAPTIONS_PREFIX}1",
+    ).execute()
+
+    assert [item["id"] for item in with_captions["items"]] == ["abc.en"]
+    assert without["items"] == []
@@ -0,0 +1,30 @@
+"""Tests for utils.file_utils."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from utils.file_utils import load_json, save_json
+
+
+def test_save_json_round_trips_and_creates_directories(tmp_path: Path) -> None:
+    """Missing parent directories are created and the data reads back."""
+    path = tmp_path / "a" / "b" / "data.json"
+
+    save_json({"text": "héllo"}, path)
+
+    assert load_json(path) == {"text": "héllo"}
+    assert list(path.parent.iterdir()) == [path]
+
+
+def test_failed_save_keeps_the_previous_file(tmp_path: Path) -> None:
+    """A write that fails midway leaves neither a partial file nor a temp file."""
+    path = tmp_path / "data.json"
+    save_json({"version": 1}, path)
+
+    with pytest.raises(TypeError):
+        save_json({"version": 2, "bad": object()}, path)
+
+    assert json.loads(path.read_text(encoding="utf-8")) == {"version": 1}
+    assert list(tmp_path.iterdir()) == [path]
@@ -0,0 +1,11 @@
+"""Tests for utils.import_budget."""
+
+from utils.import_budget import measure_import
+
+
+def test_cli_does_not_import_heavy_modules() -> None:
+    """Loading the CLI leaves Whisper, torch and the Google clients unloaded."""
+    report = measure_import("main")
+
+    assert report["heavy"] == []
+    assert report["total_ms"] > 0
@@ -0,0 +1,78 @@
+"""Tests for processors.map_reduce."""
+
+import contextvars
+import time
+from pathlib import Path
+
+from processors.map_reduce import map_windows, map_windows_cached
+from utils.cache import ResultCache
+
+current_video = contextvars.ContextVar("current_video", default=None)
+
+
+def test_results_keep_window_order() -> None:
+    """Results come back in window order even when later windows finish first."""
+    windows = [[3], [2], [1], [0]]
+
+    def slow_first(index: int, window: list) -> tuple:
+        time.sleep(window[0] * 0.01)
+        return index, window[0]
+
+    assert map_windows(slow_first, windows, max_workers=4) == [
+        (0, 3),
+        (1, 2),
+        (2, 1),
+        (3, 0),
+    ]
+
+
+def test_calls_run_in_the_callers_context() -> None:
+    """Context variables, such as the metrics video scope, reach the workers."""
+    current_video.set("abc")
+
+    seen = map_windows(
+        lambda _index, _window: current_video.get(), [[1], [2], [3]], max_workers=3,
+    )
+
+    assert seen == ["abc", "abc", "abc"]
+
+
+def test_cached_windows_are_not_recomputed(tmp_path: Path) -> None:
+    """Only windows without a cached result are processed, in their own slots."""
+    cache = ResultCache(str(tmp_path))
+    calls = []
+
+    def process(index: int, window: list) -> str:
+        calls.append(index)
+        return "+".join(window)
+
+    def run(windows: list) -> list:
+        return map_windows_cached(
+            process, windows, cache, "stage", "|".join, model="m",
+        )
+
+    assert run([["a"], ["b"], ["c"]]) == ["a", "b", "c"]
+    calls.clear()
+
+    assert run([["a"], ["x", "y"], ["c"]]) == ["a", "x+y", "c"]
+    assert calls == [1]
+
+
+def test_cached_results_depend_on_the_other_inputs(tmp_path: Path) -> None:
+    """A different model or prompt version does not reuse earlier results."""
+    cache = ResultCache(str(tmp_path))
+    windows = [["a"], ["b"]]
+
+    map_windows_cached(
+        lambda _index, window: window[0], windows, cache, "stage", "|".join, model="m",
+    )
+    results = map_windows_cached(
+        lambda _index, window: window[0].upper(),
+        windows,
+        cache,
+        "stage",
+        "|".join,
+        model="other",
+    )
+
+    assert results == ["A", "B"]
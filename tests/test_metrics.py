@@ -0,0 +1,106 @@
+"""Tests for utils.metrics."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from utils.metrics import JsonLinesWriter, MetricsRecorder, Span, video_scope
+
+
+def test_spans_nest_and_carry_the_video() -> None:
+    """Spans record their parent and the video of the enclosing scope."""
+    recorder = MetricsRecorder()
+    finished = []
+    recorder.add_hook(finished.append)
+
+    with (
+        video_scope("abc"),
+        recorder.span("summary"),
+        recorder.span("gemini_call") as call,
+    ):
+        call.set(input_tokens=100, output_tokens=20, cost_usd=0.5)
+
+    call, summary = finished
+    assert (call.name, call.parent, call.video_id) == ("gemini_call", "summary", "abc")
+    assert summary.parent is None
+    assert recorder.video_totals("abc") == {
+        "input_tokens": 100,
+        "output_tokens": 20,
+        "cost_usd": 0.5,
+    }
+
+
+def test_errors_are_recorded_and_reraised() -> None:
+    """A span that raises is counted as an error and the error propagates."""
+    recorder = MetricsRecorder()
+
+    def fail() -> None:
+        with recorder.span("transcript"):
+            msg = "boom"
+            raise ValueError(msg)
+
+    with pytest.raises(ValueError, match="boom"):
+        fail()
+
+    totals = recorder.stage_totals()["transcript"]
+    assert totals["count"] == 1
+    assert totals["errors"] == 1
+
+
+def test_failing_hook_does_not_break_the_pipeline() -> None:
+    """An exception in a hook is logged, later hooks still run."""
+    recorder = MetricsRecorder()
+    finished = []
+
+    def broken(_span: Span) -> None:
+        raise RuntimeError
+
+    recorder.add_hook(broken)
+    recorder.add_hook(finished.append)
+    with recorder.span("caption_list"):
+        pass
+
+    assert [span.name for span in finished] == ["caption_list"]
+
+
+def test_prometheus_export_has_stage_and_cache_totals() -> None:
+    """Stage durations, tokens and cache outcomes appear as Prometheus samples."""
+    recorder = MetricsRecorder()
+    with recorder.span("gemini_call") as call:
+        call.set(input_tokens=7, output_tokens=3)
+    recorder.record_cache("summary", "abc", hit=True)
+    recorder.record_cache("summary", "abc", hit=False)
+
+    text = recorder.to_prometheus()
+
+    assert "# TYPE yt_summarizer_stage_seconds summary" in text
+    assert 'yt_summarizer_stage_seconds_count{stage="gemini_call"} 1' in text
+    assert (
+        'yt_summarizer_llm_tokens_total{stage="gemini_call",direction="input"} 7'
+        in text
+    )
+    assert 'yt_summarizer_cache_requests_total{stage="summary",result="hit"} 1' in text
+    assert 'yt_summarizer_cache_requests_total{stage="summary",result="miss"} 1' in text
+
+
+def test_json_lines_writer_appends_one_line_per_span(tmp_path: Path) -> None:
+    """Each finished span becomes one JSON object with its attributes."""
+    path = tmp_path / "metrics.jsonl"
+    recorder = MetricsRecorder()
+    writer = JsonLinesWriter(str(path))
+    recorder.add_hook(writer)
+
+    with recorder.span("audio_download", bytes=1024):
+        pass
+    with recorder.span("transcription"):
+        pass
+    recorder.remove_hook(writer)
+    writer.close()
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [record["name"] for record in records] == [
+        "audio_download",
+        "transcription",
+    ]
+    assert records[0]["bytes"] == 1024
@@ -0,0 +1,152 @@
+"""Tests for processors.playlist_processor."""
+
+import json
+import types
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from processors import playlist_processor
+from processors.batch_processor import BatchResult
+from processors.playlist_processor import PlaylistProcessor
+
+CHANNEL_URL = "https://www.youtube.com/@creator"
+PLAYLIST_URL = "https://www.youtube.com/playlist?list=PLabc"
+
+
+class FakeBatch:
+    """Stands in for BatchProcessor; videos whose ID contains "fail" fail."""
+
+    def __init__(self) -> None:
+        """Start without any processed videos."""
+        self.processed = []
+
+    def run(
+        self, video_urls: Iterator[str], on_result: object, **_options: object,
+    ) -> list:
+        """Process the URLs in order, reporting each result."""
+        results = []
+        for url in video_urls:
+            self.processed.append(url.rsplit("=", 1)[1])
+            error = "boom" if "fail" in url else None
+            result = BatchResult(video_url=url, summary="summary", error=error)
+            results.append(result)
+            on_result(result)
+        return results
+
+
+@pytest.fixture
+def pages(monkeypatch: pytest.MonkeyPatch) -> types.SimpleNamespace:
+    """Serve the playlist pages in ``pages.items``; counts the pages fetched."""
+    pages = types.SimpleNamespace(items=[], fetched=0)
+
+    def iter_playlist_pages(_playlist_id: str) -> Iterator[list]:
+        for page in pages.items:
+            pages.fetched += 1
+            yield page
+
+    monkeypatch.setattr(playlist_processor, "iter_playlist_pages", iter_playlist_pages)
+    monkeypatch.setattr(
+        playlist_processor, "resolve_playlist_id", lambda link: f"PL{link.id}",
+    )
+    return pages
+
+
+def sync(url: str, state_path: Path, **options: object) -> list:
+    """Run a sync with a fresh PlaylistProcessor; returns the IDs processed."""
+    batch = FakeBatch()
+    PlaylistProcessor(url, state_path=str(state_path), batch=batch).run(**options)
+    return batch.processed
+
+
+def test_only_new_uploads_are_processed(
+    pages: types.SimpleNamespace, tmp_path: Path,
+) -> None:
+    """Successful videos are remembered; failed ones are retried next run."""
+    state_path = tmp_path / "state.json"
+    pages.items = [["b", "fail"], ["a"]]
+    assert sync(CHANNEL_URL, state_path) == ["b", "fail", "a"]
+
+    pages.items = [["c", "b"], ["fail", "a"]]
+    assert sync(CHANNEL_URL, state_path) == ["c", "fail"]
+
+    state = json.loads(state_path.read_text())
+    assert state["PL@creator"]["synced"] == ["a", "b", "c"]
+    assert state["PL@creator"]["source"] == CHANNEL_URL
+
+
+def test_channel_paging_stops_at_synced_uploads(
+    pages: types.SimpleNamespace, tmp_path: Path,
+) -> None:
+    """Pages after the first fully synced one are not fetched."""
+    state_path = tmp_path / "state.json"
+    pages.items = [["b"], ["a"]]
+    sync(CHANNEL_URL, state_path)
+
+    pages.items = [["c"], ["b"], ["a"]]
+    pages.fetched = 0
+    assert sync(CHANNEL_URL, state_path) == ["c"]
+    assert pages.fetched == 2
+
+
+def test_full_sync_pages_through_every_upload(
+    pages: types.SimpleNamespace, tmp_path: Path,
+) -> None:
+    """With full=True older unsynced uploads are still found."""
+    state_path = tmp_path / "state.json"
+    pages.items = [["b"]]
+    sync(CHANNEL_URL, state_path)
+
+    pages.items = [["b"], ["a"]]
+    assert sync(CHANNEL_URL, state_path) == []
+    assert sync(CHANNEL_URL, state_path, full=True) == ["a"]
+
+
+def test_playlists_are_paged_in_full_without_duplicates(
+    pages: types.SimpleNamespace, tmp_path: Path,
+) -> None:
+    """Playlists have no useful order, and may list a video twice."""
+    state_path = tmp_path / "state.json"
+    pages.items = [["a"]]
+    sync(PLAYLIST_URL, state_path)
+
+    pages.items = [["a"], ["b", "a"], ["b", "c"]]
+    assert sync(PLAYLIST_URL, state_path) == ["b", "c"]
+
+
+def test_state_keeps_other_playlists(
+    pages: types.SimpleNamespace, tmp_path: Path,
+) -> None:
+    """Each playlist has its own entry in the shared state file."""
+    state_path = tmp_path / "state.json"
+    pages.items = [["a"]]
+    sync(CHANNEL_URL, state_path)
+    sync(PLAYLIST_URL, state_path)
+
+    state = json.loads(state_path.read_text())
+    assert sorted(state) == ["PL@creator", "PLPLabc"]
+
+
+def test_state_is_saved_when_the_batch_fails(
+    pages: types.SimpleNamespace, tmp_path: Path,
+) -> None:
+    """Videos finished before an error are not summarized again."""
+    state_path = tmp_path / "state.json"
+
+    def pages_then_error() -> Iterator[list]:
+        yield ["a"]
+        msg = "quota"
+        raise RuntimeError(msg)
+
+    pages.items = pages_then_error()
+    with pytest.raises(RuntimeError, match="quota"):
+        sync(CHANNEL_URL, state_path)
+
+    assert json.loads(state_path.read_text())["PL@creator"]["synced"] == ["a"]
+
+
+def test_video_urls_are_rejected() -> None:
+    """Only playlist and channel URLs can be synced."""
+    with pytest.raises(ValueError, match="Not a playlist or channel URL"):
+        PlaylistProcessor("https://youtu.be/dQw4w9WgXcQ")
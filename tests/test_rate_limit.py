@@ -0,0 +1,213 @@
+"""Tests for utils.rate_limit."""
+
+import asyncio
+import types
+from pathlib import Path
+
+import pytest
+
+import config
+from utils import clients, rate_limit
+from utils.rate_limit import (
+    QuotaExceededError,
+    QuotaTracker,
+    ThrottledError,
+    TokenBucket,
+    retry_with_backoff,
+)
+
+
+class HttpError(Exception):
+    """An API error carrying an HTTP status, like googleapiclient's."""
+
+    def __init__(self, status: int, reason: str = "") -> None:
+        """Build the error with a fake response."""
+        super().__init__(f"<HttpError {status} {reason}>")
+        self.resp = types.SimpleNamespace(status=status)
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Retry immediately, at most three times."""
+    monkeypatch.setattr(config, "API_BACKOFF_BASE_SECONDS", 0)
+    monkeypatch.setattr(config, "API_MAX_RETRIES", 3)
+
+
+def failing(*errors: Exception) -> types.SimpleNamespace:
+    """Return a callable raising ``errors`` in turn, then returning "ok"."""
+    calls = types.SimpleNamespace(count=0)
+
+    def call() -> str:
+        calls.count += 1
+        if calls.count <= len(errors):
+            raise errors[calls.count - 1]
+        return "ok"
+
+    calls.func = call
+    return calls
+
+
+def test_bucket_allows_a_burst_then_spaces_calls(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A full bucket serves ``capacity`` tokens at once, then one per 1/rate."""
+    now = [100.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    bucket = TokenBucket(rate=2, capacity=2)
+
+    assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+    now[0] += 1.5
+    assert bucket.reserve() == 0.0
+
+
+def test_zero_rate_never_waits() -> None:
+    """A rate of 0 disables limiting."""
+    bucket = TokenBucket(rate=0)
+
+    assert [bucket.reserve(1000) for _ in range(3)] == [0.0, 0.0, 0.0]
+
+
+def test_transient_errors_are_retried() -> None:
+    """Throttling and server errors are retried until the call succeeds."""
+    calls = failing(HttpError(429), HttpError(503), HttpError(403, "rateLimitExceeded"))
+
+    assert retry_with_backoff(calls.func) == "ok"
+    assert calls.count == 4
+
+
+def test_persistent_throttling_raises_throttled_error() -> None:
+    """Throttling that outlasts every retry surfaces as ThrottledError."""
+    calls = failing(*[HttpError(429)] * 10)
+
+    with pytest.raises(ThrottledError):
+        retry_with_backoff(calls.func)
+    assert calls.count == 4
+
+
+def test_quota_exhaustion_is_not_retried() -> None:
+    """An exhausted quota fails at once as QuotaExceededError."""
+    calls = failing(HttpError(403, "quotaExceeded"))
+
+    with pytest.raises(QuotaExceededError):
+        retry_with_backoff(calls.func)
+    assert calls.count == 1
+
+
+def test_other_errors_propagate_unchanged() -> None:
+    """Errors that are not worth retrying are raised as they are."""
+    error = HttpError(404)
+    calls = failing(error)
+
+    with pytest.raises(HttpError) as raised:
+        retry_with_backoff(calls.func)
+    assert raised.value is error
+    assert calls.count == 1
+
+
+def test_quota_is_shared_through_the_file(tmp_path: Path) -> None:
+    """Trackers on the same file share today's usage and enforce the limit."""
+    path = tmp_path / "quota.json"
+    QuotaTracker(path, daily_limit=10).charge(6)
+    tracker = QuotaTracker(path, daily_limit=10)
+
+    assert tracker.remaining() == 4
+    with pytest.raises(QuotaExceededError):
+        tracker.charge(5)
+    tracker.charge(4)
+    assert tracker.remaining() == 0
+
+
+def test_quota_resets_on_a_new_day(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Usage recorded on an earlier day does not count against today."""
+    tracker = QuotaTracker(tmp_path / "quota.json", daily_limit=10)
+    monkeypatch.setattr(QuotaTracker, "_today", staticmethod(lambda: "2024-01-01"))
+    tracker.charge(10)
+    monkeypatch.setattr(QuotaTracker, "_today", staticmethod(lambda: "2024-01-02"))
+
+    assert tracker.remaining() == 10
+    tracker.charge(10)
+
+
+class RecordingLimits:
+    """Stands in for the shared limiters and quota, counting what each is charged."""
+
+    def __init__(self) -> None:
+        """Start with nothing charged."""
+        self.acquired = []
+        self.charged = []
+
+    def acquire(self, tokens: float = 1) -> None:
+        """Record a rate-limiter acquisition."""
+        self.acquired.append(tokens)
+
+    async def acquire_async(self, tokens: float = 1) -> None:
+        """Record a rate-limiter acquisition."""
+        self.acquired.append(tokens)
+
+    def charge(self, units: int) -> None:
+        """Record a quota charge."""
+        self.charged.append(units)
+
+
+@pytest.fixture
+def limits(monkeypatch: pytest.MonkeyPatch) -> RecordingLimits:
+    """Route every limiter and the quota tracker through a RecordingLimits."""
+    recorder = RecordingLimits()
+    for name in (
+        "get_youtube_quota",
+        "get_youtube_limiter",
+        "get_gemini_request_limiter",
+        "get_gemini_token_limiter",
+    ):
+        monkeypatch.setattr(clients, name, lambda: recorder)
+    return recorder
+
+
+def test_every_youtube_attempt_is_charged(limits: RecordingLimits) -> None:
+    """Retries are rate limited and count against the quota like the first try."""
+    calls = failing(HttpError(503), HttpError(429))
+    request = types.SimpleNamespace(execute=calls.func)
+
+    assert clients.execute_youtube_request(request, units=50) == "ok"
+    assert limits.charged == [50, 50, 50]
+    assert len(limits.acquired) == 3
+
+
+class FlakyModel:
+    """A Gemini model that is throttled once before answering."""
+
+    model_name = "models/fake"
+
+    def __init__(self) -> None:
+        """Start with the throttled call still to come."""
+        self.calls = failing(HttpError(429))
+
+    def generate_content(self, _prompt: str, **_kwargs: object) -> str:
+        """Answer synchronously."""
+        return self.calls.func()
+
+    async def generate_content_async(self, _prompt: str, **_kwargs: object) -> str:
+        """Answer asynchronously."""
+        return self.calls.func()
+
+
+def test_every_gemini_attempt_waits_for_capacity(limits: RecordingLimits) -> None:
+    """Both the request and the token limiter are charged per attempt."""
+    model = clients.RateLimitedModel(FlakyModel())
+    prompt = "x" * 400
+
+    assert model.generate_content(prompt) == "ok"
+    assert limits.acquired == [1, clients.estimate_tokens(prompt)] * 2
+
+
+def test_every_async_gemini_attempt_waits_for_capacity(
+    limits: RecordingLimits,
+) -> None:
+    """The asyncio client charges every attempt the same way."""
+    model = clients.RateLimitedModel(FlakyModel())
+    prompt = "x" * 400
+
+    assert asyncio.run(model.generate_content_async(prompt)) == "ok"
+    assert limits.acquired == [1, clients.estimate_tokens(prompt)] * 2
@@ -0,0 +1,118 @@
+"""Tests for the HTTP service in server.py."""
+
+import http.client
+import json
+import threading
+from collections.abc import Iterator
+from concurrent.futures import Future
+
+import pytest
+
+import config
+import server
+
+
+class FakeService:
+    """SummarizerService stand-in that finishes every job at once."""
+
+    def __init__(self) -> None:
+        """Start with no submitted jobs."""
+        self.submitted = []
+
+    def submit(self, video_url: str, **options: object) -> Future:
+        """Record the job and return its (already done) result."""
+        self.submitted.append((video_url, options))
+        future = Future()
+        future.set_result({"video_id": "abc", "summary": "done", "key_points": []})
+        return future
+
+    def stats(self) -> dict:
+        """Return fixed counters."""
+        return {"started": len(self.submitted)}
+
+    def shutdown(self, *, wait: bool = True) -> None:
+        """Nothing to stop."""
+
+
+@pytest.fixture
+def connection() -> Iterator[tuple[http.client.HTTPConnection, FakeService]]:
+    """Serve a FakeService on a free local port."""
+    service = FakeService()
+    httpd = server.create_server("127.0.0.1", 0, service)
+    thread = threading.Thread(
+        target=httpd.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True,
+    )
+    thread.start()
+    conn = http.client.HTTPConnection("127.0.0.1", httpd.server_address[1], timeout=5)
+    yield conn, service
+    conn.close()
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def post(
+    conn: http.client.HTTPConnection, body: bytes, headers: dict,
+) -> tuple[int, dict]:
+    """Send a POST /summarize with exactly the given headers."""
+    conn.putrequest("POST", "/summarize", skip_accept_encoding=True)
+    for name, value in headers.items():
+        conn.putheader(name, value)
+    conn.endheaders(body)
+    response = conn.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def test_server_binds_locally_by_default() -> None:
+    """Without SERVER_HOST the service is only reachable from this machine."""
+    assert config.SERVER_HOST == "127.0.0.1"
+
+
+def test_post_summarizes(connection: tuple) -> None:
+    """A JSON body with a URL submits a job and returns its result."""
+    conn, service = connection
+    body = json.dumps({"url": "https://youtu.be/abc", "combined": True}).encode()
+
+    status, payload = post(conn, body, {"Content-Length": str(len(body))})
+
+    assert status == 200
+    assert payload["summary"] == "done"
+    assert service.submitted == [
+        (
+            "https://youtu.be/abc",
+            {"method": "api", "force_download": False, "combined": True},
+        ),
+    ]
+
+
+def test_missing_content_length_is_rejected(connection: tuple) -> None:
+    """A POST without Content-Length gets 411 and submits nothing."""
+    conn, service = connection
+
+    status, _ = post(conn, b"", {})
+
+    assert status == 411
+    assert service.submitted == []
+
+
+@pytest.mark.parametrize("length", ["ten", "-5", ""])
+def test_invalid_content_length_is_rejected(connection: tuple, length: str) -> None:
+    """A non-integer or negative Content-Length gets 400."""
+    conn, service = connection
+
+    status, payload = post(conn, b"", {"Content-Length": length})
+
+    assert status == 400
+    assert payload == {"error": "Invalid Content-Length"}
+    assert service.submitted == []
+
+
+def test_oversized_body_is_rejected(connection: tuple) -> None:
+    """A body over MAX_BODY_BYTES gets 413 without being read or submitted."""
+    conn, service = connection
+    length = server.MAX_BODY_BYTES + 1
+
+    status, payload = post(conn, b"{}", {"Content-Length": str(length)})
+
+    assert status == 413
+    assert payload == {"error": f"Request body over {server.MAX_BODY_BYTES} bytes"}
+    assert service.submitted == []
@@ -0,0 +1,76 @@
+"""Tests for utils.subtitle_utils."""
+
+import io
+from collections.abc import Iterator
+
+from utils.subtitle_utils import iter_subtitle_segments
+
+SRT = """﻿1
+00:00:01,000 --> 00:00:03,500
+Hello there
+and welcome
+
+2
+00:00:04,000 --> 00:00:06,000
+Second cue
+"""
+
+VTT = """WEBVTT
+
+NOTE this block is not a cue
+
+00:00:01.000 --> 00:00:02.000 align:start position:10%
+First cue
+
+00:00:02.500 --> 00:00:04.000
+Second cue
+"""
+
+
+def test_srt_cues_become_segments() -> None:
+    """Cue numbers are skipped and multi-line text is joined with spaces."""
+    segments = list(iter_subtitle_segments(io.StringIO(SRT)))
+
+    assert segments == [
+        {"start": 1.0, "end": 3.5, "text": "Hello there and welcome"},
+        {"start": 4.0, "end": 6.0, "text": "Second cue"},
+    ]
+
+
+def test_vtt_header_notes_and_cue_settings_are_skipped() -> None:
+    """Only the cues of a WebVTT file are yielded, without their settings."""
+    segments = list(iter_subtitle_segments(io.StringIO(VTT)))
+
+    assert segments == [
+        {"start": 1.0, "end": 2.0, "text": "First cue"},
+        {"start": 2.5, "end": 4.0, "text": "Second cue"},
+    ]
+
+
+def test_cues_without_blank_lines_between_them() -> None:
+    """A new timing line ends the previous cue even without a blank line."""
+    lines = [
+        "00:00:01,000 --> 00:00:02,000",
+        "one",
+        "00:00:02,000 --> 00:00:03,000",
+        "two",
+    ]
+
+    segments = list(iter_subtitle_segments(lines))
+
+    assert [segment["text"] for segment in segments] == ["one", "two"]
+
+
+def test_segments_are_yielded_while_reading() -> None:
+    """The first cue is available before the rest of the input is read."""
+    read = []
+
+    def lines() -> Iterator[str]:
+        for line in SRT.splitlines():
+            read.append(line)
+            yield line
+
+    segments = iter_subtitle_segments(lines())
+
+    assert next(segments)["text"] == "Hello there and welcome"
+    assert len(read) < len(SRT.splitlines())
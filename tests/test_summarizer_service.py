@@ -0,0 +1,113 @@
+"""Tests for processors.summarizer_service."""
+
+import threading
+from collections.abc import Iterator
+from typing import ClassVar
+
+import pytest
+
+from processors import summarizer_service
+from processors.summarizer_service import ServiceBusyError, SummarizerService
+
+URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+
+
+class BlockingProcessor:
+    """VideoProcessor stand-in that runs until ``release`` is set."""
+
+    runs: ClassVar[list] = []
+    release: ClassVar[threading.Event] = threading.Event()
+
+    def __init__(self, video_url: str, **_options: object) -> None:
+        """Remember the video."""
+        self.video_id = video_url.rsplit("/", 1)[-1].rsplit("=", 1)[-1]
+        self.timestamps = ["00:00 - Intro"]
+
+    def process(self, **options: object) -> str:
+        """Record the run, then wait to be released."""
+        self.runs.append((self.video_id, options))
+        if not self.release.wait(timeout=5):
+            msg = "never released"
+            raise TimeoutError(msg)
+        if self.video_id.startswith("failing"):
+            msg = "pipeline failed"
+            raise RuntimeError(msg)
+        return f"summary of {self.video_id}"
+
+
+@pytest.fixture
+def service(monkeypatch: pytest.MonkeyPatch) -> Iterator[SummarizerService]:
+    """Return a service whose pipelines block until released."""
+    monkeypatch.setattr(BlockingProcessor, "runs", [])
+    monkeypatch.setattr(BlockingProcessor, "release", threading.Event())
+    monkeypatch.setattr(summarizer_service, "VideoProcessor", BlockingProcessor)
+    service = SummarizerService(workers=4, max_pending=2)
+    yield service
+    BlockingProcessor.release.set()
+    service.shutdown()
+
+
+def test_concurrent_requests_share_one_run(service: SummarizerService) -> None:
+    """Requests for a video already in flight join its run and get its result."""
+    futures = [service.submit(URL) for _ in range(5)]
+    BlockingProcessor.release.set()
+
+    results = [future.result(timeout=5) for future in futures]
+
+    assert len({id(future) for future in futures}) == 1
+    assert results[0] == {
+        "video_id": "dQw4w9WgXcQ",
+        "summary": "summary of dQw4w9WgXcQ",
+        "key_points": ["00:00 - Intro"],
+    }
+    assert len(BlockingProcessor.runs) == 1
+    assert service.stats()["coalesced"] == 4
+
+
+def test_different_options_run_separately(service: SummarizerService) -> None:
+    """The same video with other options is a different job."""
+    first = service.submit(URL)
+    second = service.submit(URL, combined=True)
+    BlockingProcessor.release.set()
+
+    first.result(timeout=5)
+    second.result(timeout=5)
+
+    assert first is not second
+    assert sorted(options["combined"] for _, options in BlockingProcessor.runs) == [
+        False,
+        True,
+    ]
+
+
+def test_finished_jobs_are_forgotten(service: SummarizerService) -> None:
+    """A request after a run has finished starts a fresh run."""
+    BlockingProcessor.release.set()
+    service.submit(URL).result(timeout=5)
+
+    service.submit(URL).result(timeout=5)
+
+    assert len(BlockingProcessor.runs) == 2
+    assert service.stats()["in_flight"] == 0
+
+
+def test_failures_fan_out_to_every_waiter(service: SummarizerService) -> None:
+    """Every request joined to a failing run sees its error."""
+    futures = [service.submit("https://youtu.be/failing0000") for _ in range(3)]
+    BlockingProcessor.release.set()
+
+    for future in futures:
+        with pytest.raises(RuntimeError, match="pipeline failed"):
+            future.result(timeout=5)
+    assert service.stats()["failed"] == 1
+
+
+def test_full_queue_rejects_new_videos(service: SummarizerService) -> None:
+    """Past max_pending distinct jobs, new videos are turned away."""
+    service.submit("https://youtu.be/video000001")
+    service.submit("https://youtu.be/video000002")
+
+    with pytest.raises(ServiceBusyError):
+        service.submit("https://youtu.be/video000003")
+    # Joining a job already in flight is still allowed
+    service.submit("https://youtu.be/video000001")
@@ -0,0 +1,36 @@
+"""Tests for processors.summary_generator."""
+
+import types
+
+import pytest
+
+from processors import summary_generator
+from processors.summary_generator import SummaryGenerator
+
+
+class FakeModel:
+    """Streams a canned response in the given pieces."""
+
+    def __init__(self, pieces: list[str]) -> None:
+        """Remember the pieces to stream."""
+        self.pieces = pieces
+
+    def generate_content(
+        self, _prompt: str, **_options: object,
+    ) -> list[types.SimpleNamespace]:
+        """Return the response chunks; empty pieces have no parts."""
+        return [
+            types.SimpleNamespace(parts=[piece] if piece else [], text=piece)
+            for piece in self.pieces
+        ]
+
+
+def test_stream_yields_text_pieces_in_order(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Summary text arrives piece by piece, skipping chunks without parts."""
+    model = FakeModel(["A short ", "", "video."])
+    monkeypatch.setattr(summary_generator, "get_gemini_model", lambda _name: model)
+    transcript = [{"text": "hello", "start_time": 5.0, "end_time": 6.0}]
+
+    pieces = list(SummaryGenerator().generate_stream(transcript, ["00:05 - Intro"]))
+
+    assert pieces == ["A short ", "video."]
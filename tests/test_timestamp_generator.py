@@ -0,0 +1,54 @@
+"""Tests for processors.timestamp_generator."""
+
+import types
+
+import pytest
+
+from processors import timestamp_generator
+from processors.timestamp_generator import TimestampGenerator
+
+
+def chunk(text: str) -> types.SimpleNamespace:
+    """Return a streamed response chunk; empty text means no parts."""
+    return types.SimpleNamespace(parts=[text] if text else [], text=text)
+
+
+class FakeModel:
+    """Streams a canned response in the given pieces."""
+
+    def __init__(self, pieces: list[str]) -> None:
+        """Remember the pieces to stream."""
+        self.pieces = pieces
+
+    def generate_content(
+        self, _prompt: str, **_options: object,
+    ) -> list[types.SimpleNamespace]:
+        """Return the response chunks."""
+        return [chunk(piece) for piece in self.pieces]
+
+
+@pytest.fixture
+def make_generator(monkeypatch: pytest.MonkeyPatch) -> object:
+    """Build TimestampGenerators whose model streams the given pieces."""
+
+    def make(pieces: list[str]) -> TimestampGenerator:
+        model = FakeModel(pieces)
+        monkeypatch.setattr(
+            timestamp_generator, "get_gemini_model", lambda _name: model,
+        )
+        return TimestampGenerator()
+
+    return make
+
+
+def test_stream_yields_each_key_point_once_complete(make_generator: object) -> None:
+    """Key points split across chunks are joined; empty chunks are skipped."""
+    generator = make_generator(
+        ["00:05 - Intro", "", ": Says hello.\n01:", "10 - Main idea: Explains it."],
+    )
+    transcript = [{"text": "hello", "start_time": 5.0, "end_time": 6.0}]
+
+    assert list(generator.generate_stream(transcript)) == [
+        "00:05 - Intro: Says hello.",
+        "01:10 - Main idea: Explains it.",
+    ]
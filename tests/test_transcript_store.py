@@ -0,0 +1,95 @@
+"""Tests for utils.transcript_store."""
+
+from pathlib import Path
+
+import pytest
+
+from utils.file_utils import load_json, save_json
+from utils.transcript_store import (
+    convert_json_transcripts,
+    load_any_transcript,
+    load_transcript,
+    save_transcript,
+)
+
+SEGMENTS = [
+    {"start_time": 0.0, "end_time": 1.5, "text": "first"},
+    {"start_time": 1.5, "end_time": 4.0, "text": "sécond"},
+]
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_binary_round_trip(tmp_path: Path, *, compress: bool) -> None:
+    """Plain and zlib-compressed files load back to the same segments."""
+    path = str(tmp_path / "t.bin")
+
+    save_transcript(SEGMENTS, path, compress=compress)
+
+    assert load_transcript(path) == SEGMENTS
+
+
+def test_foreign_files_are_rejected(tmp_path: Path) -> None:
+    """Files without the transcript header raise ValueError."""
+    path = tmp_path / "t.bin"
+    path.write_bytes(b"not a transcript file")
+
+    with pytest.raises(ValueError, match="Unsupported transcript file"):
+        load_transcript(str(path))
+
+
+def test_binary_is_preferred_over_json(tmp_path: Path) -> None:
+    """load_any_transcript reads .bin first, then .json, else returns None."""
+    base = str(tmp_path / "abc_transcript")
+    assert load_any_transcript(base) is None
+
+    save_json(SEGMENTS[:1], f"{base}.json")
+    assert load_any_transcript(base) == SEGMENTS[:1]
+
+    save_transcript(SEGMENTS, f"{base}.bin")
+    assert load_any_transcript(base) == SEGMENTS
+
+
+def test_json_transcripts_are_migrated(tmp_path: Path) -> None:
+    """Every *_transcript.json gets a binary twin; remove_json drops the JSON."""
+    save_json(SEGMENTS, str(tmp_path / "abc_transcript.json"))
+    save_json({"other": 1}, str(tmp_path / "abc_summary.json"))
+
+    count = convert_json_transcripts(str(tmp_path), remove_json=True)
+
+    assert count == 1
+    assert load_transcript(str(tmp_path / "abc_transcript.bin")) == SEGMENTS
+    assert not (tmp_path / "abc_transcript.json").exists()
+    assert load_json(str(tmp_path / "abc_summary.json")) == {"other": 1}
+
+
+@pytest.mark.parametrize(
+    "content",
+    [b"", b"XXXX" + bytes(60), b"YTTS\x01\x00\x00\x00" + bytes(8) + b"YTTR"],
+    ids=["empty", "wrong-magic", "truncated"],
+)
+def test_unreadable_binary_files_are_discarded(
+    tmp_path: Path, content: bytes,
+) -> None:
+    """A bad .bin is deleted and the JSON transcript, if any, is used instead."""
+    base = str(tmp_path / "abc_transcript")
+    Path(f"{base}.bin").write_bytes(content)
+
+    with pytest.raises(ValueError, match="transcript"):
+        load_transcript(f"{base}.bin")
+    assert load_any_transcript(base) is None
+    assert not Path(f"{base}.bin").exists()
+
+    Path(f"{base}.bin").write_bytes(content)
+    save_json(SEGMENTS, f"{base}.json")
+    assert load_any_transcript(base) == SEGMENTS
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_cut_off_files_are_rejected(tmp_path: Path, *, compress: bool) -> None:
+    """A file cut short mid-write raises ValueError rather than loading."""
+    path = tmp_path / "t.bin"
+    save_transcript(SEGMENTS, str(path), compress=compress)
+    path.write_bytes(path.read_bytes()[:-3])
+
+    with pytest.raises(ValueError, match="transcript"):
+        load_transcript(str(path))
@@ -0,0 +1,248 @@
+"""Tests for utils.transcript_utils."""
+
+import pytest
+
+from utils.transcript_utils import (
+    Transcript,
+    compress_transcript,
+    compression_ratio,
+    estimate_tokens,
+    format_transcript_text,
+    split_content_defined_windows,
+    split_transcript_windows,
+)
+
+
+def make_segments(count: int, text: str = "word " * 20) -> list:
+    """Return ``count`` consecutive five-second segments."""
+    return [
+        {"text": text, "start_time": index * 5.0, "end_time": index * 5.0 + 5}
+        for index in range(count)
+    ]
+
+
+def format_segment(segment: dict) -> str:
+    """Format a segment the way the prompt builders do."""
+    return segment["text"] + " "
+
+
+def test_windows_cover_the_transcript_within_budget() -> None:
+    """Windows are consecutive, lose nothing and stay under the token budget."""
+    transcript = make_segments(50)
+
+    windows = split_transcript_windows(transcript, 100, format_segment)
+
+    assert len(windows) > 1
+    assert [segment for window in windows for segment in window] == transcript
+    for window in windows:
+        tokens = sum(estimate_tokens(format_segment(s)) for s in window)
+        assert tokens <= 100
+
+
+def test_oversized_segment_gets_its_own_window() -> None:
+    """A segment larger than the budget is kept whole rather than dropped."""
+    transcript = make_segments(3, text="word " * 200)
+
+    windows = split_transcript_windows(transcript, 100, format_segment)
+
+    assert [len(window) for window in windows] == [1, 1, 1]
+
+
+def test_transcript_behaves_like_its_segment_list() -> None:
+    """Indexing, iteration and equality match the list of dicts it was built from."""
+    segments = make_segments(4, text="héllo wörld")
+
+    transcript = Transcript.from_segments(segments)
+
+    assert len(transcript) == 4
+    assert transcript == segments
+    assert transcript[-1] == segments[-1]
+    assert transcript.text(2) == "héllo wörld"
+    assert transcript.to_list() == segments
+
+
+def test_slices_are_views_over_the_same_segments() -> None:
+    """Slicing and slice_time keep the segment data and compose."""
+    transcript = Transcript.from_segments(make_segments(10))
+
+    view = transcript[2:8]
+
+    assert isinstance(view, Transcript)
+    assert view == make_segments(10)[2:8]
+    assert view[1:3] == make_segments(10)[3:5]
+    assert transcript.slice_time(10.0, 25.0) == make_segments(10)[2:5]
+    assert view.slice_time(0.0, 15.0) == make_segments(10)[2:3]
+
+
+def test_segment_at_finds_the_segment_playing() -> None:
+    """segment_at returns the segment covering a time, or None in a gap."""
+    segments = [
+        {"start_time": 0.0, "end_time": 2.0, "text": "a"},
+        {"start_time": 5.0, "end_time": 7.0, "text": "b"},
+    ]
+    transcript = Transcript.from_segments(segments)
+
+    assert transcript.segment_at(1.0) == 0
+    assert transcript.segment_at(5.0) == 1
+    assert transcript.segment_at(3.0) is None
+    assert transcript.segment_at(-1.0) is None
+    assert transcript[1:].segment_at(6.0) == 0
+
+
+def test_bytes_round_trip_keeps_views_and_text() -> None:
+    """A serialized view loads back to the same segments, also from a memoryview."""
+    transcript = Transcript.from_segments(make_segments(6, text="ünïcode"))
+    view = transcript[1:4]
+
+    data = view.to_bytes()
+
+    assert Transcript.from_bytes(data) == view
+    assert Transcript.from_bytes(memoryview(data)) == view
+
+
+def test_foreign_bytes_are_rejected() -> None:
+    """Data without the transcript header raises ValueError."""
+    with pytest.raises(ValueError, match="Unsupported transcript data"):
+        Transcript.from_bytes(bytes(32))
+
+
+def test_formatting_without_budget_keeps_every_segment() -> None:
+    """With no budget the whole transcript is formatted in order."""
+    transcript = make_segments(3, text="abc")
+
+    assert format_transcript_text(transcript, format_segment) == "abc abc abc "
+
+
+def test_formatting_stops_at_the_budget() -> None:
+    """The result is cut at max_chars and later segments are never formatted."""
+    formatted = []
+
+    def record(segment: dict) -> str:
+        formatted.append(segment)
+        return format_segment(segment)
+
+    text = format_transcript_text(make_segments(100, text="abc"), record, 10)
+
+    assert text == "abc abc ab"
+    assert len(formatted) == 3
+
+
+def numbered_segments(count: int) -> list:
+    """Return ``count`` segments with distinct texts, so boundaries vary."""
+    return [
+        {
+            "text": f"sentence number {index} " * 4,
+            "start_time": index * 5.0,
+            "end_time": index * 5.0 + 5,
+        }
+        for index in range(count)
+    ]
+
+
+def test_content_defined_windows_cover_the_transcript() -> None:
+    """Windows are consecutive, lose nothing and stay under the token budget."""
+    transcript = numbered_segments(300)
+
+    windows = split_content_defined_windows(transcript, 200, format_segment)
+
+    assert len(windows) > 1
+    assert [segment for window in windows for segment in window] == transcript
+    for window in windows:
+        tokens = sum(estimate_tokens(format_segment(s)) for s in window)
+        assert tokens <= 200
+
+
+def test_an_edit_only_changes_the_windows_around_it() -> None:
+    """Windows away from an edited segment come out identical."""
+    transcript = numbered_segments(300)
+    edited = [dict(segment) for segment in transcript]
+    edited[150]["text"] = "something else was said here"
+
+    before = split_content_defined_windows(transcript, 200, format_segment)
+    after = split_content_defined_windows(edited, 200, format_segment)
+
+    # Windows before the edit are untouched, and boundaries resynchronize
+    # within a few windows after it
+    unchanged_prefix = [w for w in before if w[-1]["start_time"] < 150 * 5.0]
+    assert after[: len(unchanged_prefix)] == unchanged_prefix
+    assert after[-10:] == before[-10:]
+    changed = [window for window in after if window not in before]
+    assert len(changed) < len(after) // 4
+
+
+def cues(*texts: str) -> list:
+    """Return consecutive two-second caption cues with the given texts."""
+    return [
+        {"text": text, "start_time": index * 2.0, "end_time": index * 2.0 + 2}
+        for index, text in enumerate(texts)
+    ]
+
+
+def test_rolling_cues_are_merged_into_sentences() -> None:
+    """Overlapping cue text and tags are dropped; start times are kept."""
+    transcript = cues(
+        "[Music]",
+        "welcome back to the channel",
+        "welcome back to the channel today we",
+        "today we look at transcripts.",
+        "(applause) next we",
+    )
+
+    compressed = compress_transcript(transcript)
+
+    assert compressed.to_list() == [
+        {
+            "text": "welcome back to the channel today we look at transcripts.",
+            "start_time": 2.0,
+            "end_time": 8.0,
+        },
+        {"text": "next we", "start_time": 8.0, "end_time": 10.0},
+    ]
+    assert compression_ratio(transcript, compressed) < 1
+
+
+def test_copies_of_the_previous_cue_are_dropped() -> None:
+    """Cues that repeat the previous cue, or its end, add nothing."""
+    transcript = cues(
+        "so this is the first point",
+        "so this is the first point",
+        "the first point",
+        "and here is another one",
+    )
+
+    compressed = compress_transcript(transcript)
+
+    assert [segment["text"] for segment in compressed] == [
+        "so this is the first point and here is another one",
+    ]
+
+
+def test_short_cues_inside_the_previous_cue_are_kept() -> None:
+    """A short reply that also occurs inside the previous cue is new speech."""
+    transcript = cues("did you say no to that", "no", "okay", "you know", "you know")
+
+    compressed = compress_transcript(transcript)
+
+    # "no" is kept; a second "you know" right after the first is a rolling copy
+    assert [segment["text"] for segment in compressed] == [
+        "did you say no to that no okay you know",
+    ]
+
+
+def test_phrases_repeated_back_to_back_are_collapsed() -> None:
+    """Stutters like "you know you know" within a cue are collapsed."""
+    compressed = compress_transcript(cues("it is you know you know fine."))
+
+    assert compressed.text(0) == "it is you know fine."
+
+
+def test_long_pauses_start_a_new_segment() -> None:
+    """Cues separated by more than max_gap_seconds are not merged."""
+    transcript = [
+        {"text": "before the break", "start_time": 0.0, "end_time": 2.0},
+        {"text": "after the break", "start_time": 30.0, "end_time": 32.0},
+    ]
+
+    compressed = compress_transcript(transcript)
+
+    assert [segment["start_time"] for segment in compressed] == [0.0, 30.0]
@@ -0,0 +1,157 @@
+"""Tests for processors.video_processor."""
+
+import asyncio
+
+import pytest
+
+import config
+from processors.async_video_processor import AsyncVideoProcessor
+from processors.video_processor import VideoProcessor
+from utils.rate_limit import QuotaExceededError, ThrottledError
+
+
+class LimitedApiTranscriber:
+    """A caption source whose calls fail with an API limit error."""
+
+    languages = ("en",)
+    kinds = ("standard",)
+
+    def __init__(self, error: Exception) -> None:
+        """Remember the error to raise."""
+        self.error = error
+
+    def get_transcript(self, _video_url: str) -> list:
+        """Fail the way the rate-limited YouTube client does."""
+        raise self.error
+
+    def list_captions(self, _video_id: str) -> list:
+        """Fail the way the rate-limited YouTube client does."""
+        raise self.error
+
+
+class RecordingWhisper:
+    """Records whether a Whisper transcription was attempted."""
+
+    def __init__(self) -> None:
+        """Start with no calls."""
+        self.calls = 0
+
+    def get_transcript(self, _video_url: str) -> list:
+        """Record the call and return a one-segment transcript."""
+        self.calls += 1
+        return [{"text": "hello", "start_time": 0.0, "end_time": 1.0}]
+
+
+LIMIT_ERRORS = [
+    pytest.param(QuotaExceededError("quota"), id="quota"),
+    pytest.param(ThrottledError("throttled"), id="throttled"),
+]
+
+
+@pytest.mark.parametrize("error", LIMIT_ERRORS)
+def test_api_limits_do_not_fall_back_to_whisper(error: Exception) -> None:
+    """Quota exhaustion or throttling is raised instead of running Whisper."""
+    processor = VideoProcessor("https://youtu.be/abc")
+    processor.api_transcriber = LimitedApiTranscriber(error)
+    processor.whisper_transcriber = whisper = RecordingWhisper()
+
+    with pytest.raises(type(error)):
+        processor.process()
+    assert whisper.calls == 0
+
+
+@pytest.mark.parametrize("error", LIMIT_ERRORS)
+def test_async_api_limits_do_not_fall_back_to_whisper(error: Exception) -> None:
+    """The asyncio pipeline surfaces API limits the same way."""
+    processor = AsyncVideoProcessor("https://youtu.be/abc")
+    processor.api_transcriber = LimitedApiTranscriber(error)
+    processor.whisper_transcriber = whisper = RecordingWhisper()
+
+    with pytest.raises(type(error)):
+        asyncio.run(processor.process())
+    assert whisper.calls == 0
+
+
+def test_other_api_failures_fall_back_to_whisper() -> None:
+    """An ordinary API failure still falls back to Whisper."""
+    processor = VideoProcessor("https://youtu.be/abc")
+    processor.api_transcriber = LimitedApiTranscriber(RuntimeError("boom"))
+    processor.whisper_transcriber = whisper = RecordingWhisper()
+
+    processor._get_transcript("api", force_download=False)  # noqa: SLF001
+
+    assert whisper.calls == 1
+    assert processor.transcript[0]["text"] == "hello"
+
+
+def test_combined_check_measures_the_formatted_prompt(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Timestamps count toward the combined prompt's length limit."""
+    monkeypatch.setattr(config, "HIERARCHICAL_SUMMARIES", True)
+    processor = VideoProcessor("https://youtu.be/abc")
+    # 11,000 characters of text, but about 19,000 once formatted
+    processor.transcript = [
+        {"text": "ten chars!", "start_time": float(i), "end_time": i + 1.0}
+        for i in range(1000)
+    ]
+    assert not processor._fits_combined_prompt()  # noqa: SLF001
+
+    processor.transcript = processor.transcript[:500]
+    assert processor._fits_combined_prompt()  # noqa: SLF001
+
+
+class FakeGemini:
+    """Stands in for every generator; the combined call gets a bad response."""
+
+    def __init__(self, *, combined: bool) -> None:
+        """Choose whether this fake is the combined generator."""
+        self.combined = combined
+
+    def generate(self, _transcript: list) -> list:
+        """Return one key point, or fail for the combined generator."""
+        if self.combined:
+            msg = "Gemini returned unexpected JSON for combined generation"
+            raise ValueError(msg)
+        return ["00:00 - Hello: Says hello."]
+
+    async def generate_async(self, transcript: list) -> list:
+        """Asynchronous generate."""
+        return self.generate(transcript)
+
+    def generate_text(self, _transcript: list, _timestamps: list) -> str:
+        """Return the summary text."""
+        return "A greeting."
+
+    async def generate_text_async(self, transcript: list, timestamps: list) -> str:
+        """Asynchronous generate_text."""
+        return self.generate_text(transcript, timestamps)
+
+
+def bad_combined_processor(cls: type) -> VideoProcessor:
+    """Build a processor whose combined call gets a malformed response."""
+    processor = cls("https://youtu.be/abc")
+    processor.whisper_transcriber = RecordingWhisper()
+    processor.combined_generator = FakeGemini(combined=True)
+    processor.timestamp_generator = FakeGemini(combined=False)
+    processor.summary_generator = FakeGemini(combined=False)
+    return processor
+
+
+def test_bad_combined_response_falls_back_to_separate_calls() -> None:
+    """A malformed combined response is retried as two separate calls."""
+    processor = bad_combined_processor(VideoProcessor)
+
+    summary = processor.process(method="download", combined=True)
+
+    assert "A greeting." in summary
+    assert processor.timestamps == ["00:00 - Hello: Says hello."]
+
+
+def test_async_bad_combined_response_falls_back_to_separate_calls() -> None:
+    """The asyncio pipeline falls back the same way."""
+    processor = bad_combined_processor(AsyncVideoProcessor)
+
+    summary = asyncio.run(processor.process(method="download", combined=True))
+
+    assert "A greeting." in summary
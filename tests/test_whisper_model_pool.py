@@ -0,0 +1,136 @@
+"""Tests for transcribers.whisper_model_pool."""
+
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+from transcribers.whisper_model_pool import WhisperModelPool
+
+MB = 1024 * 1024
+
+
+class FakeParameter:
+    """A tensor-like parameter of a given size in bytes."""
+
+    def __init__(self, size_bytes: int) -> None:
+        """Remember the size."""
+        self.size_bytes = size_bytes
+
+    def numel(self) -> int:
+        """Return the number of elements (one byte each)."""
+        return self.size_bytes
+
+    @staticmethod
+    def element_size() -> int:
+        """Return the size of one element in bytes."""
+        return 1
+
+
+class FakeModel:
+    """A Whisper model whose parameters total ``size_mb`` megabytes."""
+
+    def __init__(self, name: str, size_mb: int) -> None:
+        """Remember the model name and size."""
+        self.name = name
+        self.size_mb = size_mb
+
+    def parameters(self) -> list[FakeParameter]:
+        """Return the model's parameters."""
+        return [FakeParameter(self.size_mb * MB)]
+
+
+@pytest.fixture
+def loads(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Install a fake whisper module and record every model it loads."""
+    loaded = []
+
+    def load_model(name: str) -> FakeModel:
+        loaded.append(name)
+        time.sleep(0.01)
+        return FakeModel(name, size_mb=10)
+
+    monkeypatch.setitem(
+        sys.modules, "whisper", types.SimpleNamespace(load_model=load_model),
+    )
+    return loaded
+
+
+def test_model_is_loaded_once_across_threads(loads: list[str]) -> None:
+    """Concurrent borrowers of the same model share a single load."""
+    pool = WhisperModelPool(memory_budget_mb=0, idle_seconds=0)
+    borrowed = []
+
+    def borrow() -> None:
+        with pool.model("base") as model:
+            borrowed.append(model)
+
+    threads = [threading.Thread(target=borrow) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert loads == ["base"]
+    assert len({id(model) for model in borrowed}) == 1
+    assert pool.loaded_models() == ["base"]
+
+
+def test_idle_models_over_budget_are_evicted(loads: list[str]) -> None:
+    """Least recently used idle models go once the budget is exceeded."""
+    pool = WhisperModelPool(memory_budget_mb=15, idle_seconds=0)
+
+    with pool.model("base"):
+        pass
+    with pool.model("small"):
+        pass
+
+    # Both are idle; dropping the older "base" brings the pool within budget
+    assert pool.loaded_models() == ["small"]
+    assert loads == ["base", "small"]
+
+
+def test_force_evicts_every_idle_model(loads: list[str]) -> None:
+    """evict(force=True) keeps only the models that are borrowed."""
+    pool = WhisperModelPool(memory_budget_mb=0, idle_seconds=0)
+    with pool.model("base"):
+        pass
+
+    with pool.model("small"):
+        pool.evict(force=True)
+        assert pool.loaded_models() == ["small"]
+
+    pool.evict(force=True)
+    assert pool.loaded_models() == []
+    assert loads == ["base", "small"]
+
+
+def test_borrowers_of_one_model_take_turns(loads: list[str]) -> None:
+    """A shared model is never used by two threads at once."""
+    pool = WhisperModelPool(memory_budget_mb=0, idle_seconds=0)
+    lock = threading.Lock()
+    using = {"base": 0, "small": 0}
+    peak = {"base": 0, "small": 0}
+
+    def borrow(name: str) -> None:
+        with pool.model(name):
+            with lock:
+                using[name] += 1
+                peak[name] = max(peak[name], using[name])
+            time.sleep(0.01)
+            with lock:
+                using[name] -= 1
+
+    threads = [
+        threading.Thread(target=borrow, args=(name,))
+        for name in ("base", "small") * 4
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak == {"base": 1, "small": 1}
+    assert sorted(loads) == ["base", "small"]
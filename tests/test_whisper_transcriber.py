@@ -0,0 +1,117 @@
+"""Tests for transcribers.whisper_transcriber."""
+
+import contextlib
+import itertools
+import sys
+import threading
+import time
+import types
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from transcribers import whisper_transcriber
+from transcribers.whisper_transcriber import WhisperTranscriber
+from utils import audio_utils
+from utils.audio_utils import SAMPLE_RATE
+
+
+def tone(seconds: float) -> np.ndarray:
+    """Return a loud sine wave lasting ``seconds``."""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (0.5 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+
+
+def silence(seconds: float) -> np.ndarray:
+    """Return ``seconds`` of digital silence."""
+    return np.zeros(int(seconds * SAMPLE_RATE), dtype=np.float32)
+
+
+class FakeChunkModel:
+    """Whisper stand-in: two segments per chunk, the first chunks finishing last."""
+
+    def __init__(self) -> None:
+        """Start with no chunks transcribed."""
+        self.lock = threading.Lock()
+        self.calls = 0
+
+    def transcribe(self, audio: np.ndarray, **_options: object) -> dict:
+        """Return segments on the chunk's own timeline, named by its length."""
+        with self.lock:
+            self.calls += 1
+            delay = 0.05 / self.calls
+        time.sleep(delay)
+        duration = len(audio) / SAMPLE_RATE
+        return {
+            "segments": [
+                {"start": 0.5, "end": 1.5, "text": f" first of {len(audio)}"},
+                {
+                    "start": duration - 1,
+                    "end": duration,
+                    "text": f" last of {len(audio)}",
+                },
+            ],
+        }
+
+
+@pytest.fixture
+def chunk_model(monkeypatch: pytest.MonkeyPatch) -> Iterator[FakeChunkModel]:
+    """Run chunks on threads against a FakeChunkModel instead of in processes."""
+    model = FakeChunkModel()
+    pool = types.SimpleNamespace(
+        model=contextlib.contextmanager(lambda _name: iter([model])),
+    )
+    executor = ThreadPoolExecutor(max_workers=3)
+    monkeypatch.setitem(sys.modules, "whisper", types.SimpleNamespace())
+    monkeypatch.setattr(whisper_transcriber, "get_model_pool", lambda: pool)
+    monkeypatch.setattr(
+        whisper_transcriber, "_get_chunk_executor", lambda _workers: executor,
+    )
+    yield model
+    executor.shutdown()
+
+
+def test_parallel_chunks_are_merged_on_the_full_timeline(
+    chunk_model: FakeChunkModel, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Chunk segments are shifted by the chunk's offset and kept in order."""
+    audio = np.concatenate(
+        [tone(28), silence(4), tone(28), silence(4), tone(28)],
+    )
+    used_splits = []
+    real_find_silence_splits = audio_utils.find_silence_splits
+
+    def find_silence_splits(audio: np.ndarray, chunk_seconds: float) -> list:
+        splits = real_find_silence_splits(audio, chunk_seconds)
+        used_splits.append(splits)
+        return splits
+
+    monkeypatch.setattr(audio_utils, "find_silence_splits", find_silence_splits)
+
+    segments = WhisperTranscriber(parallel_workers=3)._transcribe_parallel(audio)  # noqa: SLF001
+
+    [splits] = used_splits
+    assert len(splits) == 4
+    # Both cuts fall inside the silent gaps
+    assert 28 <= splits[1] / SAMPLE_RATE <= 32
+    assert 60 <= splits[2] / SAMPLE_RATE <= 64
+    assert chunk_model.calls == 3
+
+    expected = []
+    for start, end in itertools.pairwise(splits):
+        offset = start / SAMPLE_RATE
+        length = end - start
+        duration = length / SAMPLE_RATE
+        expected += [
+            {"start": 0.5 + offset, "end": 1.5 + offset, "text": f" first of {length}"},
+            {
+                "start": duration - 1 + offset,
+                "end": duration + offset,
+                "text": f" last of {length}",
+            },
+        ]
+    assert segments == expected
+    starts = [segment["start"] for segment in segments]
+    assert starts == sorted(starts)
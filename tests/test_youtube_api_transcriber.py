@@ -0,0 +1,183 @@
+"""Tests for transcribers.youtube_api_transcriber."""
+
+import time
+import types
+from pathlib import Path
+
+import pytest
+
+import config
+from transcribers import youtube_api_transcriber
+from transcribers.youtube_api_transcriber import NoCaptionsError, YouTubeAPITranscriber
+from utils.cache import ResultCache
+
+SRT = "1\n00:00:00,000 --> 00:00:02,000\nhello there\n"
+
+
+def track(track_id: str, language: str, kind: str = "standard", **snippet: str) -> dict:
+    """Build a caption track resource as captions().list returns it."""
+    return {
+        "id": track_id,
+        "snippet": {"language": language, "trackKind": kind, **snippet},
+    }
+
+
+@pytest.fixture
+def api(monkeypatch: pytest.MonkeyPatch) -> types.SimpleNamespace:
+    """Fake the YouTube service; records the caption and video requests made."""
+    api = types.SimpleNamespace(tracks=[], lists=[], downloads=[], videos=[])
+
+    def list_captions(part: str, videoId: str) -> object:  # noqa: ARG001, N803
+        api.lists.append(videoId)
+        return lambda: {"items": api.tracks}
+
+    def download(**params: str) -> object:
+        api.downloads.append(params)
+        return SRT.encode
+
+    def list_videos(part: str, id: str) -> object:  # noqa: A002, ARG001
+        api.videos.append(id.split(","))
+        return lambda: {"items": [{"id": video_id} for video_id in id.split(",")]}
+
+    captions = types.SimpleNamespace(list=list_captions, download=download)
+    videos = types.SimpleNamespace(list=list_videos)
+    service = types.SimpleNamespace(captions=lambda: captions, videos=lambda: videos)
+    monkeypatch.setattr(youtube_api_transcriber, "get_youtube_service", lambda: service)
+    monkeypatch.setattr(
+        youtube_api_transcriber,
+        "execute_youtube_request",
+        lambda request, units: request(),  # noqa: ARG005
+    )
+    return api
+
+
+def select(
+    captions: list, languages: list | None = None, kinds: list | None = None,
+) -> dict:
+    """Select a track with the given preferences."""
+    transcriber = YouTubeAPITranscriber(
+        languages=languages or ["en"], kinds=kinds or ["standard", "asr", "translated"],
+    )
+    return transcriber.select_caption(captions, "vid")
+
+
+def test_kind_takes_precedence_over_language() -> None:
+    """A standard track in a later language beats an asr track in the first."""
+    captions = [track("asr-en", "en", "asr"), track("std-de", "de")]
+
+    chosen = select(captions, languages=["en", "de"])
+
+    assert chosen == {
+        "id": "std-de", "language": "de", "kind": "standard", "translate_to": None,
+    }
+
+
+def test_earlier_languages_win_within_a_kind() -> None:
+    """Regional variants match their base language, in preference order."""
+    captions = [track("std-de", "de"), track("std-en", "en-GB")]
+
+    assert select(captions, languages=["en", "de"])["id"] == "std-en"
+
+
+def test_forced_and_unavailable_tracks_are_never_chosen() -> None:
+    """Forced tracks and tracks that are not serving are skipped."""
+    captions = [
+        track("forced-en", "en", "forced"),
+        track("failed-en", "en", status="failed"),
+        track("asr-en", "en", "asr"),
+    ]
+
+    assert select(captions)["id"] == "asr-en"
+
+
+def test_translation_is_the_last_resort() -> None:
+    """Without a track in a preferred language, the best track is translated."""
+    captions = [track("asr-fr", "fr", "asr"), track("std-de", "de")]
+
+    chosen = select(captions, languages=["en"])
+
+    assert chosen == {
+        "id": "std-de", "language": "en", "kind": "translated", "translate_to": "en",
+    }
+
+
+def test_no_matching_track_raises() -> None:
+    """The error names the video and the preferences that were not met."""
+    captions = [track("std-de", "de")]
+
+    with pytest.raises(NoCaptionsError, match=r"vid \(languages \['en'\]"):
+        select(captions, languages=["en"], kinds=["standard", "asr"])
+
+
+def test_caption_list_is_cached_including_empty_lists(
+    api: types.SimpleNamespace, tmp_path: Path,
+) -> None:
+    """A video without captions is only looked up once."""
+    transcriber = YouTubeAPITranscriber(cache=ResultCache(str(tmp_path)))
+
+    assert transcriber.list_captions("vid") == []
+    assert transcriber.list_captions("vid") == []
+    assert api.lists == ["vid"]
+
+
+def test_caption_list_expires(
+    api: types.SimpleNamespace, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Cached caption lists older than the TTL are fetched again."""
+    monkeypatch.setattr(config, "CAPTION_LIST_TTL_SECONDS", 60)
+    transcriber = YouTubeAPITranscriber(cache=ResultCache(str(tmp_path)))
+    transcriber.list_captions("vid")
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+    api.tracks = [track("std-en", "en")]
+
+    assert transcriber.list_captions("vid") == api.tracks
+    assert api.lists == ["vid", "vid"]
+
+
+def test_downloads_are_cached_per_translation(
+    api: types.SimpleNamespace, tmp_path: Path,
+) -> None:
+    """Each track is downloaded once per translation language."""
+    transcriber = YouTubeAPITranscriber(cache=ResultCache(str(tmp_path)))
+
+    first = transcriber.download_caption("std-de", video_id="vid")
+    again = transcriber.download_caption("std-de", video_id="vid")
+    transcriber.download_caption("std-de", translate_to="en", video_id="vid")
+
+    assert again == first
+    assert first[0]["text"] == "hello there"
+    assert api.downloads == [
+        {"id": "std-de", "tfmt": "srt"},
+        {"id": "std-de", "tfmt": "srt", "tlang": "en"},
+    ]
+
+
+def test_get_transcript_downloads_the_selected_track(
+    api: types.SimpleNamespace,
+) -> None:
+    """The whole flow lists, selects and downloads with translation."""
+    api.tracks = [track("asr-fr", "fr", "asr")]
+    transcriber = YouTubeAPITranscriber(languages=["en"])
+
+    transcript = transcriber.get_transcript("https://youtu.be/dQw4w9WgXcQ")
+
+    assert api.lists == ["dQw4w9WgXcQ"]
+    assert api.downloads == [{"id": "asr-fr", "tfmt": "srt", "tlang": "en"}]
+    assert transcript[0]["text"] == "hello there"
+
+
+def test_metadata_is_fetched_in_batches_and_cached(
+    api: types.SimpleNamespace, tmp_path: Path,
+) -> None:
+    """Up to 50 IDs go in one videos().list request; known videos are skipped."""
+    transcriber = YouTubeAPITranscriber(cache=ResultCache(str(tmp_path)))
+    video_ids = [f"v{i}" for i in range(120)]
+
+    metadata = transcriber.get_videos_metadata(video_ids)
+    transcriber.get_videos_metadata(["v0", "new", "v0"])
+
+    assert list(metadata) == video_ids
+    assert [len(batch) for batch in api.videos] == [50, 50, 20, 1]
+    assert api.videos[-1] == ["new"]
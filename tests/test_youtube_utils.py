@@ -0,0 +1,76 @@
+"""Tests for utils.youtube_utils."""
+
+import pytest
+
+from utils.youtube_utils import YouTubeLink, extract_video_id, parse_youtube_url
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+        "https://youtu.be/dQw4w9WgXcQ",
+        "https://m.youtube.com/watch?v=dQw4w9WgXcQ&t=42",
+        "https://www.youtube.com/embed/dQw4w9WgXcQ",
+        "https://www.youtube.com/shorts/dQw4w9WgXcQ/",
+        "https://www.youtube.com/live/dQw4w9WgXcQ?si=abc",
+        "https://www.youtube-nocookie.com/v/dQw4w9WgXcQ",
+    ],
+)
+def test_extract_video_id(url: str) -> None:
+    """Every supported video URL form yields the video ID."""
+    assert extract_video_id(url) == "dQw4w9WgXcQ"
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://example.com/watch?v=dQw4w9WgXcQ",
+        "https://www.youtube.com/watch?list=PLabc",
+        "https://www.youtube.com/embed/",
+        "https://www.youtube.com/about",
+    ],
+)
+def test_extract_video_id_rejects_other_urls(url: str) -> None:
+    """URLs that do not name a video are rejected."""
+    with pytest.raises(ValueError, match="Could not extract video ID"):
+        extract_video_id(url)
+
+
+@pytest.mark.parametrize(
+    ("url", "link"),
+    [
+        (
+            "https://www.youtube.com/watch?v=dQw4w9WgXcQ&list=PLabc",
+            YouTubeLink("video", "dQw4w9WgXcQ"),
+        ),
+        (
+            "https://www.youtube.com/playlist?list=PLabc",
+            YouTubeLink("playlist", "PLabc"),
+        ),
+        ("https://www.youtube.com/@creator/videos", YouTubeLink("handle", "@creator")),
+        (
+            "https://www.youtube.com/channel/UCabc",
+            YouTubeLink("channel", "UCabc"),
+        ),
+        ("https://www.youtube.com/user/legacy", YouTubeLink("user", "legacy")),
+    ],
+)
+def test_parse_youtube_url(url: str, link: YouTubeLink) -> None:
+    """Videos, playlists and the channel URL forms are told apart."""
+    assert parse_youtube_url(url) == link
+    assert link.is_collection == (link.kind != "video")
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://www.youtube.com/playlist",
+        "https://www.youtube.com/channel/",
+        "https://example.com/@creator",
+    ],
+)
+def test_parse_youtube_url_rejects_other_urls(url: str) -> None:
+    """A playlist without its ID or a non-YouTube URL is an error."""
+    with pytest.raises(ValueError, match="Not a YouTube video, playlist or channel"):
+        parse_youtube_url(url)
@@ -0,0 +1 @@
+"""Transcription backends: YouTube captions and local Whisper."""
@@ -0,0 +1,172 @@
+"""Process-wide registry of loaded Whisper models."""
+
+import contextlib
+import logging
+import threading
+import time
+from collections.abc import Iterator
+from typing import TYPE_CHECKING
+
+import config
+from utils.metrics import span
+
+if TYPE_CHECKING:
+    import whisper
+
+logger = logging.getLogger(__name__)
+
+
+class _PooledModel:
+    """A loaded model plus the bookkeeping needed for eviction."""
+
+    def __init__(self, model: "whisper.Whisper") -> None:
+        self.model = model
+        self.size_bytes = sum(
+            param.numel() * param.element_size() for param in model.parameters()
+        )
+        self.in_use = 0
+        self.last_used = time.monotonic()
+        # Held for the whole of a borrow (see WhisperModelPool.model)
+        self.lock = threading.Lock()
+
+
+class WhisperModelPool:
+    """Loads each Whisper model size once and shares it across calls and threads.
+
+    Borrowers of the same model take turns; different models can be used
+    concurrently. Models that are not currently in use can be evicted when
+    they have been idle for too long or when the pool exceeds its memory
+    budget.
+    """
+
+    def __init__(
+        self,
+        memory_budget_mb: int | None = None,
+        idle_seconds: int | None = None,
+    ) -> None:
+        """Initialize the WhisperModelPool.
+
+        Args:
+            memory_budget_mb (int): Total size of idle models to keep loaded;
+                0 disables the budget
+            idle_seconds (int): Evict models unused for this long; 0 disables
+
+        """
+        if memory_budget_mb is None:
+            memory_budget_mb = config.WHISPER_POOL_MEMORY_BUDGET_MB
+        if idle_seconds is None:
+            idle_seconds = config.WHISPER_POOL_IDLE_SECONDS
+        self.memory_budget_bytes = memory_budget_mb * 1024 * 1024
+        self.idle_seconds = idle_seconds
+        self._models = {}
+        self._lock = threading.Lock()
+        self._load_locks = {}
+
+    @contextlib.contextmanager
+    def model(self, name: str | None = None) -> Iterator["whisper.Whisper"]:
+        """Borrow a loaded model, loading it on first use.
+
+        The model is protected from eviction while borrowed, and only one
+        thread borrows it at a time: Whisper decoding installs key/value cache
+        hooks on the model's decoder, so concurrent transcribe() calls on one
+        instance would corrupt each other's attention. Keep borrows short;
+        other threads waiting for the same model block until it is returned.
+
+        Args:
+            name (str): Whisper model size; defaults to config.WHISPER_MODEL
+
+        Yields:
+            whisper.Whisper: The loaded model
+
+        """
+        name = name or config.WHISPER_MODEL
+        entry = self._acquire(name)
+        try:
+            with entry.lock:
+                yield entry.model
+        finally:
+            with self._lock:
+                entry.in_use -= 1
+                entry.last_used = time.monotonic()
+            self.evict()
+
+    def _acquire(self, name: str) -> _PooledModel:
+        """Return the pooled entry for a model, loading it if necessary."""
+        with self._lock:
+            entry = self._models.get(name)
+            if entry:
+                entry.in_use += 1
+                return entry
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+
+        # Load outside the pool lock so other models stay available, but only
+        # once per model name even when several threads ask at the same time
+        with load_lock:
+            with self._lock:
+                entry = self._models.get(name)
+                if entry:
+                    entry.in_use += 1
+                    return entry
+
+            # Imported here so that merely importing this module stays cheap
+            import whisper  # noqa: PLC0415
+
+            logger.info("Loading Whisper model: %s", name)
+            with span("model_load", model=name) as load:
+                entry = _PooledModel(whisper.load_model(name))
+                load.set(bytes=entry.size_bytes)
+            logger.info(
+                "Loaded Whisper model %s (%.0f MB)", name, entry.size_bytes / 1e6,
+            )
+
+            with self._lock:
+                entry.in_use += 1
+                self._models[name] = entry
+        return entry
+
+    def evict(self, *, force: bool = False) -> None:
+        """Drop idle models that exceed the idle timeout or memory budget.
+
+        Args:
+            force (bool): Drop every model that is not currently in use
+
+        """
+        now = time.monotonic()
+        with self._lock:
+            idle = sorted(
+                (
+                    (name, entry)
+                    for name, entry in self._models.items()
+                    if entry.in_use == 0
+                ),
+                key=lambda item: item[1].last_used,
+            )
+            total = sum(entry.size_bytes for entry in self._models.values())
+            for name, entry in idle:
+                idle_for = now - entry.last_used
+                expired = self.idle_seconds and idle_for > self.idle_seconds
+                over_budget = (
+                    self.memory_budget_bytes and total > self.memory_budget_bytes
+                )
+                if force or expired or over_budget:
+                    logger.info("Evicting idle Whisper model: %s", name)
+                    del self._models[name]
+                    total -= entry.size_bytes
+
+    def loaded_models(self) -> list[str]:
+        """Return the names of the models currently loaded."""
+        with self._lock:
+            return list(self._models)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_model_pool() -> WhisperModelPool:
+    """Return the process-wide WhisperModelPool, creating it on first use."""
+    global _pool  # noqa: PLW0603
+    with _pool_lock:
+        if _pool is None:
+            _pool = WhisperModelPool()
+        return _pool
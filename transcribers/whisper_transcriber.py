@@ -1,25 +1,102 @@
 """Transcriber implementation that uses youtube-dl and OpenAI's Whisper."""
 
+import itertools
 import logging
+import multiprocessing
 import os
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
 
 import config
-import whisper
-import youtube_dl
-
 from transcribers.base_transcriber import BaseTranscriber
-from utils.file_utils import file_exists, load_json, save_json
-from utils.transcript_utils import format_transcript
+from transcribers.whisper_model_pool import get_model_pool
+from utils.metrics import span
+from utils.transcript_store import load_any_transcript, store_transcript
+from utils.transcript_utils import Transcript, format_transcript
 from utils.youtube_utils import extract_video_id
 
+if TYPE_CHECKING:
+    import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# Chunks shorter than this transcribe poorly, so never split finer than it
+MIN_CHUNK_SECONDS = 30
+
+# Files youtube-dl leaves behind that are not finished audio
+PARTIAL_DOWNLOAD_SUFFIXES = {".part", ".ytdl", ".tmp", ".json"}
+
+_chunk_executors = {}
+_chunk_executors_lock = threading.Lock()
+
+
+def _init_chunk_worker(torch_threads: int) -> None:
+    """Limit intra-op threads so parallel workers do not oversubscribe cores."""
+    import torch  # noqa: PLC0415
+
+    torch.set_num_threads(torch_threads)
+
+
+def _transcribe_chunk(model_name: str, audio: "np.ndarray", offset: float) -> list:
+    """Transcribe one audio chunk in a worker process.
+
+    Each worker keeps its own model in the process-wide pool, so the model is
+    loaded once per worker rather than once per chunk.
+
+    Returns:
+        list: Whisper segments with times shifted onto the full audio timeline
+
+    """
+    with get_model_pool().model(model_name) as model:
+        result = model.transcribe(audio, fp16=False, verbose=None)
+    return [
+        {
+            "start": segment["start"] + offset,
+            "end": segment["end"] + offset,
+            "text": segment["text"],
+        }
+        for segment in result["segments"]
+    ]
+
+
+def _get_chunk_executor(workers: int) -> ProcessPoolExecutor:
+    """Return a shared process pool for chunked transcription."""
+    with _chunk_executors_lock:
+        executor = _chunk_executors.get(workers)
+        if executor is None:
+            torch_threads = max(1, (os.cpu_count() or 1) // workers)
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                # Forking a process that already initialized torch can deadlock
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_chunk_worker,
+                initargs=(torch_threads,),
+            )
+            _chunk_executors[workers] = executor
+        return executor
+
+
 class WhisperTranscriber(BaseTranscriber):
     """Downloads videos and transcribes them using OpenAI's Whisper model."""
 
-    def __init__(self) -> None:
-        """Initialize the Whisper transcriber."""
+    def __init__(self, parallel_workers: int | None = None) -> None:
+        """Initialize the Whisper transcriber.
+
+        Args:
+            parallel_workers (int): Split audio at silences and transcribe the
+                chunks in this many processes; 0 or 1 transcribes sequentially.
+                Defaults to config.WHISPER_PARALLEL_WORKERS
+
+        """
         super().__init__()
+        if parallel_workers is None:
+            parallel_workers = config.WHISPER_PARALLEL_WORKERS
+        self.parallel_workers = parallel_workers
+        # Seconds of audio seen / skipped by the VAD pre-pass in the last run
+        self.vad_stats = None
 
     def get_transcript(self, video_url: str) -> list:
         """Download a video and transcriber it using Whisper".
@@ -32,96 +109,360 @@ class WhisperTranscriber(BaseTranscriber):
             list: Transcript data with timestamps
 
         """
-        # Download the video first
-        audio_file = self._download_video(video_url)
-
-        if not audio_file:
+        video_id = extract_video_id(video_url)  # Use utility function
+        # Without extension: saved as .json or .bin per config.TRANSCRIPT_FORMAT
+        transcript_path = str(Path(config.OUTPUT_DIR) / f"{video_id}_transcript")
+
+        # Skip download and transcription if a transcript file already exists
+        transcript = load_any_transcript(transcript_path)
+        if transcript is not None:
+            logger.info("Loaded existing transcript: %s", transcript_path)
+            return transcript
+
+        if config.WHISPER_AUDIO_MODE == "pipelined":
+            # Transcribe windows of audio while the rest is still downloading
+            transcript = Transcript.from_segments(self.iter_transcript(video_url))
+            saved_path = store_transcript(transcript, transcript_path)
+            logger.info("Transcript saved to: %s", saved_path)
+            return transcript
+
+        if config.WHISPER_AUDIO_MODE == "stream":
+            # Decode straight from YouTube into memory, nothing written to disk
+            audio = self._stream_audio(video_url)
+        else:
+            # Download the audio first
+            audio = self._download_video(video_url)
+
+        if audio is None:
             msg = f"Failed to downnload video: {video_url}"
             raise RuntimeError(msg)
 
         # Transcribe the audio
-        return self._transcribe_audio(audio_file)
+        return self._transcribe_audio(audio, transcript_path)
 
+    def iter_transcript(self, video_url: str) -> Iterator[dict]:
+        """Transcribe a video while its audio is still downloading.
 
+        The audio is decoded into windows of WHISPER_STREAM_WINDOW_SECONDS as
+        bytes arrive, and each window is transcribed as soon as it is ready, so
+        total latency approaches the longer of download and transcription
+        rather than their sum.
+
+        Args:
+            video_url (str): URL of the video
+
+        Yields:
+            dict: Transcript segments, in order, with times on the full timeline
+
+        """
+        import youtube_dl  # noqa: PLC0415
+
+        from utils.audio_utils import SAMPLE_RATE, iter_audio_windows  # noqa: PLC0415
+
+        with youtube_dl.YoutubeDL({"format": "bestaudio/best"}) as ydl:
+            info = ydl.extract_info(video_url, download=False)
+
+        windows = iter_audio_windows(
+            info["url"],
+            headers=info.get("http_headers"),
+            window_seconds=config.WHISPER_STREAM_WINDOW_SECONDS,
+        )
+        previous_text = None
+        self.vad_stats = None
+        for offset, window in windows:
+            samples, timeline = window, None
+            if config.WHISPER_VAD:
+                samples, timeline = self._skip_non_speech(window)
+                if not len(samples):
+                    continue
+
+            logger.info("Transcribing audio window at %.0fs...", offset)
+            # Borrowed per window: the model is not held while the download
+            # catches up or the caller consumes the segments
+            with (
+                get_model_pool().model(config.WHISPER_MODEL) as model,
+                span(
+                    "transcription",
+                    model=config.WHISPER_MODEL,
+                    audio_seconds=len(samples) / SAMPLE_RATE,
+                ),
+            ):
+                result = model.transcribe(
+                    samples,
+                    fp16=False,
+                    # Carry context across window boundaries
+                    initial_prompt=previous_text,
+                )
+            segments = result["segments"]
+            if timeline is not None:
+                segments = self._to_original_timeline(segments, timeline)
+            segments = [
+                {
+                    "start": segment["start"] + offset,
+                    "end": segment["end"] + offset,
+                    "text": segment["text"],
+                }
+                for segment in segments
+            ]
+            if segments:
+                previous_text = segments[-1]["text"]
+            yield from format_transcript(segments)
 
     def _download_video(self, video_url: str) -> str:
-        """Download a YouTube video and extract its audio.
+        """Download a YouTube video's audio track.
+
+        With WHISPER_AUDIO_MODE "native" the audio is kept in the container
+        YouTube serves (usually opus/webm or m4a), which Whisper decodes
+        directly to 16 kHz mono; "mp3" re-encodes it to MP3 first.
 
         Args:
             video_url (str): URL of the YouTube video
 
         Returns:
-            str: Path to the extracted audio file
+            str: Path to the audio file
 
         """
         # Create a unique filename based on video ID
         video_id = extract_video_id(video_url)  # Use utility function
         output_path = os.path.join(config.OUTPUT_DIR, video_id)
-        audio_path = f"{output_path}.mp3"
 
-        # Skip download if audio file already exists
-        if file_exists(audio_path):  # Use utility function
+        # Skip download if audio from an earlier run already exists
+        audio_path = self._find_downloaded_audio(video_id)
+        if audio_path:
             logger.info(f"Audio file already exists: {audio_path}")
             return audio_path
 
+        import youtube_dl  # noqa: PLC0415
+
+        reencode = config.WHISPER_AUDIO_MODE == "mp3"
+
         # youtube-dl options
         ydl_opts = {
             "format": "bestaudio/best",
             "outtmpl": f"{output_path}.%(ext)s",
-            "postprocessors": [{
-                "key": "FFmpegExtractAudio",
-                "preferredcodec": "mp3",
-                "preferredquality": "192",
-            }],
             "quiet": False,
             "no_warnings": False,
         }
+        if reencode:
+            ydl_opts["postprocessors"] = [{
+                "key": "FFmpegExtractAudio",
+                "preferredcodec": "mp3",
+                "preferredquality": "192",
+            }]
 
         try:
-            with youtube_dl.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([video_url])
-
-            logger.info(f"Successfully donwloaded and converted to MP3: {audio_path}")
+            with span("audio_download") as download:
+                with youtube_dl.YoutubeDL(ydl_opts) as ydl:
+                    info = ydl.extract_info(video_url, download=True)
+                    audio_path = (
+                        f"{output_path}.mp3"
+                        if reencode
+                        else ydl.prepare_filename(info)
+                    )
+                download.set(
+                    bytes=Path(audio_path).stat().st_size,
+                    audio_seconds=info.get("duration"),
+                )
+
+            logger.info("Successfully downloaded audio: %s", audio_path)
             return audio_path
         except Exception as e:
             logger.error(f"Error downloading video: {e}")
             return None
 
-    def _transcribe_audio(self, audio_file: str) -> list:
-        """Transcribe the audio file using Whisper.
+    def _find_downloaded_audio(self, video_id: str) -> str | None:
+        """Return the path of previously downloaded audio for a video, if any."""
+        for path in sorted(Path(config.OUTPUT_DIR).glob(f"{video_id}.*")):
+            if path.suffix not in PARTIAL_DOWNLOAD_SUFFIXES:
+                return str(path)
+        return None
+
+    def _stream_audio(self, video_url: str) -> "np.ndarray | None":
+        """Decode a video's audio track straight from YouTube into memory.
 
         Args:
-            audio_file (str): Path to the audio file
+            video_url (str): URL of the YouTube video
+
+        Returns:
+            np.ndarray: 16 kHz mono float32 samples, or None on failure
+
+        """
+        import youtube_dl  # noqa: PLC0415
+
+        from utils.audio_utils import SAMPLE_RATE, decode_audio  # noqa: PLC0415
+
+        try:
+            with span("audio_download") as download:
+                with youtube_dl.YoutubeDL({"format": "bestaudio/best"}) as ydl:
+                    info = ydl.extract_info(video_url, download=False)
+                logger.info("Decoding audio stream...")
+                audio = decode_audio(info["url"], headers=info.get("http_headers"))
+                download.set(audio_seconds=len(audio) / SAMPLE_RATE)
+        except Exception:
+            logger.exception("Error streaming audio")
+            return None
+        else:
+            return audio
+
+    def _transcribe_audio(
+        self, audio: "str | np.ndarray", transcript_path: str,
+    ) -> list:
+        """Transcribe audio using Whisper.
+
+        Args:
+            audio (str | np.ndarray): Path to the audio file, or decoded
+                16 kHz mono samples
+            transcript_path (str): Where to save the transcript, without
+                extension
 
         Returns:
             list: Transcript data with timestamps
 
         """
-        # Generate transcript output path
-        transcript_path = f"{os.path.splitext(audio_file)[0]}_transcript.json"
-
-        # Skip transcription if transcript file already exists
-        if file_exists(transcript_path):  # Use utility function
-            logger.info(f"Loading existing transcript: {transcript_path}")
-            return load_json(transcript_path)
-
-        # Load the Whisper model
-        logger.info(f"Loading Whisper model: {config.WHISPER_MODEL}")
-        model = whisper.load_model(config.WHISPER_MODEL)
-
-        # Transcribe audio
-        logger.info("Transcribing audio with Whisper...")
-        result = model.transcribe(
-            audio_file,
-            fp16=False, # Set to True if using a GPU with FP16 support
-            verbose=True
-        )
+        timeline = None
+        self.vad_stats = None
+        if config.WHISPER_VAD:
+            # Only transcribe speech; times are mapped back afterwards
+            audio, timeline = self._skip_non_speech(audio)
+
+        with span("transcription", model=config.WHISPER_MODEL) as transcription:
+            if timeline is not None and not len(audio):
+                segments = []
+            elif self.parallel_workers > 1:
+                segments = self._transcribe_parallel(audio)
+            else:
+                # Borrow the shared Whisper model (loaded once per process)
+                with get_model_pool().model(config.WHISPER_MODEL) as model:
+                    logger.info("Transcribing audio with Whisper...")
+                    result = model.transcribe(
+                        audio,
+                        fp16=False, # Set to True if using a GPU with FP16 support
+                        verbose=True,
+                    )
+                segments = result["segments"]
+            transcription.set(audio_seconds=self._audio_seconds(audio, segments))
+
+        if timeline is not None:
+            segments = self._to_original_timeline(segments, timeline)
 
         # Format transcript
-        transcript = format_transcript(result["segments"])  # Use utility function
+        transcript = format_transcript(segments)  # Use utility function
 
         # Save transcript to file
-        save_json(transcript, transcript_path)  # Use utility function
+        saved_path = store_transcript(transcript, transcript_path)
 
-        logger.info(f"Transcript saved to: {transcript_path}")
+        logger.info("Transcript saved to: %s", saved_path)
         return transcript
+
+    @staticmethod
+    def _audio_seconds(audio: "str | np.ndarray", segments: list) -> float:
+        """Length of the transcribed audio, from the samples when decoded."""
+        if isinstance(audio, str):
+            # Not decoded here; the end of the last segment is close enough
+            return segments[-1]["end"] if segments else 0.0
+        from utils.audio_utils import SAMPLE_RATE  # noqa: PLC0415
+
+        return len(audio) / SAMPLE_RATE
+
+    def _skip_non_speech(self, audio: "str | np.ndarray") -> tuple:
+        """Drop silent stretches of the audio before transcription.
+
+        Args:
+            audio (str | np.ndarray): Path to the audio file, or decoded
+                16 kHz mono samples
+
+        Returns:
+            tuple: (speech-only samples, timeline mapping them back onto the
+                original audio, for _to_original_timeline)
+
+        """
+        import whisper  # noqa: PLC0415
+
+        from utils.audio_utils import (  # noqa: PLC0415
+            SAMPLE_RATE,
+            compact_speech,
+            detect_speech_regions,
+        )
+
+        if isinstance(audio, str):
+            audio = whisper.load_audio(audio)
+
+        with span("vad", audio_seconds=len(audio) / SAMPLE_RATE) as vad:
+            regions = detect_speech_regions(
+                audio, threshold_db=config.WHISPER_VAD_THRESHOLD_DB,
+            )
+            speech, timeline = compact_speech(audio, regions)
+            vad.set(speech_seconds=len(speech) / SAMPLE_RATE)
+
+        stats = self.vad_stats or {"total_seconds": 0.0, "skipped_seconds": 0.0}
+        stats["total_seconds"] += len(audio) / SAMPLE_RATE
+        stats["skipped_seconds"] += (len(audio) - len(speech)) / SAMPLE_RATE
+        self.vad_stats = stats
+        logger.info(
+            "VAD: skipping %.0fs of %.0fs audio without speech",
+            stats["skipped_seconds"],
+            stats["total_seconds"],
+        )
+        return speech, timeline
+
+    def _to_original_timeline(self, segments: list, timeline: list) -> list:
+        """Map segment times from speech-only audio back to the original audio."""
+        from utils.audio_utils import to_original_time  # noqa: PLC0415
+
+        return [
+            {
+                **segment,
+                "start": to_original_time(segment["start"], timeline),
+                "end": to_original_time(segment["end"], timeline, end=True),
+            }
+            for segment in segments
+        ]
+
+    def _transcribe_parallel(self, audio: "str | np.ndarray") -> list:
+        """Transcribe silence-delimited chunks of the audio in a process pool.
+
+        Args:
+            audio (str | np.ndarray): Path to the audio file, or decoded
+                16 kHz mono samples
+
+        Returns:
+            list: Whisper segments for the whole file, in order
+
+        """
+        import whisper  # noqa: PLC0415
+
+        from utils.audio_utils import SAMPLE_RATE, find_silence_splits  # noqa: PLC0415
+
+        if isinstance(audio, str):
+            audio = whisper.load_audio(audio)
+        duration = len(audio) / SAMPLE_RATE
+
+        # Aim for at least one chunk per worker, but keep chunks long enough
+        # for Whisper to have useful context
+        chunk_seconds = max(
+            MIN_CHUNK_SECONDS,
+            min(config.WHISPER_CHUNK_SECONDS, duration / self.parallel_workers),
+        )
+        splits = find_silence_splits(audio, chunk_seconds)
+        logger.info(
+            "Transcribing %.0fs of audio as %d chunks on %d workers...",
+            duration,
+            len(splits) - 1,
+            self.parallel_workers,
+        )
+
+        executor = _get_chunk_executor(self.parallel_workers)
+        futures = [
+            executor.submit(
+                _transcribe_chunk,
+                config.WHISPER_MODEL,
+                audio[start:end],
+                start / SAMPLE_RATE,
+            )
+            for start, end in itertools.pairwise(splits)
+        ]
+
+        segments = []
+        for future in futures:
+            segments.extend(future.result())
+        return segments
@@ -1,24 +1,59 @@
 """Transcriber implementation that uses the YouTube Data API."""
 
+import io
 import logging
-import re
-
-import googleapiclient.discovery
+import time
+from typing import TYPE_CHECKING
 
 import config
 from transcribers.base_transcriber import BaseTranscriber
-from utils.time_helpers import time_to_seconds
+from utils.clients import execute_youtube_request, get_youtube_service
+from utils.metrics import span
+from utils.subtitle_utils import iter_subtitle_segments
 from utils.transcript_utils import format_transcript
 from utils.youtube_utils import extract_video_id
 
+if TYPE_CHECKING:
+    from utils.cache import ResultCache
+
 logger = logging.getLogger(__name__)
 
+# Track kinds that can be chosen directly; "forced" tracks only caption the
+# parts of a video in another language, so they are never used
+NATIVE_KINDS = ("standard", "asr")
+
+# videos().list accepts at most this many IDs per request
+METADATA_BATCH_SIZE = 50
+
+
+class NoCaptionsError(ValueError):
+    """Raised when a video has no caption track matching the preferences."""
+
+
 class YouTubeAPITranscriber(BaseTranscriber):
     """Obtains transcripts using the YouTube Data API."""
 
-    def __init__(self) -> None:
-        """Initialize the YouTube API transcriber."""
+    def __init__(
+        self,
+        cache: "ResultCache | None" = None,
+        languages: list[str] | None = None,
+        kinds: list[str] | None = None,
+    ) -> None:
+        """Initialize the YouTube API transcriber.
+
+        Args:
+            cache (ResultCache): Caches caption track lists (including "no
+                captions" results) and downloaded tracks; None disables it
+            languages (list): Caption languages in order of preference;
+                defaults to config.CAPTION_LANGUAGES
+            kinds (list): Track kinds ("standard", "asr", "translated") in
+                order of preference; defaults to config.CAPTION_KINDS
+
+        """
         super().__init__()
+        self.cache = cache
+        self.languages = languages or config.CAPTION_LANGUAGES
+        self.kinds = kinds or config.CAPTION_KINDS
 
     def get_transcript(self, video_url: str) -> list:
         """Get the transcript of a YouTube video using the YouTube Data API.
@@ -31,41 +66,188 @@ class YouTubeAPITranscriber(BaseTranscriber):
         """
         video_id = extract_video_id(video_url)  # Use utility function
 
-        # Build the YouTube service
-        youtube = googleapiclient.discovery.build(
-            config.YOUTUBE_API_SERVICE_NAME,
-            config.YOUTUBE_API_VERSION,
-            developerKey=config.YOUTUBE_API_KEY)
-
-        # Get video captions
-        results = youtube.captions().list(
-            part="snippet",
-            videoId=video_id).execute()
-
-        captions = results.get("items", [])
-        if not captions:
-            msg = f"No captions found for video ID: {video_id}"
-            raise ValueError(msg)
-
-        # Get the first available caption track (preferably English)
-        caption_id = None
-        for caption in captions:
-            if caption["snippet"]["language"] == "en":
-                caption_id = caption["id"]
-                break
-
-        # If no English caption track is found, use the first one
-        if not caption_id and captions:
-            caption_id = captions[0]["id"]
-
-        # Download the caption track
-        subtitle = youtube.captions().download(
-            id=caption_id,
-            tfmt="srt").execute()
+        captions = self.list_captions(video_id)
+        track = self.select_caption(captions, video_id)
+        return self.download_caption(
+            track["id"], translate_to=track["translate_to"], video_id=video_id,
+        )
+
+    def list_captions(self, video_id: str) -> list:
+        """List the caption tracks available for a video.
+
+        The list (empty for a video without captions) is cached for
+        config.CAPTION_LIST_TTL_SECONDS, so processing the video again, in
+        any language, costs no API quota.
+
+        Args:
+            video_id (str): YouTube video ID
+
+        Returns:
+            list: Caption track resources from the YouTube Data API
+
+        """
+        cached = self.cache.get("caption_list", video_id) if self.cache else None
+        ttl = config.CAPTION_LIST_TTL_SECONDS
+        if cached is not None and (not ttl or time.time() - cached["fetched_at"] < ttl):
+            if not cached["items"]:
+                logger.info("Video %s is known to have no captions", video_id)
+            return cached["items"]
+
+        with span("caption_list"):
+            request = get_youtube_service().captions().list(
+                part="snippet",
+                videoId=video_id)
+            results = execute_youtube_request(request, units=50)
+
+        items = results.get("items", [])
+        if self.cache:
+            self.cache.set(
+                "caption_list", video_id, {"fetched_at": time.time(), "items": items},
+            )
+        return items
+
+    def select_caption(self, captions: list, video_id: str) -> dict:
+        """Pick the caption track to download according to the preferences.
+
+        Track kind takes precedence over language: with the default
+        preferences, a creator-uploaded track in any preferred language beats
+        an auto-generated one, and translating another track is the last
+        resort. Within a kind, earlier languages win.
+
+        Args:
+            captions (list): Caption track resources from list_captions
+            video_id (str): YouTube video ID, for error reporting
+
+        Returns:
+            dict: ``id`` of the chosen track, its ``language`` and ``kind``,
+                and ``translate_to`` (the language to have YouTube translate
+                it into, or None)
+
+        Raises:
+            NoCaptionsError: If no track satisfies the preferences
+
+        """
+        tracks = [
+            caption
+            for caption in captions
+            if _track_kind(caption) in NATIVE_KINDS
+            and caption["snippet"].get("status", "serving") == "serving"
+        ]
+        for kind in self.kinds:
+            if kind == "translated":
+                source = self._best_source_track(tracks)
+                if source:
+                    return _selection(source, translate_to=self.languages[0])
+                continue
+            for language in self.languages:
+                for caption in tracks:
+                    if _track_kind(caption) == kind and _same_language(
+                        caption["snippet"]["language"], language,
+                    ):
+                        return _selection(caption)
+
+        msg = (
+            f"No captions found for video ID: {video_id} "
+            f"(languages {self.languages}, kinds {self.kinds})"
+        )
+        raise NoCaptionsError(msg)
+
+    def _best_source_track(self, tracks: list) -> dict | None:
+        """Return the track to translate: the most preferred native kind."""
+        kinds = [kind for kind in self.kinds if kind in NATIVE_KINDS] or NATIVE_KINDS
+        for kind in kinds:
+            for caption in tracks:
+                if _track_kind(caption) == kind:
+                    return caption
+        return None
+
+    def download_caption(
+        self, caption_id: str, translate_to: str | None = None, video_id: str = "",
+    ) -> list:
+        """Download a caption track and parse it into a transcript.
+
+        Downloaded tracks are cached per track and translation language, so
+        switching between languages only downloads each track once.
+
+        Args:
+            caption_id (str): ID of the caption track
+            translate_to (str): Have YouTube translate the track into this
+                language
+            video_id (str): YouTube video ID the track belongs to
+
+        Returns:
+            list: List of transcript segments with timestamps
+
+        """
+        inputs = {"caption_id": caption_id, "translate_to": translate_to}
+        if self.cache:
+            cached = self.cache.get("caption_track", video_id, **inputs)
+            if cached is not None:
+                return cached
+
+        with span("caption_download") as download:
+            params = {"id": caption_id, "tfmt": "srt"}
+            if translate_to:
+                params["tlang"] = translate_to
+            request = get_youtube_service().captions().download(**params)
+            subtitle = execute_youtube_request(request, units=200)
+            download.set(bytes=len(subtitle))
 
         # Parse the SRT format and convert to transcript dict
-        return self.parse_srt(subtitle.decode("utf-8"))
+        transcript = self._parse_srt(subtitle.decode("utf-8"))
+        if self.cache:
+            self.cache.set("caption_track", video_id, transcript, **inputs)
+        return transcript
+
+    def get_video_metadata(self, video_id: str) -> dict:
+        """Fetch basic metadata (title, duration, language) for a video.
+
+        Args:
+            video_id (str): YouTube video ID
+
+        Returns:
+            dict: The video resource's snippet and contentDetails, or an empty
+                dict if the video was not found
 
+        """
+        return self.get_videos_metadata([video_id]).get(video_id, {})
+
+    def get_videos_metadata(self, video_ids: list) -> dict:
+        """Fetch metadata for many videos, up to 50 per API request.
+
+        Each videos().list request costs one quota unit however many IDs it
+        carries. Results are cached per video, so only videos not seen before
+        are fetched.
+
+        Args:
+            video_ids (list): YouTube video IDs
+
+        Returns:
+            dict: Video ID to its snippet and contentDetails; videos that were
+                not found are left out
+
+        """
+        metadata = {}
+        missing = []
+        for video_id in dict.fromkeys(video_ids):
+            cached = self.cache.get("video_metadata", video_id) if self.cache else None
+            if cached is None:
+                missing.append(video_id)
+            else:
+                metadata[video_id] = cached
+
+        for start in range(0, len(missing), METADATA_BATCH_SIZE):
+            batch = missing[start:start + METADATA_BATCH_SIZE]
+            with span("video_metadata", videos=len(batch)):
+                request = get_youtube_service().videos().list(
+                    part="snippet,contentDetails",
+                    id=",".join(batch))
+                results = execute_youtube_request(request, units=1)
+            for item in results.get("items", []):
+                metadata[item["id"]] = item
+                if self.cache:
+                    self.cache.set("video_metadata", item["id"], item)
+        return metadata
 
     def _parse_srt(self, srt_string: str) -> list:
         """Parse SRT formatted subtitle string into a structure transcript.
@@ -74,22 +256,30 @@ class YouTubeAPITranscriber(BaseTranscriber):
             srt_string (str): String in SRT format
 
         Returns:
-            list: List of dicts with start_time, end_time and text
+            Transcript: Segments with start_time, end_time and text
 
         """
-        transcript = []
-        pattern = re.compile(r"(\d+)\n(\d{2}:\d{2}:\d{2},\d{3}) --> (\d{2}:\d{2}:\d{2},\d{3})\n([\s\S]*?)(?=\n\n|\Z)")  # noqa: E501
-
-        matches = pattern.findall(srt_string)
-        for _, start_time, end_time, text in matches:
-            # Convert time format from "00:00:00,000" to seconds
-            start_seconds = time_to_seconds(start_time)  # Use utility function
-            end_seconds = time_to_seconds(end_time)  # Use utility function
-
-            transcript.append({
-                "start_time": start_seconds,
-                "end_time": end_seconds,
-                "text": text.strip().replace("\n", " "),
-            })
-
-        return format_transcript(transcript)  # Use utility function
+        # Single streaming pass over the lines (also accepts WebVTT)
+        segments = iter_subtitle_segments(io.StringIO(srt_string))
+        return format_transcript(segments)  # Use utility function
+
+
+def _track_kind(caption: dict) -> str:
+    """Return a caption track's kind: "standard", "asr" or "forced"."""
+    return caption["snippet"].get("trackKind", "standard").lower()
+
+
+def _same_language(track_language: str, language: str) -> bool:
+    """Match "en" against "en", "en-US", "en-GB" and so on."""
+    track_language = track_language.lower()
+    language = language.lower()
+    return track_language == language or track_language.split("-")[0] == language
+
+
+def _selection(caption: dict, translate_to: str | None = None) -> dict:
+    return {
+        "id": caption["id"],
+        "language": translate_to or caption["snippet"]["language"],
+        "kind": "translated" if translate_to else _track_kind(caption),
+        "translate_to": translate_to,
+    }
@@ -0,0 +1 @@
+"""Shared helpers: caching, files, metrics, rate limits and transcripts."""
@@ -0,0 +1,346 @@
+"""Utility functions for working with decoded audio.
+
+Audio is handled the way Whisper expects it: a mono float32 numpy array
+sampled at 16 kHz.
+"""
+
+import bisect
+import queue
+import subprocess
+import tempfile
+import threading
+from collections.abc import Iterator
+from typing import BinaryIO
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+# Length of the analysis frames used for energy measurements, in seconds
+FRAME_SECONDS = 0.1
+
+# Bytes read from ffmpeg's output at a time when streaming
+_READ_BYTES = 1 << 16
+
+# Bytes of PCM audio in one 16-bit sample
+_SAMPLE_BYTES = 2
+
+
+def frame_rms(audio: np.ndarray, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Return the RMS energy of consecutive fixed-length frames of the audio."""
+    frame_length = int(sample_rate * FRAME_SECONDS)
+    n_frames = len(audio) // frame_length
+    if n_frames == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = audio[: n_frames * frame_length].reshape(n_frames, frame_length)
+    return np.sqrt(np.mean(np.square(frames), axis=1))
+
+
+def find_silence_splits(
+    audio: np.ndarray,
+    chunk_seconds: float,
+    search_seconds: float = 10.0,
+    sample_rate: int = SAMPLE_RATE,
+) -> list:
+    """Choose split points near every ``chunk_seconds`` at the quietest moment.
+
+    Each split is placed at the lowest-energy frame within ``search_seconds``
+    of the ideal boundary, so chunks rarely cut through a word.
+
+    Args:
+        audio (np.ndarray): Mono audio samples
+        chunk_seconds (float): Target chunk length in seconds
+        search_seconds (float): How far from the ideal boundary to look for silence
+        sample_rate (int): Sample rate of the audio
+
+    Returns:
+        list: Sample offsets of the chunk boundaries, starting with 0 and
+            ending with len(audio)
+
+    """
+    rms = frame_rms(audio, sample_rate)
+    frame_length = int(sample_rate * FRAME_SECONDS)
+    chunk_frames = max(1, int(chunk_seconds / FRAME_SECONDS))
+    search_frames = int(search_seconds / FRAME_SECONDS)
+
+    splits = [0]
+    target = chunk_frames
+    while target < len(rms) - search_frames:
+        low = max(target - search_frames, splits[-1] // frame_length + 1)
+        high = min(target + search_frames, len(rms))
+        quietest = low + int(np.argmin(rms[low:high]))
+        splits.append(quietest * frame_length + frame_length // 2)
+        target = quietest + chunk_frames
+    splits.append(len(audio))
+    return splits
+
+
+def ffmpeg_decode_command(
+    source: str, headers: dict | None = None, sample_rate: int = SAMPLE_RATE,
+) -> list:
+    """Build an ffmpeg command decoding audio to mono 16-bit PCM on stdout.
+
+    Args:
+        source (str): Path or URL of the audio
+        headers (dict): HTTP headers to send when ``source`` is a URL
+        sample_rate (int): Output sample rate
+
+    Returns:
+        list: Command line arguments
+
+    """
+    cmd = ["ffmpeg", "-nostdin", "-loglevel", "error", "-threads", "0"]
+    if headers:
+        header_lines = "".join(f"{key}: {value}\r\n" for key, value in headers.items())
+        cmd += ["-headers", header_lines]
+    cmd += [
+        "-i", source,
+        "-f", "s16le",
+        "-ac", "1",
+        "-acodec", "pcm_s16le",
+        "-ar", str(sample_rate),
+        "-",
+    ]
+    return cmd
+
+
+def pcm16_to_float(data: bytes) -> np.ndarray:
+    """Convert little-endian 16-bit PCM bytes to float32 samples in [-1, 1)."""
+    return np.frombuffer(data, np.int16).astype(np.float32) / 32768.0
+
+
+def decode_audio(
+    source: str, headers: dict | None = None, sample_rate: int = SAMPLE_RATE,
+) -> np.ndarray:
+    """Decode audio from a file or URL straight to mono float32 samples.
+
+    Decoding happens in a single ffmpeg pass piped into memory, with no
+    intermediate file.
+
+    Args:
+        source (str): Path or URL of the audio
+        headers (dict): HTTP headers to send when ``source`` is a URL
+        sample_rate (int): Output sample rate
+
+    Returns:
+        np.ndarray: Decoded samples
+
+    """
+    result = subprocess.run(  # noqa: S603
+        ffmpeg_decode_command(source, headers, sample_rate),
+        capture_output=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        msg = f"Failed to decode audio: {result.stderr.decode(errors='replace')}"
+        raise RuntimeError(msg)
+    return pcm16_to_float(result.stdout)
+
+
+def iter_audio_windows(
+    source: str,
+    headers: dict | None = None,
+    window_seconds: float = 60.0,
+    search_seconds: float = 5.0,
+    sample_rate: int = SAMPLE_RATE,
+) -> Iterator[tuple[float, np.ndarray]]:
+    """Decode audio and yield it in windows as soon as each one is available.
+
+    ffmpeg's output is drained on a background thread, so downloading and
+    decoding keep going while the caller works on earlier windows. At most
+    two windows of audio are buffered ahead of the caller; beyond that ffmpeg
+    is paused by the full pipe. Each window is cut at the quietest moment in
+    its last ``search_seconds``; the remainder carries over into the next
+    window.
+
+    Args:
+        source (str): Path or URL of the audio
+        headers (dict): HTTP headers to send when ``source`` is a URL
+        window_seconds (float): Maximum window length
+        search_seconds (float): How far back from the window end to look for silence
+        sample_rate (int): Output sample rate
+
+    Yields:
+        tuple: (offset in seconds of the window start, np.ndarray of samples)
+
+    """
+    window_bytes = int(window_seconds * sample_rate) * _SAMPLE_BYTES
+    # ffmpeg's log goes to a file: a pipe nobody reads until exit could fill
+    # up and stall it
+    stderr = tempfile.TemporaryFile()  # noqa: SIM115
+    process = subprocess.Popen(  # noqa: S603
+        ffmpeg_decode_command(source, headers, sample_rate),
+        stdout=subprocess.PIPE,
+        stderr=stderr,
+    )
+    chunks = queue.Queue(maxsize=max(1, 2 * window_bytes // _READ_BYTES))
+    stop = threading.Event()
+    threading.Thread(
+        target=_drain, args=(process.stdout, chunks, stop), daemon=True,
+    ).start()
+
+    search_samples = int(search_seconds * sample_rate)
+    buffer = bytearray()
+    offset = 0
+    try:
+        while data := chunks.get():
+            buffer += data
+            while len(buffer) >= window_bytes:
+                samples = pcm16_to_float(bytes(buffer[:window_bytes]))
+                cut = _quiet_cut(samples, search_samples, sample_rate)
+                yield offset / sample_rate, samples[:cut]
+                del buffer[: cut * _SAMPLE_BYTES]
+                offset += cut
+
+        if process.wait() != 0:
+            stderr.seek(0)
+            msg = f"Failed to decode audio: {stderr.read().decode(errors='replace')}"
+            raise RuntimeError(msg)
+        if len(buffer) >= _SAMPLE_BYTES:
+            tail = bytes(buffer[: len(buffer) // _SAMPLE_BYTES * _SAMPLE_BYTES])
+            yield offset / sample_rate, pcm16_to_float(tail)
+    finally:
+        stop.set()
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        stderr.close()
+
+
+def _drain(stream: BinaryIO, chunks: queue.Queue, stop: threading.Event) -> None:
+    """Copy ``stream`` into ``chunks`` until EOF (queued as b"") or ``stop``."""
+    while True:
+        data = stream.read(_READ_BYTES)
+        # Wait for room in the queue, giving up once the reader has gone
+        while not stop.is_set():
+            try:
+                chunks.put(data, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        if not data or stop.is_set():
+            return
+
+
+def _quiet_cut(samples: np.ndarray, search_samples: int, sample_rate: int) -> int:
+    """Return the sample index of the quietest frame near the end of ``samples``."""
+    search_start = max(0, len(samples) - search_samples)
+    rms = frame_rms(samples[search_start:], sample_rate)
+    if len(rms) == 0:
+        return len(samples)
+    frame_length = int(sample_rate * FRAME_SECONDS)
+    return search_start + int(np.argmin(rms)) * frame_length + frame_length // 2
+
+
+def detect_speech_regions(
+    audio: np.ndarray,
+    threshold_db: float = 12.0,
+    min_silence_seconds: float = 1.0,
+    padding_seconds: float = 0.3,
+    sample_rate: int = SAMPLE_RATE,
+) -> list:
+    """Find the regions of the audio that contain speech, by frame energy.
+
+    A frame counts as active when its energy is ``threshold_db`` above the
+    recording's noise floor (its 10th-percentile frame energy). Gaps shorter
+    than ``min_silence_seconds`` are bridged so sentences are not split at
+    every pause, and each region is padded so word onsets are not clipped.
+
+    Args:
+        audio (np.ndarray): Mono audio samples
+        threshold_db (float): Energy above the noise floor that counts as speech
+        min_silence_seconds (float): Shorter gaps are kept inside the region
+        padding_seconds (float): Context kept on both sides of each region
+        sample_rate (int): Sample rate of the audio
+
+    Returns:
+        list: (start, end) sample offsets of the speech regions, in order
+
+    """
+    rms = frame_rms(audio, sample_rate)
+    if len(rms) == 0:
+        return [(0, len(audio))] if len(audio) else []
+
+    energy_db = 20 * np.log10(rms + 1e-10)
+    noise_floor = np.percentile(energy_db, 10)
+    active = np.flatnonzero(energy_db > noise_floor + threshold_db)
+    if len(active) == 0:
+        return []
+
+    frame_length = int(sample_rate * FRAME_SECONDS)
+    max_gap = int(min_silence_seconds / FRAME_SECONDS)
+    padding = int(padding_seconds * sample_rate)
+
+    regions = []
+    start = previous = active[0]
+    for frame in active[1:]:
+        if frame - previous > max_gap:
+            regions.append((start, previous + 1))
+            start = frame
+        previous = frame
+    regions.append((start, previous + 1))
+
+    # Convert to samples with padding, merging regions the padding makes overlap
+    padded = []
+    for start_frame, end_frame in regions:
+        start = max(0, start_frame * frame_length - padding)
+        end = min(len(audio), end_frame * frame_length + padding)
+        if padded and start <= padded[-1][1]:
+            padded[-1] = (padded[-1][0], end)
+        else:
+            padded.append((start, end))
+    return padded
+
+
+def compact_speech(
+    audio: np.ndarray, regions: list, sample_rate: int = SAMPLE_RATE,
+) -> tuple:
+    """Concatenate the speech regions, keeping a map back to the original timeline.
+
+    Args:
+        audio (np.ndarray): Mono audio samples
+        regions (list): (start, end) sample offsets from detect_speech_regions
+        sample_rate (int): Sample rate of the audio
+
+    Returns:
+        tuple: (compacted samples, timeline) where the timeline lists
+            (compacted start seconds, original start seconds) for each region
+
+    """
+    timeline = []
+    position = 0
+    for start, end in regions:
+        timeline.append((position / sample_rate, start / sample_rate))
+        position += end - start
+    if not regions:
+        return np.zeros(0, dtype=audio.dtype), timeline
+    compacted = np.concatenate([audio[start:end] for start, end in regions])
+    return compacted, timeline
+
+
+def to_original_time(seconds: float, timeline: list, *, end: bool = False) -> float:
+    """Map a time in compacted audio back onto the original timeline.
+
+    A time exactly on the boundary between two kept regions is ambiguous: it
+    is both the end of one region and the start of the next. Start times map
+    to the start of the later region, end times to the end of the earlier one,
+    so a segment never stretches over the silence that was cut out.
+
+    Args:
+        seconds (float): Time in the compacted audio
+        timeline (list): Timeline returned by compact_speech
+        end (bool): Whether ``seconds`` is the end of a segment
+
+    Returns:
+        float: Time in the original audio
+
+    """
+    if not timeline:
+        return seconds
+    if end:
+        position = bisect.bisect_left(timeline, (seconds, float("-inf")))
+    else:
+        position = bisect.bisect_right(timeline, (seconds, float("inf")))
+    index = max(0, position - 1)
+    compact_start, original_start = timeline[index]
+    return original_start + (seconds - compact_start)
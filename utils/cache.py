@@ -0,0 +1,241 @@
+"""Content-addressed cache for pipeline stage results.
+
+Each entry is keyed by the stage name, the video ID and every input that
+affects the stage's output (model name, prompt version, transcript hash...),
+so changing any of them naturally misses the cache instead of serving stale
+results. Entries are JSON files written atomically, which keeps the cache safe
+to share between several processes using the same OUTPUT_DIR. With
+TRANSCRIPT_FORMAT=binary, transcript values are kept in a memory-mapped
+``.bin`` file next to their entry instead of inside the JSON.
+"""
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import config
+from utils.file_utils import load_json, save_json
+from utils.metrics import get_metrics
+from utils.transcript_store import load_transcript, save_transcript
+from utils.transcript_utils import Transcript
+
+logger = logging.getLogger(__name__)
+
+# Run a size-based eviction pass after this many writes
+_EVICT_EVERY_WRITES = 50
+
+
+class ResultCache:
+    """On-disk cache of stage results with size and TTL based eviction."""
+
+    def __init__(
+        self,
+        root: str | None = None,
+        max_bytes: int | None = None,
+        ttl_seconds: int | None = None,
+    ) -> None:
+        """Initialize the ResultCache.
+
+        Args:
+            root (str): Directory holding cache entries
+            max_bytes (int): Evict least recently used entries above this total
+                size; 0 disables the limit
+            ttl_seconds (int): Entries older than this are treated as misses;
+                0 disables expiry
+
+        """
+        self.root = Path(root or config.CACHE_DIR)
+        self.max_bytes = (
+            config.CACHE_MAX_MB * 1024 * 1024 if max_bytes is None else max_bytes
+        )
+        self.ttl_seconds = (
+            config.CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        )
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(stage: str, video_id: str, **inputs: object) -> str:
+        """Build the content address for a stage result."""
+        payload = json.dumps(
+            {"stage": stage, "video_id": video_id, "inputs": inputs},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, stage: str, key: str) -> Path:
+        return self.root / stage / key[:2] / f"{key}.json"
+
+    @staticmethod
+    def _value_path(path: Path) -> Path:
+        """Path of the binary transcript stored alongside an entry."""
+        return path.with_suffix(".bin")
+
+    def get(
+        self,
+        stage: str,
+        video_id: str,
+        default: object = None,
+        **inputs: object,
+    ) -> object:
+        """Return a cached stage result, or ``default`` on a miss.
+
+        Args:
+            stage (str): Pipeline stage name, e.g. "summary"
+            video_id (str): YouTube video ID
+            default: Value returned when there is no usable entry
+            **inputs: Every input that affects the stage's output
+
+        Returns:
+            The cached value, or ``default``
+
+        """
+        path = self._path(stage, self.make_key(stage, video_id, **inputs))
+        try:
+            entry = load_json(path)
+            if entry.get("value_format") == "transcript_bin":
+                entry["value"] = load_transcript(self._value_path(path))
+        except FileNotFoundError:
+            logger.debug("Cache miss: %s %s", stage, video_id)
+            get_metrics().record_cache(stage, video_id, hit=False)
+            return default
+        except (OSError, ValueError) as e:
+            logger.warning("Discarding unreadable cache entry %s: %s", path, e)
+            self._remove(path)
+            get_metrics().record_cache(stage, video_id, hit=False)
+            return default
+
+        if self.ttl_seconds and time.time() - entry["created_at"] > self.ttl_seconds:
+            logger.debug("Cache entry expired: %s %s", stage, video_id)
+            self._remove(path)
+            get_metrics().record_cache(stage, video_id, hit=False)
+            return default
+
+        # Touch the entry so size-based eviction drops least recently used first
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(path)
+        logger.info("Cache hit: %s %s", stage, video_id)
+        get_metrics().record_cache(stage, video_id, hit=True)
+        return entry["value"]
+
+    def set(
+        self, stage: str, video_id: str, value: object, **inputs: object,
+    ) -> None:
+        """Store a stage result.
+
+        Args:
+            stage (str): Pipeline stage name, e.g. "summary"
+            video_id (str): YouTube video ID
+            value: JSON-serializable result
+            **inputs: Every input that affects the stage's output
+
+        """
+        key = self.make_key(stage, video_id, **inputs)
+        path = self._path(stage, key)
+        entry = {
+            "stage": stage,
+            "video_id": video_id,
+            "inputs": inputs,
+            "created_at": time.time(),
+            "value": value,
+        }
+        if isinstance(value, Transcript) and config.TRANSCRIPT_FORMAT == "binary":
+            # Written before the entry, so a visible entry always has its value
+            save_transcript(value, self._value_path(path))
+            entry["value"] = None
+            entry["value_format"] = "transcript_bin"
+        save_json(entry, path)
+
+        with self._lock:
+            self._writes += 1
+            should_evict = self.max_bytes and self._writes % _EVICT_EVERY_WRITES == 0
+        if should_evict:
+            self.evict()
+
+    def get_or_compute(
+        self,
+        stage: str,
+        video_id: str,
+        compute: Callable[[], object],
+        **inputs: object,
+    ) -> object:
+        """Return a cached stage result, computing and storing it on a miss.
+
+        Args:
+            stage (str): Pipeline stage name, e.g. "summary"
+            video_id (str): YouTube video ID
+            compute (callable): Zero-argument function producing the result
+            **inputs: Every input that affects the stage's output
+
+        Returns:
+            The cached or freshly computed value
+
+        """
+        missing = object()
+        value = self.get(stage, video_id, default=missing, **inputs)
+        if value is missing:
+            value = compute()
+            self.set(stage, video_id, value, **inputs)
+        return value
+
+    def evict(self) -> None:
+        """Remove expired entries and enforce the size limit.
+
+        Safe to run concurrently from several processes: entries that another
+        process already removed are simply skipped.
+        """
+        entries = []
+        now = time.time()
+        for path in self.root.glob("*/*/*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if self.ttl_seconds and now - stat.st_mtime > self.ttl_seconds:
+                # mtime is refreshed on every hit, so this only drops entries
+                # that are both old and unused
+                self._remove(path)
+                continue
+            size = stat.st_size
+            with contextlib.suppress(FileNotFoundError):
+                size += self._value_path(path).stat().st_size
+            entries.append((stat.st_mtime, size, path))
+
+        total = sum(size for _, size, _ in entries)
+        if not self.max_bytes or total <= self.max_bytes:
+            return
+
+        entries.sort()
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+            removed += 1
+        logger.info("Evicted %d cache entries to stay under size limit", removed)
+
+    def _remove(self, path: Path) -> None:
+        """Delete an entry and its binary value, if any."""
+        path.unlink(missing_ok=True)
+        self._value_path(path).unlink(missing_ok=True)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    """Return the process-wide ResultCache, creating it on first use."""
+    global _cache  # noqa: PLW0603
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResultCache()
+        return _cache
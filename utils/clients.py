@@ -0,0 +1,228 @@
+"""Shared, lazily created API clients for YouTube and Gemini.
+
+Building a client is far more expensive than using one: the YouTube service
+parses its discovery document and sets up a fresh HTTP stack, and Gemini
+models open their own channels. These helpers create each client once and
+hand out the same instance on every call so per-video overhead is just the
+request itself. The client libraries themselves are imported on first use, so
+runs that never reach a backend do not pay for importing it.
+"""
+
+import threading
+import time
+from typing import TYPE_CHECKING
+
+import config
+from utils.metrics import get_metrics, llm_cost
+from utils.rate_limit import (
+    get_gemini_request_limiter,
+    get_gemini_token_limiter,
+    get_youtube_limiter,
+    get_youtube_quota,
+    retry_with_backoff,
+    retry_with_backoff_async,
+)
+from utils.transcript_utils import estimate_tokens
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    import google.generativeai as genai
+    from googleapiclient.discovery import Resource
+    from googleapiclient.http import HttpRequest
+
+    from utils.metrics import Span
+
+_lock = threading.Lock()
+_thread_local = threading.local()
+_youtube_discovery_doc = None
+_gemini_configured = False
+_gemini_models = {}
+
+
+def get_youtube_service() -> "Resource":
+    """Return the YouTube Data API service for the calling thread.
+
+    The discovery document is loaded once per process. httplib2 connections
+    are not thread-safe, so each thread gets its own service object wrapping
+    its own keep-alive HTTP connection pool, built on the thread's first call.
+    """
+    service = getattr(_thread_local, "youtube_service", None)
+    if service is None:
+        import googleapiclient.discovery  # noqa: PLC0415
+        import googleapiclient.http  # noqa: PLC0415
+
+        service = googleapiclient.discovery.build_from_document(
+            _get_youtube_discovery_doc(),
+            developerKey=config.YOUTUBE_API_KEY,
+            http=googleapiclient.http.build_http(),
+        )
+        _thread_local.youtube_service = service
+    return service
+
+
+def execute_youtube_request(request: "HttpRequest", units: int) -> dict:
+    """Execute a YouTube Data API request under the shared limits.
+
+    The API bills every attempt, so each retry is charged against the quota
+    and waits for the rate limiter like the first attempt.
+
+    Args:
+        request: An unexecuted googleapiclient request
+        units (int): Quota cost of the request (e.g. 1 for videos.list)
+
+    Returns:
+        The decoded response
+
+    Raises:
+        QuotaExceededError: If the daily unit quota would be exceeded
+
+    """
+
+    def attempt() -> dict:
+        get_youtube_quota().charge(units)
+        get_youtube_limiter().acquire()
+        return request.execute()
+
+    return retry_with_backoff(attempt)
+
+
+def _get_youtube_discovery_doc() -> dict:
+    """Load and memoize the YouTube Data API discovery document."""
+    global _youtube_discovery_doc  # noqa: PLW0603
+    with _lock:
+        if _youtube_discovery_doc is None:
+            import googleapiclient.discovery  # noqa: PLC0415
+
+            service = googleapiclient.discovery.build(
+                config.YOUTUBE_API_SERVICE_NAME,
+                config.YOUTUBE_API_VERSION,
+                developerKey=config.YOUTUBE_API_KEY,
+                cache_discovery=False,
+            )
+            _youtube_discovery_doc = service._rootDesc  # noqa: SLF001
+        return _youtube_discovery_doc
+
+
+class RateLimitedModel:
+    """Wraps a Gemini model so every call waits for rate-limit capacity.
+
+    Requests-per-minute and input-tokens-per-minute are limited across all
+    threads and event loops in the process, and throttled or transient
+    failures are retried with backoff; every attempt, retries included, waits
+    for capacity. Each call is recorded as a
+    "gemini_call" metrics span with its token usage and estimated cost.
+    """
+
+    def __init__(self, model: "genai.GenerativeModel") -> None:
+        """Wrap a Gemini model client."""
+        self.model = model
+
+    def generate_content(self, prompt: str, **kwargs: object) -> object:
+        """Rate-limited, retrying ``GenerativeModel.generate_content``.
+
+        With ``stream=True`` the chunks are returned through a generator, so
+        the call's span can be finished once the caller has consumed them.
+        """
+        metrics = get_metrics()
+        call = metrics.start_span("gemini_call", model=self._model_name())
+        tokens = estimate_tokens(str(prompt))
+
+        def attempt() -> object:
+            start = time.perf_counter()
+            get_gemini_request_limiter().acquire()
+            get_gemini_token_limiter().acquire(tokens)
+            self._add_wait(call, time.perf_counter() - start)
+            return self.model.generate_content(prompt, **kwargs)
+
+        try:
+            response = retry_with_backoff(attempt)
+        except BaseException as e:
+            metrics.finish(call, e)
+            raise
+        if kwargs.get("stream"):
+            return self._metered_stream(response, call)
+        self._record_usage(call, response)
+        metrics.finish(call)
+        return response
+
+    async def generate_content_async(self, prompt: str, **kwargs: object) -> object:
+        """Rate-limited, retrying ``GenerativeModel.generate_content_async``."""
+        with get_metrics().span("gemini_call", model=self._model_name()) as call:
+            tokens = estimate_tokens(str(prompt))
+
+            async def attempt() -> object:
+                start = time.perf_counter()
+                await get_gemini_request_limiter().acquire_async()
+                await get_gemini_token_limiter().acquire_async(tokens)
+                self._add_wait(call, time.perf_counter() - start)
+                return await self.model.generate_content_async(prompt, **kwargs)
+
+            response = await retry_with_backoff_async(attempt)
+            self._record_usage(call, response)
+        return response
+
+    @staticmethod
+    def _add_wait(call: "Span", seconds: float) -> None:
+        """Add time spent waiting for rate-limit capacity to the call's span."""
+        call.set(wait_seconds=call.attributes.get("wait_seconds", 0.0) + seconds)
+
+    def _model_name(self) -> str | None:
+        """Return the model's name for labelling its spans."""
+        return getattr(self.model, "model_name", None)
+
+    def _metered_stream(
+        self, response: "Iterable", call: "Span",
+    ) -> "Iterator":
+        """Yield streamed chunks, finishing the call's span when they run out."""
+        error = None
+        try:
+            yield from response
+            self._record_usage(call, response)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            get_metrics().finish(call, error)
+
+    @staticmethod
+    def _record_usage(call: "Span", response: object) -> None:
+        """Attach the token counts Gemini reports for a response to its span."""
+        usage = getattr(response, "usage_metadata", None)
+        if usage is None:
+            return
+        input_tokens = getattr(usage, "prompt_token_count", 0) or 0
+        output_tokens = getattr(usage, "candidates_token_count", 0) or 0
+        call.set(
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cost_usd=llm_cost(input_tokens, output_tokens),
+        )
+
+
+def get_gemini_model(model_name: str | None = None) -> RateLimitedModel:
+    """Return the shared Gemini model client, configuring the API on first use.
+
+    The underlying gRPC channel is thread-safe and multiplexes concurrent
+    requests over pooled connections, so one instance serves every thread.
+
+    Args:
+        model_name (str): Gemini model name; defaults to config.GEMINI_MODEL
+
+    Returns:
+        RateLimitedModel: The shared, rate-limited model client
+
+    """
+    global _gemini_configured  # noqa: PLW0603
+    model_name = model_name or config.GEMINI_MODEL
+    with _lock:
+        import google.generativeai as genai  # noqa: PLC0415
+
+        if not _gemini_configured:
+            genai.configure(api_key=config.GEMINI_API_KEY)
+            _gemini_configured = True
+        model = _gemini_models.get(model_name)
+        if model is None:
+            model = RateLimitedModel(genai.GenerativeModel(model_name))
+            _gemini_models[model_name] = model
+        return model
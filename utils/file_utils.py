@@ -1,17 +1,53 @@
 import json
+import os
+import tempfile
 from pathlib import Path
 
 
 def load_json(file_path: str) -> dict:
     """Load a JSON file."""
     with Path(file_path).open(encoding="utf-8") as f:
-        json.load(f)
+        return json.load(f)
 
 
 def save_json(data: dict, file_path: str) -> None:
-    """Save data to a JSON file."""
-    with Path(file_path).open(encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    """Save data to a JSON file.
+
+    The data is written to a temporary file in the same directory and moved
+    into place, so readers never observe a partially written file.
+    """
+    directory = Path(file_path).parent
+    directory.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False, default=_json_default)
+        Path(tmp_path).replace(file_path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def save_bytes(data: bytes, file_path: str) -> None:
+    """Write bytes to a file atomically (temporary file + rename)."""
+    directory = Path(file_path).parent
+    directory.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        Path(tmp_path).replace(file_path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def _json_default(obj: object) -> list:
+    """Serialize objects with a ``to_list`` method, such as Transcript."""
+    if hasattr(obj, "to_list"):
+        return obj.to_list()
+    msg = f"Object of type {type(obj).__name__} is not JSON serializable"
+    raise TypeError(msg)
 
 
 def file_exists(file_path: str) -> bool:
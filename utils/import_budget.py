@@ -0,0 +1,92 @@
+"""Check that CLI startup stays within its import-time budget.
+
+Heavy dependencies (torch via Whisper, youtube-dl, the Google client
+libraries) are imported only by the stages that need them. This check imports
+the entry point in a fresh interpreter and fails if it takes longer than
+config.IMPORT_TIME_BUDGET_MS or eagerly pulls in any heavy module::
+
+    python -m utils.import_budget [module]
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import config
+
+# Modules that must not be imported just by loading the CLI
+HEAVY_MODULES = (
+    "torch",
+    "whisper",
+    "youtube_dl",
+    "numpy",
+    "google.generativeai",
+    "googleapiclient",
+)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def measure_import(module: str = "main") -> dict:
+    """Import a module in a fresh interpreter and report what it cost.
+
+    Args:
+        module (str): Module to import, relative to the repository root
+
+    Returns:
+        dict: ``total_ms`` (cumulative import time), ``heavy`` (heavy modules
+            that ended up loaded) and ``slowest`` (the ten slowest imports as
+            (cumulative_ms, name) pairs)
+
+    """
+    code = (
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    timings = []
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        timings.append((int(cumulative) / 1000, name.strip()))
+        if name.strip() == module:
+            total_us = int(cumulative)
+
+    heavy = [name for name in result.stdout.strip().split(",") if name]
+    return {
+        "total_ms": total_us / 1000,
+        "heavy": heavy,
+        "slowest": sorted(timings, reverse=True)[:10],
+    }
+
+
+def main(module: str = "main") -> int:
+    """Print the import cost of ``module`` and return a process exit code."""
+    report = measure_import(module)
+    budget = config.IMPORT_TIME_BUDGET_MS
+
+    print(f"import {module}: {report['total_ms']:.0f} ms (budget {budget} ms)")
+    for cumulative_ms, name in report["slowest"]:
+        print(f"  {cumulative_ms:8.1f} ms  {name}")
+
+    ok = True
+    if report["heavy"]:
+        print(f"Heavy modules imported at startup: {', '.join(report['heavy'])}")
+        ok = False
+    if report["total_ms"] > budget:
+        print("Import time budget exceeded")
+        ok = False
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:]))
@@ -0,0 +1,312 @@
+"""Structured per-stage metrics: timing, bytes, audio, tokens, cost and cache use.
+
+Pipeline stages wrap their work in ``span()``::
+
+    with span("caption_download") as s:
+        data = download()
+        s.set(bytes=len(data))
+
+Spans nest (each records the name of the span it ran inside, so a Gemini call
+can be attributed to the key point or summary stage) and are tagged with the
+video being processed by the enclosing ``video_scope()``. Every finished span
+is passed to the hooks registered on the process-wide MetricsRecorder and
+folded into running totals, which can be exported as Prometheus text. Use
+JsonLinesWriter as a hook to stream the raw spans to a file.
+"""
+
+import contextlib
+import contextvars
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# Numeric span attributes that are summed into the per-stage and per-video totals
+SUMMED_ATTRIBUTES = (
+    "bytes",
+    "audio_seconds",
+    "input_tokens",
+    "output_tokens",
+    "cost_usd",
+)
+
+_PROMETHEUS_PREFIX = "yt_summarizer"
+
+_current_video = contextvars.ContextVar("metrics_video_id", default=None)
+_current_span = contextvars.ContextVar("metrics_span", default=None)
+
+
+@dataclass
+class Span:
+    """One timed unit of pipeline work."""
+
+    name: str
+    video_id: str | None = None
+    parent: str | None = None
+    started_at: float = field(default_factory=time.time)
+    duration: float = 0.0
+    error: str | None = None
+    attributes: dict = field(default_factory=dict)
+    _start: float = field(default_factory=time.perf_counter, repr=False)
+
+    def set(self, **attributes: object) -> None:
+        """Attach attributes (bytes, audio_seconds, input_tokens...) to the span."""
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> dict:
+        """Return the span as a JSON-serializable dict."""
+        return {
+            "name": self.name,
+            "video_id": self.video_id,
+            "parent": self.parent,
+            "started_at": self.started_at,
+            "duration": self.duration,
+            "error": self.error,
+            **self.attributes,
+        }
+
+
+class MetricsRecorder:
+    """Collects finished spans, calls hooks and keeps running totals."""
+
+    def __init__(self) -> None:
+        """Initialize an empty MetricsRecorder."""
+        self._hooks = []
+        self._lock = threading.Lock()
+        self._stages = defaultdict(lambda: defaultdict(float))
+        self._videos = defaultdict(lambda: defaultdict(float))
+        self._cache = defaultdict(int)
+
+    def add_hook(self, hook: Callable[[Span], object]) -> None:
+        """Call ``hook(span)`` for every span finished from now on."""
+        with self._lock:
+            self._hooks.append(hook)
+
+    def remove_hook(self, hook: Callable[[Span], object]) -> None:
+        """Stop calling a hook registered with add_hook."""
+        with self._lock:
+            self._hooks.remove(hook)
+
+    def start_span(self, name: str, **attributes: object) -> Span:
+        """Start a span without entering it; finish it with ``finish``.
+
+        Used for work whose end is not lexically scoped, such as a streamed
+        response consumed by the caller. Prefer ``span()`` otherwise.
+        """
+        parent = _current_span.get()
+        return Span(
+            name=name,
+            video_id=_current_video.get(),
+            parent=parent.name if parent else None,
+            attributes=attributes,
+        )
+
+    def finish(self, span: Span, error: BaseException | None = None) -> None:
+        """Record a finished span: update totals and call the hooks."""
+        span.duration = time.perf_counter() - span._start  # noqa: SLF001
+        if error is not None:
+            span.error = f"{type(error).__name__}: {error}"
+
+        with self._lock:
+            stage = self._stages[span.name]
+            stage["count"] += 1
+            stage["seconds"] += span.duration
+            stage["errors"] += span.error is not None
+            video = self._videos[span.video_id] if span.video_id else None
+            for name in SUMMED_ATTRIBUTES:
+                value = span.attributes.get(name)
+                if value:
+                    stage[name] += value
+                    if video is not None:
+                        video[name] += value
+            hooks = list(self._hooks)
+
+        for hook in hooks:
+            try:
+                hook(span)
+            except Exception:
+                logger.exception("Metrics hook failed")
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attributes: object) -> Iterator[Span]:
+        """Time the enclosed block as a span named ``name``.
+
+        Yields:
+            Span: The running span, for attaching attributes
+
+        """
+        current = self.start_span(name, **attributes)
+        token = _current_span.set(current)
+        error = None
+        try:
+            yield current
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            _current_span.reset(token)
+            self.finish(current, error)
+
+    def record_cache(self, stage: str, video_id: str, *, hit: bool) -> None:
+        """Record a result cache lookup as a zero-length "cache" span."""
+        result = "hit" if hit else "miss"
+        with self._lock:
+            self._cache[stage, result] += 1
+        current = self.start_span("cache", stage=stage, result=result)
+        current.video_id = video_id
+        self.finish(current)
+
+    def stage_totals(self) -> dict:
+        """Return the totals for each span name (count, seconds, tokens...)."""
+        with self._lock:
+            return {name: dict(totals) for name, totals in self._stages.items()}
+
+    def video_totals(self, video_id: str) -> dict:
+        """Return summed bytes, audio seconds, tokens and cost for one video."""
+        with self._lock:
+            return dict(self._videos.get(video_id, {}))
+
+    def cache_totals(self) -> dict:
+        """Return cache lookups counted by (stage, "hit" | "miss")."""
+        with self._lock:
+            return dict(self._cache)
+
+    def to_prometheus(self) -> str:
+        """Render the running totals in the Prometheus text exposition format."""
+        stages = self.stage_totals()
+        cache = self.cache_totals()
+        lines = []
+
+        def metric(name: str, kind: str, help_text: str, samples: list) -> None:
+            lines.append(f"# HELP {_PROMETHEUS_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {_PROMETHEUS_PREFIX}_{name} {kind}")
+            for suffix, labels, value in samples:
+                label_text = ",".join(f'{key}="{val}"' for key, val in labels.items())
+                lines.append(
+                    f"{_PROMETHEUS_PREFIX}_{name}{suffix}{{{label_text}}} {value:g}",
+                )
+
+        metric(
+            "stage_seconds",
+            "summary",
+            "Time spent in each pipeline stage.",
+            [
+                (suffix, {"stage": stage}, totals[key])
+                for stage, totals in sorted(stages.items())
+                for suffix, key in (("_count", "count"), ("_sum", "seconds"))
+            ],
+        )
+        metric(
+            "stage_errors_total",
+            "counter",
+            "Pipeline stage runs that raised an error.",
+            [
+                ("", {"stage": stage}, totals["errors"])
+                for stage, totals in sorted(stages.items())
+            ],
+        )
+        for attribute, help_text in (
+            ("bytes", "Bytes downloaded by each stage."),
+            ("audio_seconds", "Seconds of audio processed by each stage."),
+            ("cost_usd", "Estimated LLM spend in US dollars."),
+        ):
+            metric(
+                f"{attribute}_total",
+                "counter",
+                help_text,
+                [
+                    ("", {"stage": stage}, totals[attribute])
+                    for stage, totals in sorted(stages.items())
+                    if attribute in totals
+                ],
+            )
+        metric(
+            "llm_tokens_total",
+            "counter",
+            "LLM tokens used, by direction.",
+            [
+                (
+                    "",
+                    {"stage": stage, "direction": direction},
+                    totals[f"{direction}_tokens"],
+                )
+                for stage, totals in sorted(stages.items())
+                for direction in ("input", "output")
+                if f"{direction}_tokens" in totals
+            ],
+        )
+        metric(
+            "cache_requests_total",
+            "counter",
+            "Result cache lookups, by outcome.",
+            [
+                ("", {"stage": stage, "result": result}, count)
+                for (stage, result), count in sorted(cache.items())
+            ],
+        )
+        return "\n".join(lines) + "\n"
+
+
+class JsonLinesWriter:
+    """Metrics hook that appends every finished span to a JSON-lines file."""
+
+    def __init__(self, path: str) -> None:
+        """Open ``path`` for appending."""
+        self._file = Path(path).open("a", encoding="utf-8")  # noqa: SIM115
+        self._lock = threading.Lock()
+
+    def __call__(self, span: Span) -> None:
+        """Write one span as a line of JSON."""
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        """Close the underlying file."""
+        with self._lock:
+            self._file.close()
+
+
+def llm_cost(input_tokens: int, output_tokens: int) -> float:
+    """Estimate the cost of an LLM call from config.GEMINI_*_COST_PER_MTOK."""
+    return (
+        input_tokens * config.GEMINI_INPUT_COST_PER_MTOK
+        + output_tokens * config.GEMINI_OUTPUT_COST_PER_MTOK
+    ) / 1_000_000
+
+
+@contextlib.contextmanager
+def video_scope(video_id: str) -> Iterator[None]:
+    """Tag every span started inside the block with ``video_id``."""
+    token = _current_video.set(video_id)
+    try:
+        yield
+    finally:
+        _current_video.reset(token)
+
+
+_recorder = None
+_recorder_lock = threading.Lock()
+
+
+def get_metrics() -> MetricsRecorder:
+    """Return the process-wide MetricsRecorder, creating it on first use."""
+    global _recorder  # noqa: PLW0603
+    with _recorder_lock:
+        if _recorder is None:
+            _recorder = MetricsRecorder()
+        return _recorder
+
+
+def span(name: str, **attributes: object) -> contextlib.AbstractContextManager[Span]:
+    """Time a block as a span on the process-wide recorder (see MetricsRecorder)."""
+    return get_metrics().span(name, **attributes)
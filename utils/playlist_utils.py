@@ -0,0 +1,93 @@
+"""Paging through playlists and channel uploads with the YouTube Data API."""
+
+import logging
+from collections.abc import Iterator
+
+from utils.clients import execute_youtube_request, get_youtube_service
+from utils.metrics import span
+from utils.youtube_utils import YouTubeLink
+
+logger = logging.getLogger(__name__)
+
+# playlistItems().list returns at most this many items per page
+PAGE_SIZE = 50
+
+# Playlist items that no longer point at a watchable video
+_UNAVAILABLE_STATUSES = ("private", "privacyStatusUnspecified")
+
+# channels().list filter for each kind of channel link
+_CHANNEL_FILTERS = {"channel": "id", "handle": "forHandle", "user": "forUsername"}
+
+
+def resolve_playlist_id(link: YouTubeLink) -> str:
+    """Return the playlist holding the videos of a playlist or channel link.
+
+    A channel's videos are its uploads playlist, which lists the newest upload
+    first.
+
+    Args:
+        link (YouTubeLink): A playlist, channel, handle or user link
+
+    Returns:
+        str: Playlist ID
+
+    Raises:
+        ValueError: If the link is a single video or the channel does not exist
+
+    """
+    if link.kind == "playlist":
+        return link.id
+    if link.kind not in _CHANNEL_FILTERS:
+        msg = f"Not a playlist or channel: {link}"
+        raise ValueError(msg)
+
+    with span("channel_lookup"):
+        request = get_youtube_service().channels().list(
+            part="contentDetails",
+            **{_CHANNEL_FILTERS[link.kind]: link.id})
+        results = execute_youtube_request(request, units=1)
+
+    items = results.get("items", [])
+    if not items:
+        msg = f"Channel not found: {link.id}"
+        raise ValueError(msg)
+    return items[0]["contentDetails"]["relatedPlaylists"]["uploads"]
+
+
+def iter_playlist_pages(playlist_id: str) -> Iterator[list[str]]:
+    """Yield the video IDs of a playlist, one page of up to 50 at a time.
+
+    Each page is only requested once the previous one has been consumed, so a
+    caller that stops early (or is slower than the API) never fetches more
+    than it uses. Private and deleted videos are left out.
+
+    Args:
+        playlist_id (str): Playlist ID
+
+    Yields:
+        list: Video IDs in playlist order
+
+    """
+    page_token = None
+    while True:
+        params = {
+            "part": "contentDetails,status",
+            "playlistId": playlist_id,
+            "maxResults": PAGE_SIZE,
+        }
+        if page_token:
+            params["pageToken"] = page_token
+        with span("playlist_page") as page:
+            request = get_youtube_service().playlistItems().list(**params)
+            results = execute_youtube_request(request, units=1)
+            items = results.get("items", [])
+            page.set(videos=len(items))
+
+        yield [
+            item["contentDetails"]["videoId"]
+            for item in items
+            if item.get("status", {}).get("privacyStatus") not in _UNAVAILABLE_STATUSES
+        ]
+        page_token = results.get("nextPageToken")
+        if not page_token:
+            return
@@ -0,0 +1,319 @@
+"""Rate limiting, retry and quota tracking for external API calls.
+
+Every backend (YouTube Data API, Gemini) gets a shared token bucket so that
+concurrent pipelines queue for capacity instead of bursting past the allowed
+rate and failing. Throttling and transient server errors are retried with
+jittered exponential backoff; YouTube's daily unit quota is tracked on disk so
+it is shared by every process using the same OUTPUT_DIR.
+"""
+
+import asyncio
+import datetime as dt
+import logging
+import os
+import random
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Self
+from zoneinfo import ZoneInfo
+
+import config
+from utils.file_utils import load_json, save_json
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses worth retrying: throttling and transient server errors
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+# YouTube reports both throttling and an exhausted quota as 403 Forbidden
+HTTP_FORBIDDEN = 403
+
+# YouTube reports throttling as 403 with one of these reasons
+RETRYABLE_REASONS = ("rateLimitExceeded", "userRateLimitExceeded")
+
+# YouTube daily quotas reset at midnight Pacific Time
+QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+
+
+class ApiLimitError(RuntimeError):
+    """Base for errors meaning an API cannot be called right now.
+
+    Neither is a reason to fall back to another backend: the limit applies to
+    every caller, and retrying elsewhere would only waste work.
+    """
+
+
+class ThrottledError(ApiLimitError):
+    """Raised when a call is still throttled after every retry."""
+
+
+class QuotaExceededError(ApiLimitError):
+    """Raised when a call would exceed the daily API quota."""
+
+
+class TokenBucket:
+    """Thread- and asyncio-safe token bucket.
+
+    Callers reserve tokens up front and then wait for the returned delay, so
+    waiters are served in order and the long-run rate never exceeds ``rate``.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        """Initialize the TokenBucket.
+
+        Args:
+            rate (float): Tokens added per second; 0 disables limiting
+            capacity (float): Maximum burst size; defaults to one second's worth
+
+        """
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1) -> float:
+        """Take tokens from the bucket, returning how long to wait before using them."""
+        if not self.rate:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate,
+            )
+            self._updated = now
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self, tokens: float = 1) -> None:
+        """Block until ``tokens`` are available."""
+        delay = self.reserve(tokens)
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self, tokens: float = 1) -> None:
+        """Wait without blocking the event loop until ``tokens`` are available."""
+        delay = self.reserve(tokens)
+        if delay:
+            await asyncio.sleep(delay)
+
+
+def _status_of(exc: BaseException) -> int | None:
+    """Extract the HTTP status from googleapiclient or google.api_core errors."""
+    resp = getattr(exc, "resp", None)
+    if resp is not None and getattr(resp, "status", None) is not None:
+        return int(resp.status)
+    code = getattr(exc, "code", None)
+    return int(code) if isinstance(code, int) else None
+
+
+def is_quota_exceeded(exc: BaseException) -> bool:
+    """Whether an error means the daily quota is used up (not worth retrying)."""
+    return _status_of(exc) == HTTP_FORBIDDEN and "quotaExceeded" in str(exc)
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Whether an error is throttling or a transient server failure."""
+    status = _status_of(exc)
+    if status in RETRYABLE_STATUSES:
+        return True
+    return status == HTTP_FORBIDDEN and any(
+        reason in str(exc) for reason in RETRYABLE_REASONS
+    )
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff delay for a retry attempt."""
+    ceiling = min(
+        config.API_BACKOFF_MAX_SECONDS, config.API_BACKOFF_BASE_SECONDS * 2**attempt,
+    )
+    return random.uniform(0, ceiling)  # noqa: S311
+
+
+def _final_error(exc: Exception, attempt: int) -> Exception:
+    """Translate a final failure into the error callers should see."""
+    if is_quota_exceeded(exc):
+        return QuotaExceededError(f"API quota exceeded: {exc}")
+    if is_retryable(exc) and attempt >= config.API_MAX_RETRIES:
+        return ThrottledError(f"Still throttled after {attempt} retries: {exc}")
+    return exc
+
+
+def retry_with_backoff(
+    func: Callable[..., object], *args: object, **kwargs: object,
+) -> object:
+    """Call ``func``, retrying throttling and transient errors with backoff.
+
+    Raises:
+        ThrottledError: If the call is still throttled after API_MAX_RETRIES
+        QuotaExceededError: If the API reports its quota as exhausted
+
+    """
+    attempt = 0
+    while True:
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            if not is_retryable(e) or attempt >= config.API_MAX_RETRIES:
+                error = _final_error(e, attempt)
+                if error is e:
+                    raise
+                raise error from e
+            delay = _backoff_delay(attempt)
+            logger.warning("Retryable API error (%s); retrying in %.1fs", e, delay)
+            time.sleep(delay)
+            attempt += 1
+
+
+async def retry_with_backoff_async(
+    func: Callable[..., Awaitable[object]], *args: object, **kwargs: object,
+) -> object:
+    """Await ``func``, retrying throttling and transient errors with backoff."""
+    attempt = 0
+    while True:
+        try:
+            return await func(*args, **kwargs)
+        except Exception as e:
+            if not is_retryable(e) or attempt >= config.API_MAX_RETRIES:
+                error = _final_error(e, attempt)
+                if error is e:
+                    raise
+                raise error from e
+            delay = _backoff_delay(attempt)
+            logger.warning("Retryable API error (%s); retrying in %.1fs", e, delay)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+class QuotaTracker:
+    """Tracks units spent against a daily quota, shared through a file on disk."""
+
+    def __init__(self, path: str | Path, daily_limit: int) -> None:
+        """Initialize the QuotaTracker.
+
+        Args:
+            path (str | Path): JSON file recording today's usage
+            daily_limit (int): Units available per day; 0 disables tracking
+
+        """
+        self.path = Path(path)
+        self.daily_limit = daily_limit
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _today() -> str:
+        return dt.datetime.now(QUOTA_TIMEZONE).date().isoformat()
+
+    def charge(self, units: int) -> None:
+        """Record ``units`` as spent today.
+
+        Raises:
+            QuotaExceededError: If the charge would exceed the daily limit
+
+        """
+        if not self.daily_limit:
+            return
+        with self._lock, self._file_lock():
+            today = self._today()
+            try:
+                usage = load_json(self.path)
+            except (FileNotFoundError, ValueError):
+                usage = {}
+            used = usage.get("used", 0) if usage.get("date") == today else 0
+            if used + units > self.daily_limit:
+                msg = (
+                    f"Daily quota of {self.daily_limit} units exhausted "
+                    f"({used} used, {units} requested)"
+                )
+                raise QuotaExceededError(msg)
+            save_json({"date": today, "used": used + units}, self.path)
+
+    def remaining(self) -> int:
+        """Return the units still available today."""
+        try:
+            usage = load_json(self.path)
+        except (FileNotFoundError, ValueError):
+            return self.daily_limit
+        if usage.get("date") != self._today():
+            return self.daily_limit
+        return max(0, self.daily_limit - usage.get("used", 0))
+
+    def _file_lock(self) -> "_FileLock | _NullLock":
+        """Lock the usage file across processes, where the platform allows."""
+        return _FileLock(f"{self.path}.lock") if fcntl else _NullLock()
+
+
+class _FileLock:
+    """Exclusive advisory lock on a file, held for the duration of a with block."""
+
+    def __init__(self, path: str) -> None:
+        """Remember the lock file; it is opened on entering the block."""
+        self.path = path
+        self._fd = None
+
+    def __enter__(self) -> Self:
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(self.path, os.O_CREAT | os.O_RDWR)
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+
+
+class _NullLock:
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        return None
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_youtube_limiter() -> TokenBucket:
+    """Return the shared YouTube Data API request-rate limiter."""
+    return _get_limiter("youtube", lambda: TokenBucket(config.YOUTUBE_QPS))
+
+
+def get_gemini_request_limiter() -> TokenBucket:
+    """Return the shared Gemini requests-per-minute limiter."""
+    return _get_limiter("gemini_rpm", lambda: TokenBucket(config.GEMINI_RPM / 60))
+
+
+def get_gemini_token_limiter() -> TokenBucket:
+    """Return the shared Gemini input-tokens-per-minute limiter."""
+    return _get_limiter(
+        "gemini_tpm",
+        lambda: TokenBucket(config.GEMINI_TPM / 60, capacity=config.GEMINI_TPM),
+    )
+
+
+def get_youtube_quota() -> QuotaTracker:
+    """Return the shared tracker for the YouTube Data API daily unit quota."""
+    return _get_limiter(
+        "youtube_quota",
+        lambda: QuotaTracker(
+            Path(config.OUTPUT_DIR) / "youtube_quota.json",
+            config.YOUTUBE_DAILY_QUOTA,
+        ),
+    )
+
+
+def _get_limiter(name: str, factory: Callable[[], object]) -> object:
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            limiter = factory()
+            _limiters[name] = limiter
+        return limiter
@@ -0,0 +1,49 @@
+"""Utility functions for parsing SRT and WebVTT subtitles.
+
+The parser is a single-pass state machine over lines, so it runs in linear
+time, never holds more than one cue in memory, and yields segments while the
+input is still being read.
+"""
+
+from collections.abc import Iterable, Iterator
+
+from utils.time_helpers import time_to_seconds
+
+
+def iter_subtitle_segments(lines: Iterable[str]) -> Iterator[dict]:
+    """Parse SRT or WebVTT subtitles, yielding one segment per cue.
+
+    Cue numbers, the WEBVTT header, NOTE/STYLE blocks and cue settings are
+    skipped. Multi-line cue text is joined with spaces.
+
+    Args:
+        lines (iterable): Lines of the subtitle file, e.g. an open file or
+            ``io.StringIO``
+
+    Yields:
+        dict: Segments with "start", "end" and "text", ready for format_transcript
+
+    """
+    start = end = None
+    text_lines = []
+    for raw_line in lines:
+        line = raw_line.strip().lstrip("\ufeff")
+        if not line:
+            # A blank line ends the current cue
+            if start is not None and text_lines:
+                yield {"start": start, "end": end, "text": " ".join(text_lines)}
+            start = None
+            text_lines = []
+        elif "-->" in line:
+            if start is not None and text_lines:
+                yield {"start": start, "end": end, "text": " ".join(text_lines)}
+            left, _, right = line.partition("-->")
+            start = time_to_seconds(left.strip())
+            # WebVTT may follow the end time with cue settings
+            end = time_to_seconds(right.split()[0])
+            text_lines = []
+        elif start is not None:
+            text_lines.append(line)
+
+    if start is not None and text_lines:
+        yield {"start": start, "end": end, "text": " ".join(text_lines)}
@@ -3,11 +3,22 @@
 This module provides functions to convert between different time formats:
 - time_to_seconds: converts time string (HH:MM:SS,mmm) to seconds
 - seconds_to_timestamp: converts seconds to formatted timestamp
+- iso_duration_to_seconds: converts an ISO 8601 duration (PT1H2M3S) to seconds
 """
 
+import re
+
+_ISO_DURATION = re.compile(
+    r"P(?:(?P<days>\d+)D)?"
+    r"(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>[\d.]+)S)?)?$",
+)
+
 def time_to_seconds(time_str: str) -> float:
     """Convert time string (HH:MM:SS,mmm) to seconds.
 
+    WebVTT forms are accepted too: "." as the millisecond separator and the
+    hours field may be omitted ("MM:SS.mmm").
+
     Args:
         time_str (str): Time string in format "00:00:00,000"
 
@@ -15,8 +26,10 @@ def time_to_seconds(time_str: str) -> float:
         float: Time in seconds
 
     """
-    hours, minutes, seconds = time_str.replace(",", ".").split(":")
-    return float(hours) * 3600 + float(minutes) * 60 + float(seconds)
+    seconds = 0.0
+    for part in time_str.replace(",", ".").split(":"):
+        seconds = seconds * 60 + float(part)
+    return seconds
 
 def seconds_to_timestamp(seconds: any) -> str:
     """Convert seconds to a human-readable timestamp.
@@ -31,3 +44,24 @@ def seconds_to_timestamp(seconds: any) -> str:
     minutes = int(seconds // 60)
     secs = int(seconds % 60)
     return f"{minutes:02d}:{secs:02d}"
+
+def iso_duration_to_seconds(duration: str) -> float:
+    """Convert an ISO 8601 duration, as used by the YouTube Data API, to seconds.
+
+    Args:
+        duration (str): Duration such as "PT1H2M3S" or "P1DT2H"
+
+    Returns:
+        float: Duration in seconds, or 0.0 if it cannot be parsed
+
+    """
+    match = _ISO_DURATION.match(duration or "")
+    if not match:
+        return 0.0
+    parts = {name: float(value or 0) for name, value in match.groupdict().items()}
+    return (
+        parts["days"] * 86400
+        + parts["hours"] * 3600
+        + parts["minutes"] * 60
+        + parts["seconds"]
+    )
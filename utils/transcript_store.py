@@ -0,0 +1,193 @@
+"""Binary on-disk storage for transcripts.
+
+A transcript file is a 16-byte header (magic, format version, flags) followed
+by the columnar layout of ``Transcript.to_bytes``: start times, end times and
+text offsets as fixed-width arrays, then all segment text as one UTF-8 blob.
+Uncompressed files are memory-mapped and used in place, so loading one costs
+a header check rather than parsing every segment. Files may optionally be
+zlib-compressed to save disk space at the cost of a decompression on load.
+
+Existing ``*_transcript.json`` files can be migrated with::
+
+    python -m utils.transcript_store [directory] [--compress] [--remove-json]
+"""
+
+import argparse
+import logging
+import mmap
+import os
+import struct
+import zlib
+from pathlib import Path
+
+import config
+from utils.file_utils import load_json, save_bytes, save_json
+from utils.transcript_utils import Transcript
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct("<4sHH8x")
+_MAGIC = b"YTTS"
+_VERSION = 1
+_FLAG_ZLIB = 1
+
+BINARY_SUFFIX = ".bin"
+JSON_SUFFIX = ".json"
+
+
+def save_transcript(
+    transcript: Transcript | list, file_path: str, *, compress: bool | None = None,
+) -> None:
+    """Save a transcript in the binary format.
+
+    Args:
+        transcript (Transcript | list): Transcript to save
+        file_path (str): Destination path
+        compress (bool): zlib-compress the body; defaults to
+            config.TRANSCRIPT_COMPRESS
+
+    """
+    if compress is None:
+        compress = config.TRANSCRIPT_COMPRESS
+    body = Transcript.from_segments(transcript).to_bytes()
+    flags = 0
+    if compress:
+        body = zlib.compress(body)
+        flags |= _FLAG_ZLIB
+    save_bytes(_HEADER.pack(_MAGIC, _VERSION, flags) + body, file_path)
+
+
+def load_transcript(file_path: str) -> Transcript:
+    """Load a binary transcript file.
+
+    Uncompressed files are memory-mapped: the returned Transcript reads its
+    columns straight from the page cache and keeps the mapping alive.
+
+    Raises:
+        ValueError: If the file is not a supported transcript file, or is
+            truncated or corrupt
+
+    """
+    with Path(file_path).open("rb") as f:
+        # mmap cannot map an empty file
+        if os.fstat(f.fileno()).st_size < _HEADER.size:
+            msg = f"Truncated transcript file: {file_path}"
+            raise ValueError(msg)
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, flags = _HEADER.unpack_from(mapped)
+    if magic != _MAGIC or version != _VERSION:
+        msg = f"Unsupported transcript file {file_path} (version {version})"
+        raise ValueError(msg)
+
+    body = memoryview(mapped)[_HEADER.size :]
+    if flags & _FLAG_ZLIB:
+        try:
+            body = zlib.decompress(body)
+        except zlib.error as e:
+            msg = f"Corrupt transcript file {file_path}: {e}"
+            raise ValueError(msg) from e
+    return Transcript.from_bytes(body)
+
+
+def load_any_transcript(base_path: str) -> Transcript | None:
+    """Load ``<base_path>.bin`` or ``<base_path>.json``, whichever exists.
+
+    An unreadable binary file (left by an interrupted write or an older
+    format) is deleted and treated as missing.
+
+    Args:
+        base_path (str): Path without extension, e.g. "output/abc_transcript"
+
+    Returns:
+        Transcript: The loaded transcript, or None if neither file exists
+
+    """
+    binary_path = f"{base_path}{BINARY_SUFFIX}"
+    if Path(binary_path).exists():
+        try:
+            return load_transcript(binary_path)
+        except ValueError as e:
+            logger.warning("Discarding unreadable transcript %s: %s", binary_path, e)
+            Path(binary_path).unlink(missing_ok=True)
+    json_path = f"{base_path}{JSON_SUFFIX}"
+    if Path(json_path).exists():
+        return Transcript.from_segments(load_json(json_path))
+    return None
+
+
+def store_transcript(transcript: Transcript | list, base_path: str) -> str:
+    """Save a transcript in the format chosen by config.TRANSCRIPT_FORMAT.
+
+    Args:
+        transcript (Transcript | list): Transcript to save
+        base_path (str): Path without extension, e.g. "output/abc_transcript"
+
+    Returns:
+        str: Path of the written file
+
+    """
+    if config.TRANSCRIPT_FORMAT == "binary":
+        path = f"{base_path}{BINARY_SUFFIX}"
+        save_transcript(transcript, path)
+    else:
+        path = f"{base_path}{JSON_SUFFIX}"
+        save_json(transcript, path)
+    return path
+
+
+def convert_json_transcripts(
+    directory: str, *, compress: bool = False, remove_json: bool = False,
+) -> int:
+    """Migrate every ``*_transcript.json`` in a directory to the binary format.
+
+    Args:
+        directory (str): Directory to scan
+        compress (bool): zlib-compress the binary files
+        remove_json (bool): Delete each JSON file after converting it
+
+    Returns:
+        int: Number of files converted
+
+    """
+    converted = 0
+    for json_path in sorted(Path(directory).glob("*_transcript.json")):
+        binary_path = json_path.with_suffix(BINARY_SUFFIX)
+        save_transcript(load_json(json_path), binary_path, compress=compress)
+        if remove_json:
+            json_path.unlink()
+        converted += 1
+        logger.info("Converted %s -> %s", json_path, binary_path)
+    return converted
+
+
+def main() -> None:
+    """Convert JSON transcripts from the command line."""
+    parser = argparse.ArgumentParser(
+        description="Convert *_transcript.json files to the binary format",
+    )
+    parser.add_argument(
+        "directory",
+        nargs="?",
+        default=config.OUTPUT_DIR,
+        help="Directory holding the transcripts (default: OUTPUT_DIR)",
+    )
+    parser.add_argument(
+        "--compress", action="store_true", help="zlib-compress the binary files",
+    )
+    parser.add_argument(
+        "--remove-json",
+        action="store_true",
+        help="Delete each JSON file after converting it",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    count = convert_json_transcripts(
+        args.directory, compress=args.compress, remove_json=args.remove_json,
+    )
+    print(f"Converted {count} transcripts")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,525 @@
 """Utility functions for handling and formatting video transcript data."""
 
+import bisect
+import difflib
+import hashlib
+import re
+import struct
+import sys
+from array import array
+from collections.abc import Callable, Iterable, Iterator, Sequence
 
-def format_transcript(segments: list) -> list:
+# Header of Transcript.to_bytes: magic, format version, flags, segment count.
+# 16 bytes long so the float64/int64 columns that follow stay 8-byte aligned
+_HEADER = struct.Struct("<4sHHQ")
+_MAGIC = b"YTTR"
+_VERSION = 1
+
+# Caption annotations that carry no speech: [Music], [Applause], (laughs), ♪
+_NON_SPEECH = re.compile(
+    r"\[[^\]]*\]"
+    r"|\((?:music|applause|laughter|laughs|inaudible|silence|cheering)\)"
+    r"|[♪♫]+",
+    re.IGNORECASE,
+)
+_NON_WORD_CHARS = re.compile(r"[^\w']+")
+
+# How far back compress_transcript looks for text repeated by a rolling cue
+_OVERLAP_WORDS = 30
+
+# Cues shorter than this ("yes", "you know") are only duplicates when they
+# repeat the end of the previous cue; inside it they are usually new speech
+_MIN_CONTAINED_WORDS = 3
+
+
+class Transcript(Sequence):
+    """Compact, array-backed transcript.
+
+    Start and end times live in float64 arrays and all segment texts in one
+    UTF-8 buffer addressed by byte offsets, instead of one dict per segment.
+    Slicing returns a view sharing the same buffers, and segments are looked up
+    by time with a binary search. Indexing and iteration yield the usual
+    ``{"start_time", "end_time", "text"}`` dicts, so code written for lists
+    of segments keeps working.
+    """
+
+    __slots__ = ("_ends", "_hi", "_lo", "_offsets", "_starts", "_text")
+
+    def __init__(  # noqa: PLR0913
+        self,
+        starts: Sequence[float],
+        ends: Sequence[float],
+        offsets: Sequence[int],
+        text: bytes | memoryview,
+        *,
+        lo: int = 0,
+        hi: int | None = None,
+    ) -> None:
+        """Initialize a Transcript from its columns.
+
+        Args:
+            starts: Segment start times in seconds (array of float64)
+            ends: Segment end times in seconds (array of float64)
+            offsets: Byte offset of each segment's text in ``text``, plus the
+                end offset of the last segment (array of int64, len n + 1)
+            text (bytes): All segment texts, UTF-8 encoded and concatenated
+            lo (int): First segment of this view
+            hi (int): One past the last segment of this view
+
+        """
+        self._starts = starts
+        self._ends = ends
+        self._offsets = offsets
+        self._text = text
+        self._lo = lo
+        self._hi = len(starts) if hi is None else hi
+
+    @classmethod
+    def from_segments(cls, segments: Iterable[dict]) -> "Transcript":
+        """Build a Transcript from ``{"start_time", "end_time", "text"}`` dicts."""
+        if isinstance(segments, Transcript):
+            return segments
+        starts = array("d")
+        ends = array("d")
+        offsets = array("q", [0])
+        texts = []
+        position = 0
+        for segment in segments:
+            encoded = segment["text"].encode()
+            starts.append(segment["start_time"])
+            ends.append(segment["end_time"])
+            texts.append(encoded)
+            position += len(encoded)
+            offsets.append(position)
+        return cls(starts, ends, offsets, b"".join(texts))
+
+    def __len__(self) -> int:
+        """Return the number of segments in this view."""
+        return self._hi - self._lo
+
+    def __getitem__(self, index: int | slice) -> "dict | list | Transcript":
+        """Return a segment dict, or a zero-copy Transcript view for a slice."""
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            stop = max(start, stop)
+            return Transcript(
+                self._starts,
+                self._ends,
+                self._offsets,
+                self._text,
+                lo=self._lo + start,
+                hi=self._lo + stop,
+            )
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            msg = "Transcript index out of range"
+            raise IndexError(msg)
+        i = self._lo + index
+        return {
+            "start_time": self._starts[i],
+            "end_time": self._ends[i],
+            "text": self._segment_text(i),
+        }
+
+    def __iter__(self) -> Iterator[dict]:
+        """Yield the segments as dicts."""
+        for i in range(self._lo, self._hi):
+            yield {
+                "start_time": self._starts[i],
+                "end_time": self._ends[i],
+                "text": self._segment_text(i),
+            }
+
+    def __eq__(self, other: object) -> bool:
+        """Compare segment by segment with any sequence of segment dicts."""
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            a == b for a, b in zip(self, other, strict=True)
+        )
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        """Return a short summary; the segments may be many."""
+        return f"Transcript({len(self)} segments)"
+
+    def _segment_text(self, i: int) -> str:
+        return str(self._text[self._offsets[i] : self._offsets[i + 1]], "utf-8")
+
+    def start_time(self, index: int) -> float:
+        """Return the start time of a segment without building its dict."""
+        return self._starts[self._lo + index]
+
+    def end_time(self, index: int) -> float:
+        """Return the end time of a segment without building its dict."""
+        return self._ends[self._lo + index]
+
+    def text(self, index: int) -> str:
+        """Return the text of a segment without building its dict."""
+        return self._segment_text(self._lo + index)
+
+    def segment_at(self, seconds: float) -> int | None:
+        """Return the index of the segment playing at ``seconds``, if any.
+
+        Runs in O(log n); assumes segments are sorted by start time.
+        """
+        i = bisect.bisect_right(self._starts, seconds, self._lo, self._hi) - 1
+        if i >= self._lo and seconds < self._ends[i]:
+            return i - self._lo
+        return None
+
+    def slice_time(self, start: float, end: float) -> "Transcript":
+        """Return a zero-copy view of the segments starting in [start, end)."""
+        lo = bisect.bisect_left(self._starts, start, self._lo, self._hi)
+        hi = bisect.bisect_left(self._starts, end, lo, self._hi)
+        return Transcript(
+            self._starts, self._ends, self._offsets, self._text, lo=lo, hi=hi,
+        )
+
+    def to_list(self) -> list:
+        """Return the segments as a list of dicts (e.g. for JSON)."""
+        return list(self)
+
+    def to_bytes(self) -> bytes:
+        """Serialize the transcript into a compact binary blob.
+
+        Layout: a 16-byte header, then the start times, end times and text
+        offsets as little-endian float64/float64/int64 columns, then the text.
+        """
+        lo, hi = self._lo, self._hi
+        starts = array("d", self._starts[lo:hi])
+        ends = array("d", self._ends[lo:hi])
+        base = self._offsets[lo]
+        offsets = array(
+            "q", (offset - base for offset in self._offsets[lo : hi + 1]),
+        )
+        text = bytes(self._text[base : self._offsets[hi]])
+        if sys.byteorder != "little":
+            for column in (starts, ends, offsets):
+                column.byteswap()
+        header = _HEADER.pack(_MAGIC, _VERSION, 0, hi - lo)
+        return b"".join(
+            [header, starts.tobytes(), ends.tobytes(), offsets.tobytes(), text],
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes | memoryview) -> "Transcript":
+        """Load a transcript serialized by ``to_bytes``.
+
+        When ``data`` is a memoryview (for example over an mmap), the columns
+        are used in place without copying.
+        """
+        view = memoryview(data)
+        if len(view) < _HEADER.size:
+            msg = "Truncated transcript data"
+            raise ValueError(msg)
+        magic, version, _, count = _HEADER.unpack_from(view)
+        if magic != _MAGIC or version != _VERSION:
+            msg = f"Unsupported transcript data (magic={magic!r}, version={version})"
+            raise ValueError(msg)
+        if len(view) < _HEADER.size + (3 * count + 1) * 8:
+            msg = f"Truncated transcript data ({count} segments)"
+            raise ValueError(msg)
+
+        position = _HEADER.size
+        columns = []
+        for fmt, length in (("d", count), ("d", count), ("q", count + 1)):
+            size = length * 8
+            column = view[position : position + size].cast(fmt)
+            if sys.byteorder != "little":
+                column = array(fmt, column)
+                column.byteswap()
+            columns.append(column)
+            position += size
+        starts, ends, offsets = columns
+        if offsets[-1] != len(view) - position:
+            msg = "Truncated transcript data (text blob)"
+            raise ValueError(msg)
+        return cls(starts, ends, offsets, view[position:])
+
+
+def format_transcript(segments: list) -> Transcript:
     """Format transcript segments into a standardized structure."""
-    return [
+    return Transcript.from_segments(
         {
             "start_time": segment["start"],
             "end_time": segment["end"],
             "text": segment["text"].strip(),
         }
         for segment in segments
-    ]
+    )
+
+
+def format_transcript_text(
+    transcript: Iterable[dict],
+    format_segment: Callable[[dict], str],
+    max_chars: int | None = None,
+) -> str:
+    """Format a transcript for a prompt, stopping once ``max_chars`` is reached.
+
+    Runs in time linear in the output size: the formatted pieces are joined
+    once instead of being appended to a growing string, and segments past the
+    character budget are never formatted at all.
+
+    Args:
+        transcript (list): List of transcript segments
+        format_segment (callable): Formats one segment as it appears in the prompt
+        max_chars (int): Maximum length of the result; None for no limit
+
+    Returns:
+        str: The formatted transcript, at most ``max_chars`` long
+
+    """
+    parts = []
+    length = 0
+    for segment in transcript:
+        part = format_segment(segment)
+        parts.append(part)
+        length += len(part)
+        if max_chars is not None and length >= max_chars:
+            break
+    text = "".join(parts)
+    return text if max_chars is None else text[:max_chars]
+
+
+def compress_transcript(
+    transcript: list,
+    max_segment_chars: int = 250,
+    max_gap_seconds: float = 2.0,
+    similarity: float = 0.9,
+) -> Transcript:
+    """Shrink a transcript for prompting without losing its content.
+
+    Auto-generated captions repeat themselves: each rolling cue starts with
+    the end of the previous one, some cues are (near) copies of the last, and
+    non-speech tags like "[Music]" fill the gaps. This drops the tags, strips
+    text that overlaps the preceding cue, drops near-duplicate cues, collapses
+    phrases repeated back to back, and coalesces the remaining cues into
+    sentence-level segments that keep the start time of their first cue.
+
+    Args:
+        transcript (list): List of transcript segments
+        max_segment_chars (int): Start a new segment once this long, even
+            without sentence punctuation (auto captions have none)
+        max_gap_seconds (float): Start a new segment after a pause this long
+        similarity (float): Cues at least this similar to the previous cue
+            (difflib ratio of their normalized words) are dropped
+
+    Returns:
+        Transcript: The compressed transcript
+
+    """
+    segments = []
+    words = []
+    length = 0
+    start = end = 0.0
+    recent = []
+    previous_cue = []
+
+    def flush() -> None:
+        nonlocal length
+        if words:
+            segments.append(
+                {"start_time": start, "end_time": end, "text": " ".join(words)},
+            )
+            words.clear()
+            length = 0
+
+    for segment in transcript:
+        cue_words, normalized = _collapse_repeats(
+            _NON_SPEECH.sub(" ", segment["text"]).split(),
+        )
+        cue_key = [word for word in normalized if word]
+        if not cue_key:
+            continue
+        duplicate = _is_near_duplicate(cue_key, previous_cue, similarity)
+        previous_cue = previous_cue if duplicate else cue_key
+        overlap = 0 if duplicate else _overlap_length(recent, normalized)
+        cue_words = [] if duplicate else cue_words[overlap:]
+        normalized = normalized[overlap:]
+        if not cue_words:
+            # Nothing new was said; the current segment just lasts longer
+            if words:
+                end = max(end, segment["end_time"])
+            continue
+
+        if words and (
+            segment["start_time"] - end > max_gap_seconds
+            or length >= max_segment_chars
+        ):
+            flush()
+        if not words:
+            start = segment["start_time"]
+        words.extend(cue_words)
+        length += sum(len(word) + 1 for word in cue_words)
+        end = segment["end_time"]
+        recent = (recent + normalized)[-_OVERLAP_WORDS:]
+        if cue_words[-1].endswith((".", "?", "!")):
+            flush()
+    flush()
+    return Transcript.from_segments(segments)
+
+
+def compression_ratio(original: list, compressed: list) -> float:
+    """Return the compressed transcript's text length relative to the original."""
+    original_chars = sum(len(segment["text"]) for segment in original)
+    compressed_chars = sum(len(segment["text"]) for segment in compressed)
+    return compressed_chars / original_chars if original_chars else 1.0
+
+
+def _collapse_repeats(words: list, max_phrase_words: int = 3) -> tuple:
+    """Drop phrases of 2+ words that immediately repeat ("you know you know").
+
+    Returns the remaining words and their normalized forms.
+    """
+    result = []
+    keys = []
+    for word in words:
+        result.append(word)
+        keys.append(_NON_WORD_CHARS.sub("", word.lower()))
+        for size in range(2, max_phrase_words + 1):
+            if len(keys) >= 2 * size and keys[-size:] == keys[-2 * size : -size]:
+                del result[-size:]
+                del keys[-size:]
+                break
+    return result, keys
+
+
+def _overlap_length(recent: list, words: list) -> int:
+    """Length of the longest prefix of ``words`` that ends ``recent``.
+
+    Single-word overlaps only count when they are the whole cue, so a word
+    legitimately spoken twice in a row is kept.
+    """
+    first = words[0] if words else None
+    # Longest candidate first: the earliest position in recent that could start it
+    for position in range(max(0, len(recent) - len(words)), len(recent)):
+        size = len(recent) - position
+        if size == 1 and len(words) > 1:
+            break
+        if recent[position] == first and recent[position:] == words[:size]:
+            return size
+    return 0
+
+
+def _is_near_duplicate(words: list, previous: list, similarity: float) -> bool:
+    """Whether a cue repeats the previous one (exactly, contained, or nearly)."""
+    if not previous:
+        return False
+    if words == previous[-len(words) :]:
+        return True
+    if len(words) >= _MIN_CONTAINED_WORDS and (
+        f" {' '.join(words)} " in f" {' '.join(previous)} "
+    ):
+        return True
+    matcher = difflib.SequenceMatcher(None, words, previous, autojunk=False)
+    # Cheap upper bounds on the ratio first; most cues fail one of them
+    return (
+        matcher.real_quick_ratio() >= similarity
+        and matcher.quick_ratio() >= similarity
+        and matcher.ratio() >= similarity
+    )
+
+
+def transcript_hash(transcript: list) -> str:
+    """Return a stable content hash of a transcript, for use in cache keys."""
+    digest = hashlib.sha256()
+    for segment in transcript:
+        digest.update(
+            f"{segment['start_time']:.3f}|{segment['end_time']:.3f}|"
+            f"{segment['text']}\n".encode(),
+        )
+    return digest.hexdigest()
+
+
+def estimate_tokens(text: str) -> int:
+    """Roughly estimate the LLM token count of a text (about 4 chars per token)."""
+    return len(text) // 4 + 1
+
+
+def split_transcript_windows(
+    transcript: list, max_tokens: int, format_segment: Callable[[dict], str],
+) -> list:
+    """Split a transcript on segment boundaries into token-budgeted windows.
+
+    Args:
+        transcript (list): List of transcript segments
+        max_tokens (int): Token budget of each window's formatted text
+        format_segment (callable): Formats one segment as it will appear in the
+            prompt; used to measure the window size
+
+    Returns:
+        list: List of windows, each a slice of consecutive transcript segments
+
+    """
+    windows = []
+    window_start = 0
+    window_tokens = 0
+    for index, segment in enumerate(transcript):
+        tokens = estimate_tokens(format_segment(segment))
+        if index > window_start and window_tokens + tokens > max_tokens:
+            # Slicing a Transcript is a zero-copy view
+            windows.append(transcript[window_start:index])
+            window_start = index
+            window_tokens = 0
+        window_tokens += tokens
+    if window_start < len(transcript):
+        windows.append(transcript[window_start:])
+    return windows
+
+
+def split_content_defined_windows(
+    transcript: list, max_tokens: int, format_segment: Callable[[dict], str],
+) -> list:
+    """Split a transcript into windows whose boundaries depend on local content.
+
+    Once a window holds half the token budget, it ends after any segment whose
+    text hash marks it as a boundary (with probability proportional to the
+    segment's size), or when the budget would be exceeded. Because boundaries
+    are chosen by content rather than by position, editing part of a
+    transcript only changes the windows around the edit; the others come out
+    identical and their per-window results can be reused.
+
+    Args:
+        transcript (list): List of transcript segments
+        max_tokens (int): Token budget of each window's formatted text
+        format_segment (callable): Formats one segment as it will appear in the
+            prompt; used to measure the window size
+
+    Returns:
+        list: List of windows, each a slice of consecutive transcript segments
+
+    """
+    min_tokens = max_tokens // 2
+    # On average a boundary comes this many tokens after the window minimum
+    boundary_spacing = max(1, max_tokens // 4)
+
+    windows = []
+    window_start = 0
+    window_tokens = 0
+    for index, segment in enumerate(transcript):
+        tokens = estimate_tokens(format_segment(segment))
+        if index > window_start and window_tokens + tokens > max_tokens:
+            windows.append(transcript[window_start:index])
+            window_start = index
+            window_tokens = 0
+        window_tokens += tokens
+        if window_tokens >= min_tokens and _is_boundary(
+            segment["text"], tokens / boundary_spacing,
+        ):
+            windows.append(transcript[window_start : index + 1])
+            window_start = index + 1
+            window_tokens = 0
+    if window_start < len(transcript):
+        windows.append(transcript[window_start:])
+    return windows
+
+
+def _is_boundary(text: str, probability: float) -> bool:
+    """Deterministically pick ``text`` as a window boundary with ``probability``."""
+    digest = hashlib.blake2b(text.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") < probability * 2**64
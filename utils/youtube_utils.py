@@ -1,11 +1,42 @@
 """Utility functions for handling YouTube URLs and video IDs.
 
 This module provides functionality to extract video IDs from various YouTube URL formats,
-including standard watch URLs, shortened URLs, and embed URLs.
+including standard watch URLs, shortened URLs, embed URLs, Shorts and live
+streams, and to recognize playlist and channel URLs.
 """
 
+from dataclasses import dataclass
 from urllib.parse import parse_qs, urlparse
 
+YOUTUBE_HOSTS = (
+    "youtube.com",
+    "www.youtube.com",
+    "m.youtube.com",
+    "music.youtube.com",
+    "youtube-nocookie.com",
+    "www.youtube-nocookie.com",
+)
+
+# Path prefixes followed by a video ID: /embed/ID, /shorts/ID ...
+_VIDEO_PATH_PREFIXES = ("embed", "v", "shorts", "live")
+
+
+@dataclass(frozen=True)
+class YouTubeLink:
+    """What a YouTube URL points at.
+
+    ``kind`` is "video", "playlist", "channel" (``id`` is a channel ID),
+    "handle" (``id`` is an @handle) or "user" (``id`` is a legacy username).
+    """
+
+    kind: str
+    id: str
+
+    @property
+    def is_collection(self) -> bool:
+        """Whether the link names several videos (a playlist or channel)."""
+        return self.kind != "video"
+
 
 def extract_video_id(video_url: str) -> str:
     """Extract the video ID from a YouTube URL."""
@@ -14,11 +45,53 @@ def extract_video_id(video_url: str) -> str:
     if parsed_url.hostname in ("youtu.be", "www.youtu.be"):
         return parsed_url.path[1:]
 
-    if parsed_url.hostname in ("youtube.com", "www.youtube.com"):
+    if parsed_url.hostname in YOUTUBE_HOSTS:
         if parsed_url.path == "/watch":
-            return parse_qs(parsed_url.query)["v"][0]
-        if parsed_url.path.startswith("/embed/") or parsed_url.path.startswith("/v/"):
-            return parsed_url.path.split("/")[2]
+            video_ids = parse_qs(parsed_url.query).get("v")
+            if video_ids:
+                return video_ids[0]
+        prefix, _, rest = parsed_url.path.lstrip("/").partition("/")
+        video_id = rest.split("/")[0]
+        if prefix in _VIDEO_PATH_PREFIXES and video_id:
+            return video_id
 
     msg = f"Could not extract video ID from URL: {video_url}"
     raise ValueError(msg)
+
+
+def parse_youtube_url(url: str) -> YouTubeLink:
+    """Work out whether a URL points at a video, a playlist or a channel.
+
+    A watch URL that also carries a playlist (``watch?v=ID&list=PL...``) is
+    treated as the video.
+
+    Args:
+        url (str): A YouTube video, playlist or channel URL
+
+    Returns:
+        YouTubeLink: The kind of target and its ID
+
+    Raises:
+        ValueError: If the URL is not a recognized YouTube URL
+
+    """
+    try:
+        return YouTubeLink("video", extract_video_id(url))
+    except (KeyError, ValueError):
+        pass
+
+    parsed_url = urlparse(url)
+    if parsed_url.hostname in YOUTUBE_HOSTS:
+        parts = [part for part in parsed_url.path.split("/") if part]
+        playlist = parse_qs(parsed_url.query).get("list")
+        if parts == ["playlist"] and playlist:
+            return YouTubeLink("playlist", playlist[0])
+        if parts and parts[0].startswith("@"):
+            return YouTubeLink("handle", parts[0])
+        if len(parts) > 1 and parts[0] == "channel":
+            return YouTubeLink("channel", parts[1])
+        if len(parts) > 1 and parts[0] == "user":
+            return YouTubeLink("user", parts[1])
+
+    msg = f"Not a YouTube video, playlist or channel URL: {url}"
+    raise ValueError(msg)